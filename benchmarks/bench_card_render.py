@@ -0,0 +1,102 @@
+"""换卡渲染耗时基准
+
+在临时数据库上打开主窗口，放入四种学习模式的卡片视图，用生成的单词逐张显示卡片
+（选择和冲刺模式带干扰项选项），统计每张卡的耗时，输出中位数和最大值：
+- 更新：show_card 原地更新文字和状态的耗时（即 last_render_ms）
+- 含重绘：更新加上处理事件和重绘
+- 重建：每张卡新建一个视图再显示，对照逐卡销毁、重建控件的做法
+
+    python bench_card_render.py --cards 500
+
+没有显示器时设置 QT_QPA_PLATFORM=offscreen，默认即为 offscreen。
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication, QStackedWidget  # noqa: E402
+
+from datasets import generate_words  # noqa: E402
+from distractors import DistractorIndex  # noqa: E402
+from main import MainWindow  # noqa: E402
+from study_views import ChoiceCardView, RecognizeCardView, SpellCardView, SprintCardView  # noqa: E402
+
+VIEWS = [('recognize', RecognizeCardView, False), ('choice', ChoiceCardView, True),
+         ('sprint', SprintCardView, True), ('spell', SpellCardView, False)]
+
+
+def summary(times) -> str:
+    return f"中位数 {statistics.median(times):6.2f} ms，最大 {max(times):6.2f} ms"
+
+
+def measure(app: QApplication, stack: QStackedWidget, view_class, cards, options):
+    """返回 (更新耗时, 含重绘耗时, 重建耗时) 三个毫秒列表"""
+    view = view_class()
+    stack.addWidget(view)
+    stack.setCurrentWidget(view)
+    app.processEvents()
+    updates, repaints, rebuilds = [], [], []
+    for card, card_options in zip(cards, options):
+        args = (card_options,) if card_options is not None else ()
+        started = time.perf_counter()
+        view.show_card(card, *args)
+        app.processEvents()
+        view.repaint()
+        repaints.append((time.perf_counter() - started) * 1000)
+        updates.append(view.last_render_ms)
+
+    for card, card_options in zip(cards, options):
+        args = (card_options,) if card_options is not None else ()
+        started = time.perf_counter()
+        fresh = view_class()
+        stack.addWidget(fresh)
+        stack.setCurrentWidget(fresh)
+        fresh.show_card(card, *args)
+        app.processEvents()
+        fresh.repaint()
+        rebuilds.append((time.perf_counter() - started) * 1000)
+        stack.removeWidget(fresh)
+        fresh.deleteLater()
+    stack.removeWidget(view)
+    view.deleteLater()
+    app.processEvents()
+    return updates, repaints, rebuilds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='各学习模式换卡的渲染耗时')
+    parser.add_argument('--cards', type=int, default=500, help='每种模式显示的卡片数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    rng = random.Random(args.seed)
+    cards = [(word, f'{pos} {meaning}') for word, pos, meaning in generate_words(rng, args.cards)]
+    distractors = DistractorIndex(cards, rng)
+    work_dir = tempfile.mkdtemp(prefix='vocab-bench-')
+    window = MainWindow(os.path.join(work_dir, 'render.db'))
+    try:
+        window.resize(1000, 800)
+        window.show()
+        stack = QStackedWidget()
+        window.main_page.layout().addWidget(stack)
+        app.processEvents()
+        for name, view_class, with_options in VIEWS:
+            options = [distractors.options(card) if with_options else None for card in cards]
+            updates, repaints, rebuilds = measure(app, stack, view_class, cards, options)
+            print(f"{name:<10}更新 {summary(updates)}；含重绘 {summary(repaints)}；重建 {summary(rebuilds)}")
+    finally:
+        window.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
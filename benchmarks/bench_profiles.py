@@ -0,0 +1,80 @@
+"""连接配置档的写入吞吐量基准
+
+在同一个合成数据库（默认 20 万条学习记录）的副本上，分别用 SQLite 默认设置（回滚日志、
+synchronous=FULL，即引入连接配置档之前的行为）和各个配置档逐条调用 record_study，
+统计每秒作答数：
+
+    python bench_profiles.py --events 200000 --calls 500
+
+数据库放在 --dir 指定的目录（默认系统临时目录）。临时目录在 tmpfs 上时 fsync 几乎没有开销，
+各配置档之间的差距会比在真实磁盘上小。
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from data_manager import DatabaseManager  # noqa: E402
+from db_connections import CONNECTION_PROFILES  # noqa: E402
+from datasets import build_study_dataset  # noqa: E402
+
+BASELINE = 'sqlite-default'
+
+
+def _use_sqlite_defaults(db: DatabaseManager):
+    """把写连接恢复为 SQLite 默认设置；回滚日志模式要求没有其他连接，读连接此时尚未创建"""
+    writer = db.connections.writer
+    for pragma in ('journal_mode = DELETE', 'synchronous = FULL', 'cache_size = -2000',
+                   'mmap_size = 0', 'temp_store = DEFAULT'):
+        writer.execute(f'PRAGMA {pragma}').fetchall()
+
+
+def measure(path: str, profile: str, vocab_id: int, words, calls: int) -> float:
+    """逐条写入 calls 条学习记录，返回每秒作答数"""
+    db = DatabaseManager(path, 'durable' if profile == BASELINE else profile)
+    try:
+        if profile == BASELINE:
+            _use_sqlite_defaults(db)
+        started = time.perf_counter()
+        for i in range(calls):
+            db.record_study(vocab_id, words[i % len(words)], i % 5 != 0, 'choice', 1500)
+        return calls / (time.perf_counter() - started)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='各连接配置档的 record_study 吞吐量')
+    parser.add_argument('--events', type=int, default=200000, help='数据库中已有的学习记录条数')
+    parser.add_argument('--words', type=int, default=2000, help='单词数')
+    parser.add_argument('--calls', type=int, default=500, help='每个配置档写入的学习记录条数')
+    parser.add_argument('--dir', help='放置数据库的目录，默认为系统临时目录')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='vocab-bench-', dir=args.dir)
+    try:
+        source = os.path.join(work_dir, 'dataset.db')
+        started = time.perf_counter()
+        vocab_id = build_study_dataset(source, args.events, args.words, seed=args.seed)
+        print(f"数据集：{args.events} 条学习记录，{args.words} 个单词，生成用时 {time.perf_counter() - started:.1f}s")
+
+        db = DatabaseManager(source)
+        words = [word for word, _, _, _ in db.get_words_page(vocab_id, limit=args.words)]
+        db.close()
+
+        for profile in [BASELINE] + list(CONNECTION_PROFILES):
+            path = os.path.join(work_dir, f'{profile}.db')
+            shutil.copyfile(source, path)
+            rate = measure(path, profile, vocab_id, words, args.calls)
+            print(f"{profile:>15}: {rate:10,.0f} 次作答/秒")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
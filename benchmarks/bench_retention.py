@@ -0,0 +1,142 @@
+"""保留期归档基准
+
+用 datasets.py 生成学习记录均匀分布在 --days 天内的数据库，以数据集的最后一天为当前时间，
+归档早于 --horizon-days 天的事件；归档期间另一个线程不断调用 record_study，统计它的等待时间。
+输出归档用时、每批用时、数据库和归档库大小、读回归档的用时，并核对统计结果在归档前后一致：
+
+    python bench_retention.py --events 1000000 --horizon-days 180
+
+测量 1000 万条记录时用 --events 10000000（生成数据需要几分钟）。
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from data_manager import DatabaseManager  # noqa: E402
+from retention import RetentionEngine, read_archive  # noqa: E402
+from datasets import START, build_study_dataset  # noqa: E402
+
+WRITER_INTERVAL = 0.005   # 并发写入线程每次作答之间的间隔（秒）
+
+
+def file_size(path: str) -> float:
+    """数据库文件和 WAL 的总大小（MB）"""
+    return sum(os.path.getsize(p) for p in (path, path + '-wal') if os.path.exists(p)) / 1e6
+
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+class ConcurrentWriter(threading.Thread):
+    """模拟归档期间仍在答题：在另一个单词本上逐条写入学习记录，记录每次写入的耗时"""
+
+    def __init__(self, db: DatabaseManager, vocab_id: int, words):
+        super().__init__()
+        self.db = db
+        self.vocab_id = vocab_id
+        self.words = words
+        self.latencies = []
+        self.stopping = threading.Event()
+
+    def run(self):
+        try:
+            i = 0
+            while not self.stopping.is_set():
+                started = time.perf_counter()
+                self.db.record_study(self.vocab_id, self.words[i % len(self.words)], True, 'recognize', 900)
+                self.latencies.append(time.perf_counter() - started)
+                i += 1
+                time.sleep(WRITER_INTERVAL)
+        finally:
+            self.db.release_thread()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='保留期归档的用时、空间和对并发写入的影响')
+    parser.add_argument('--events', type=int, default=1000000, help='学习记录条数')
+    parser.add_argument('--words', type=int, default=20000, help='单词数')
+    parser.add_argument('--days', type=int, default=400, help='学习记录覆盖的天数')
+    parser.add_argument('--horizon-days', type=int, default=180, help='保留最近多少天的原始事件')
+    parser.add_argument('--dir', help='放置数据库的目录，默认为系统临时目录')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='vocab-bench-', dir=args.dir)
+    try:
+        path = os.path.join(work_dir, 'dataset.db')
+        archive_path = os.path.join(work_dir, 'dataset-archive.db')
+        started = time.perf_counter()
+        vocab_id = build_study_dataset(path, args.events, args.words, args.days, args.seed)
+        print(f"数据集：{args.events} 条学习记录，{args.words} 个单词，{args.days} 天，"
+              f"生成用时 {time.perf_counter() - started:.1f}s，{file_size(path):.1f} MB")
+
+        db = DatabaseManager(path)
+        try:
+            db.add_vocabulary('并发写入')
+            writer_vocab = db.get_vocabularies()[-1][0]
+            writer_words = [f'concurrent{i}' for i in range(200)]
+            with db.transaction():
+                for word in writer_words:
+                    db.add_word_with_pos_meanings(word, [('n.', word)], writer_vocab)
+            before = [db.get_daily_stats(vocab_id), db.get_weekly_stats(vocab_id), db.get_detailed_stats(vocab_id)]
+
+            engine = RetentionEngine(db, args.horizon_days, archive_path)
+            # 数据集的时间按 UTC 写入
+            now = (START + timedelta(days=args.days)).replace(tzinfo=timezone.utc).timestamp()
+            chunk_times, last = [], [time.perf_counter()]
+
+            def on_progress(done, total):
+                current = time.perf_counter()
+                chunk_times.append(current - last[0])
+                last[0] = current
+
+            writer = ConcurrentWriter(db, writer_vocab, writer_words)
+            writer.start()
+            started = time.perf_counter()
+            try:
+                counts = engine.run(now, progress=on_progress)
+            finally:
+                writer.stopping.set()
+                writer.join()
+            run_seconds = time.perf_counter() - started
+
+            after = [db.get_daily_stats(vocab_id), db.get_weekly_stats(vocab_id), db.get_detailed_stats(vocab_id)]
+            started = time.perf_counter()
+            second = engine.run(now)
+            second_seconds = time.perf_counter() - started
+        finally:
+            db.close()
+
+        conn = sqlite3.connect(archive_path)
+        started = time.perf_counter()
+        archived = sum(1 for _ in read_archive(conn))
+        read_seconds = time.perf_counter() - started
+        conn.close()
+
+        print(f"归档 {counts['events']} 条事件，{counts['batches']} 个批次，归还 {counts['freed_pages']} 页，"
+              f"用时 {run_seconds:.1f}s（含每批之后的停顿）")
+        print(f"每批用时：中位数 {statistics.median(chunk_times) * 1000:.0f} ms，"
+              f"最大 {max(chunk_times) * 1000:.0f} ms")
+        latencies = [value * 1000 for value in writer.latencies]
+        print(f"并发 record_study {len(latencies)} 次：中位数 {percentile(latencies, 0.5):.2f} ms，"
+              f"p99 {percentile(latencies, 0.99):.1f} ms，最大 {max(latencies, default=0):.1f} ms")
+        print(f"数据库 {file_size(path):.1f} MB，归档库 {file_size(archive_path):.1f} MB，"
+              f"读回 {archived} 条事件用时 {read_seconds:.1f}s")
+        print(f"统计结果一致：{before == after}；第二次运行处理 {second['events']} 条，用时 {second_seconds:.1f}s")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
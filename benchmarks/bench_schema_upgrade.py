@@ -0,0 +1,171 @@
+"""旧结构（版本 7）升级到规范化结构的基准
+
+用 datasets.py 的单词和学习记录生成器建立一个版本 7 的数据库（按字符串保存单词、释义和学习记录），
+整理后记录文件大小和几个常用查询的耗时；再用 DatabaseManager 打开，升级结构并执行一次性整理，
+输出升级和整理的耗时、升级后的文件大小和同样查询的耗时（中位数）：
+
+    python bench_schema_upgrade.py --events 1000000 --books 20 --words 2000
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from data_manager import DatabaseManager  # noqa: E402
+from db_migrations import MIGRATIONS  # noqa: E402
+from datasets import generate_events, generate_words  # noqa: E402
+
+LEGACY_VERSION = 7
+WRONG_WORD_RATIO = 0.02
+
+# (名称, 版本 7 上的查询, 升级后对应的 DatabaseManager 调用)；参数为 (单词本 ID, 单词)
+QUERIES = [
+    ('count_words',
+     ('SELECT COUNT(DISTINCT word) FROM word_pos_meanings WHERE vocabulary_id = ?1', lambda v, w: (v,)),
+     lambda db, v, w: db.count_words(v)),
+    ('words_page',
+     ('''SELECT word, GROUP_CONCAT(pos || ': ' || meaning, '; '), MIN(type), MIN(id)
+         FROM word_pos_meanings WHERE vocabulary_id = ?1 GROUP BY word ORDER BY word LIMIT 200''', lambda v, w: (v,)),
+     lambda db, v, w: db.get_words_page(v)),
+    ('word_pos_meanings',
+     ('SELECT pos, meaning FROM word_pos_meanings WHERE vocabulary_id = ?1 AND word = ?2', lambda v, w: (v, w)),
+     lambda db, v, w: db.get_word_pos_meanings(w, v)),
+    ('study_cards',
+     ('''SELECT c.word, GROUP_CONCAT(w.pos || ': ' || w.meaning, '; '),
+                c.due, c.stability, c.difficulty, c.lapses, c.reps
+         FROM card_states c JOIN word_pos_meanings w ON w.vocabulary_id = c.vocabulary_id AND w.word = c.word
+         WHERE c.vocabulary_id = ?1 GROUP BY c.word''', lambda v, w: (v,)),
+     lambda db, v, w: db.get_study_cards(v)),
+    ('wrong_words',
+     ('SELECT word, meaning, wrong_count FROM wrong_words WHERE vocabulary_id = ?1', lambda v, w: (v,)),
+     lambda db, v, w: db.get_wrong_words(v)),
+    ('daily_stats',
+     ('''SELECT day, SUM(total), SUM(correct), ROUND(SUM(correct) * 100.0 / SUM(total), 2),
+                CAST(SUM(latency_total) / NULLIF(SUM(latency_count), 0) AS INTEGER)
+         FROM study_stats_daily WHERE vocabulary_id = ?1 GROUP BY day ORDER BY day DESC''', lambda v, w: (v,)),
+     lambda db, v, w: db.get_daily_stats(v)),
+]
+
+
+def build_legacy_dataset(path: str, events: int, books: int, words: int, days: int, seed: int):
+    """版本 7 的数据库：books 个单词本，每本 words 个单词，events 条学习记录平均分布在各单词本"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        for version, migration in MIGRATIONS:
+            if version > LEGACY_VERSION:
+                break
+            cursor = conn.cursor()
+            cursor.execute('BEGIN')
+            migration(cursor)
+            cursor.execute(f'PRAGMA user_version = {version}')
+            cursor.execute('COMMIT')
+
+        entries = []
+        conn.execute('BEGIN')
+        for book in range(books):
+            vocab_id = conn.execute('INSERT INTO vocabularies (name) VALUES (?)', (f'基准测试{book}',)).lastrowid
+            book_words = generate_words(rng, words)
+            conn.executemany('INSERT INTO word_pos_meanings (word, pos, meaning, vocabulary_id) VALUES (?, ?, ?, ?)',
+                             [(word, pos, meaning, vocab_id) for word, pos, meaning in book_words])
+            entries.extend((vocab_id, word, meaning) for word, _, meaning in book_words)
+        conn.execute('COMMIT')
+
+        # 生成器从 names 中随机取学习对象，这里取 (单词本, 单词, 释义)，学习记录分布到所有单词本
+        for batch in generate_events(rng, entries, events, days):
+            conn.execute('BEGIN')
+            conn.executemany('''
+                INSERT INTO study_records (vocabulary_id, word, is_correct, study_mode, timestamp, response_ms)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(vocab_id, word, is_correct, mode, timestamp, response_ms)
+                  for (vocab_id, word, _), is_correct, mode, timestamp, response_ms in batch])
+            conn.execute('COMMIT')
+
+        wrong = rng.sample(entries, int(len(entries) * WRONG_WORD_RATIO))
+        conn.execute('BEGIN')
+        conn.executemany('INSERT INTO wrong_words (vocabulary_id, word, meaning, wrong_count) VALUES (?, ?, ?, ?)',
+                         [(vocab_id, word, meaning, rng.randint(1, 5)) for vocab_id, word, meaning in wrong])
+        conn.execute('COMMIT')
+        conn.execute('VACUUM')
+        return entries[len(entries) // 2][:2]
+    finally:
+        conn.close()
+
+
+def file_size(path: str) -> float:
+    """数据库文件和 WAL 的总大小（MB）"""
+    return sum(os.path.getsize(p) for p in (path, path + '-wal') if os.path.exists(p)) / 1e6
+
+
+def median_ms(func, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='版本 7 数据库升级前后的大小和查询耗时')
+    parser.add_argument('--events', type=int, default=1000000, help='学习记录条数')
+    parser.add_argument('--books', type=int, default=20, help='单词本数')
+    parser.add_argument('--words', type=int, default=2000, help='每个单词本的单词数')
+    parser.add_argument('--days', type=int, default=400, help='学习记录覆盖的天数')
+    parser.add_argument('--runs', type=int, default=20, help='每个查询的执行次数，取中位数')
+    parser.add_argument('--dir', help='放置数据库的目录，默认为系统临时目录')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='vocab-bench-', dir=args.dir)
+    try:
+        path = os.path.join(work_dir, 'legacy.db')
+        started = time.perf_counter()
+        vocab_id, word = build_legacy_dataset(path, args.events, args.books, args.words, args.days, args.seed)
+        print(f"版本 {LEGACY_VERSION} 数据集：{args.books} 个单词本 × {args.words} 个单词，{args.events} 条学习记录，"
+              f"生成用时 {time.perf_counter() - started:.1f}s")
+
+        before = {}
+        conn = sqlite3.connect(path)
+        for name, (sql, params), _ in QUERIES:
+            before[name] = median_ms(lambda: conn.execute(sql, params(vocab_id, word)).fetchall(), args.runs)
+        conn.close()
+        size_before = file_size(path)
+
+        started = time.perf_counter()
+        db = DatabaseManager(path)
+        upgrade_seconds = time.perf_counter() - started
+        try:
+            started = time.perf_counter()
+            ok, message = db.compact()
+            compact_seconds = time.perf_counter() - started
+            if not ok:
+                raise RuntimeError(message)
+            with db.connections.write_lock:
+                db.connections.writer.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
+            after = {}
+            for name, _, call in QUERIES:
+                def run():
+                    db.cache.clear()
+                    call(db, vocab_id, word)
+                after[name] = median_ms(run, args.runs)
+        finally:
+            db.close()
+
+        print(f"升级结构 {upgrade_seconds:.1f}s，一次性整理 {compact_seconds:.1f}s")
+        print(f"{'文件大小':<18}{size_before:9.1f} MB -> {file_size(path):7.1f} MB")
+        for name, _, _ in QUERIES:
+            print(f"{name:<20}{before[name]:9.2f} ms -> {after[name]:7.2f} ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""主题切换耗时基准
+
+在临时数据库上打开主窗口，另外放入若干个主题按钮，轮流切换各个主题，
+统计每次切换的耗时（设置样式表、处理事件和重绘），输出中位数和最大值：
+
+    python bench_theme_switch.py --buttons 100 300 600
+
+没有显示器时设置 QT_QPA_PLATFORM=offscreen，默认即为 offscreen。
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication, QGridLayout, QWidget  # noqa: E402
+
+from main import MainWindow  # noqa: E402
+from theme_manager import Theme  # noqa: E402
+from ui_components import AnimatedButton, UICreator  # noqa: E402
+
+COLUMNS = 20
+
+
+def measure(app: QApplication, db_path: str, buttons: int, rounds: int):
+    """返回 (中位数毫秒, 最大毫秒)"""
+    window = MainWindow(db_path)
+    try:
+        window.resize(1600, 1200)
+        window.show()
+        host = QWidget()
+        grid = QGridLayout(host)
+        colors = UICreator._get_theme_colors(window)
+        for i in range(buttons):
+            button = AnimatedButton(f'按钮{i}')
+            button.setup_theme_style(colors)
+            grid.addWidget(button, i // COLUMNS, i % COLUMNS)
+        window.main_page.layout().addWidget(host)
+        app.processEvents()
+
+        times = []
+        for _ in range(rounds):
+            for theme in Theme:
+                started = time.perf_counter()
+                window.theme_manager.set_theme(theme)
+                app.processEvents()
+                window.repaint()
+                times.append((time.perf_counter() - started) * 1000)
+        times.sort()
+        return times[len(times) // 2], times[-1]
+    finally:
+        window.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='主题切换耗时')
+    parser.add_argument('--buttons', type=int, nargs='+', default=[100, 300, 600], help='额外放入的主题按钮数')
+    parser.add_argument('--rounds', type=int, default=5, help='每种按钮数下轮流切换全部主题的轮数')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    work_dir = tempfile.mkdtemp(prefix='vocab-bench-')
+    try:
+        for buttons in args.buttons:
+            db_path = os.path.join(work_dir, f'theme-{buttons}.db')
+            median, worst = measure(app, db_path, buttons, args.rounds)
+            print(f"{buttons:>5} 个按钮：切换中位数 {median:6.1f} ms，最大 {worst:6.1f} ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
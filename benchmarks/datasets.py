@@ -0,0 +1,89 @@
+"""基准测试用的合成数据库
+
+单词和学习记录都通过 DatabaseManager 写入，与程序实际产生的数据结构一致（包括汇总表和全文索引）。
+相同参数和随机种子生成相同的数据：
+
+    python datasets.py study.db --events 200000 --words 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from data_manager import DatabaseManager  # noqa: E402
+from db_migrations import STUDY_MODE_CODES  # noqa: E402
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+POS_LIST = ['n.', 'v.', 'adj.', 'adv.']
+# 与程序写入的学习模式名称一致
+STUDY_MODES = list(STUDY_MODE_CODES)
+BATCH = 10000
+START = datetime(2025, 1, 1)
+
+
+def generate_words(rng: random.Random, words: int) -> List[Tuple[str, str, str]]:
+    """words 个 (单词, 词性, 释义)，单词互不相同"""
+    return [(''.join(rng.choice(LETTERS) for _ in range(rng.randint(3, 9))) + str(i), rng.choice(POS_LIST), f'释义{i}')
+            for i in range(words)]
+
+
+def generate_events(rng: random.Random, names: List[str], events: int,
+                    days: int = 400) -> Iterator[List[Tuple]]:
+    """按时间顺序分批生成学习记录 (单词, 是否正确, 学习模式, 时间, 反应时间毫秒)，时间均匀分布在 days 天内"""
+    step = days * 86400 / max(events, 1)
+    written = 0
+    while written < events:
+        count = min(BATCH, events - written)
+        yield [(rng.choice(names), rng.random() < 0.8, rng.choice(STUDY_MODES),
+                (START + timedelta(seconds=int((written + i) * step))).strftime('%Y-%m-%d %H:%M:%S'),
+                rng.randint(500, 8000))
+               for i in range(count)]
+        written += count
+
+
+def build_study_dataset(path: str, events: int = 200000, words: int = 2000, days: int = 400,
+                        seed: int = 0) -> int:
+    """生成一个单词本和 events 条学习记录，时间均匀分布在 days 天内，返回单词本 ID"""
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    rng = random.Random(seed)
+    db = DatabaseManager(path)
+    try:
+        ok, message = db.add_vocabulary('基准测试')
+        if not ok:
+            raise RuntimeError(message)
+        vocab_id = db.get_vocabularies()[-1][0]
+        entries = generate_words(rng, words)
+        with db.transaction():
+            for word, pos, meaning in entries:
+                db.add_word_with_pos_meanings(word, [(pos, meaning)], vocab_id)
+
+        for batch in generate_events(rng, [word for word, _, _ in entries], events, days):
+            db.write_study_events([(vocab_id,) + event for event in batch], [])
+        return vocab_id
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成基准测试用的合成数据库')
+    parser.add_argument('path', help='输出的数据库文件（不能已存在）')
+    parser.add_argument('--events', type=int, default=200000, help='学习记录条数')
+    parser.add_argument('--words', type=int, default=2000, help='单词数')
+    parser.add_argument('--days', type=int, default=400, help='学习记录覆盖的天数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    build_study_dataset(args.path, args.events, args.words, args.days, args.seed)
+    print(f"已生成 {args.path}：{args.words} 个单词，{args.events} 条学习记录，"
+          f"用时 {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,79 +1,258 @@
 import sqlite3
-from typing import List, Tuple, Optional
+from typing import Callable, List, Tuple, Optional
 import csv
+import time
+import functools
+import inspect
+import itertools
+import threading
+from contextlib import contextmanager
+from db_connections import ConnectionManager
+from db_migrations import get_schema_version, migrate, WORD_TYPE_CODES
+from query_cache import QueryCache, VOCABULARY_LIST
+from vocab_importer import ImportCancelled, VocabularyImporter
+
+WORD_TYPE_NAMES = {code: name for name, code in WORD_TYPE_CODES.items()}
+
+# 一个单词的全部词性释义，按添加顺序拼接为 "n.: 苹果; v.: 跑"；{word_id} 为外层查询中的单词 id 列
+MEANINGS_SQL = '''(SELECT GROUP_CONCAT(pos.name || ': ' || sense.meaning, '; ')
+        FROM senses sense JOIN parts_of_speech pos ON pos.id = sense.pos_id
+        WHERE sense.word_id = {word_id})'''
+
+BUSY_RETRIES = 3
+# 一次性整理时每执行这么多条虚拟机指令回调一次，回调次数大约等于数据库页数，用来估计进度
+COMPACT_PROGRESS_STEPS = 1000
+
+
+def retry_on_busy(method):
+    """busy_timeout 用尽后仍被锁定时，退避重试几次再抛出异常"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.in_transaction:
+            # 外层工作单元已经持有写锁，出错时由外层整体回滚
+            return method(self, *args, **kwargs)
+        for attempt in range(BUSY_RETRIES + 1):
+            try:
+                return method(self, *args, **kwargs)
+            except sqlite3.OperationalError as e:
+                message = str(e)
+                if attempt == BUSY_RETRIES or ('locked' not in message and 'busy' not in message):
+                    raise
+                time.sleep(0.05 * (2 ** attempt))
+    return wrapper
+
+
+def _freeze(value):
+    # 列表参数（如多个单词类型）转成元组才能作为缓存键
+    return tuple(value) if isinstance(value, list) else value
+
+
+def read_through(method):
+    """查询结果经 self.cache 缓存，按 vocab_id 参数所在单词本的版本号失效；没有 vocab_id 的查询属于单词本列表"""
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        key = (method.__name__,) + tuple(_freeze(v) for name, v in arguments.items() if name != 'self')
+        scope = arguments.get('vocab_id', VOCABULARY_LIST)
+        return self.cache.read(scope, key, lambda: method(self, *args, **kwargs))
+    return wrapper
+
+
+def invalidates(*vocab_params: str, vocabulary_list: bool = False):
+    """修改数据的方法执行后（无论成功与否）让这些参数所指单词本的缓存失效
+
+    在 transaction() 块中调用时，失效推迟到整个工作单元提交或回滚之后。
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                arguments = signature.bind(self, *args, **kwargs).arguments
+                scopes = [arguments[name] for name in vocab_params if name in arguments]
+                if vocabulary_list:
+                    scopes.append(VOCABULARY_LIST)
+                self._invalidate(*scopes)
+        return wrapper
+    return decorator
+
+
 class DatabaseManager:
-    def __init__(self, db_name='vocabulary.db'):
-        self.conn = sqlite3.connect(db_name)
-        self.cursor = self.conn.cursor()
+    """数据库访问层
+
+    读取使用当前线程自己的只读连接，写入通过 transaction() 在唯一的写连接上进行，
+    同一个 DatabaseManager 可以同时被界面线程、后台数据库线程和批处理任务使用。
+    """
+
+    def __init__(self, db_name='vocabulary.db', profile='balanced', cache_bytes=8 * 1024 * 1024):
+        self.db_name = db_name
+        self.profile = profile
+        self.connections = ConnectionManager(db_name, profile)
+        # 同一数据库文件的各个 DatabaseManager 共用查询缓存
+        self.cache = QueryCache.shared(db_name, cache_bytes)
+        self._local = threading.local()
         self.init_db()
-    
+
+    @property
+    def in_transaction(self) -> bool:
+        return getattr(self._local, 'depth', 0) > 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """当前线程应使用的连接：事务中为写连接，否则为本线程的读连接"""
+        if self.in_transaction:
+            return self.connections.writer
+        return self.connections.reader()[0]
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        if self.in_transaction:
+            return self.connections.writer_cursor
+        return self.connections.reader()[1]
+
+    @contextmanager
+    def transaction(self):
+        """工作单元：块内的所有修改在一个事务中提交，异常时整体回滚
+
+        最外层取得写锁并 BEGIN IMMEDIATE，其他线程的写入在锁上排队；
+        嵌套调用使用 SAVEPOINT，内层出错只回滚内层的修改。
+        块内的读取也走写连接，能看到尚未提交的修改。
+        """
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        conn = self.connections.writer
+        if depth:
+            savepoint = f'sp{depth}'
+            conn.execute(f'SAVEPOINT {savepoint}')
+            local.depth = depth + 1
+            try:
+                yield conn
+            except BaseException:
+                conn.execute(f'ROLLBACK TO {savepoint}')
+                conn.execute(f'RELEASE {savepoint}')
+                raise
+            else:
+                conn.execute(f'RELEASE {savepoint}')
+            finally:
+                local.depth = depth
+            return
+
+        with self.connections.write_lock:
+            conn.execute('BEGIN IMMEDIATE')
+            local.depth = 1
+            local.pending_scopes = set()
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                # 提交失败时事务仍然打开，同样回滚，写连接才能开始下一个事务
+                conn.rollback()
+                raise
+            finally:
+                local.depth = 0
+                scopes, local.pending_scopes = local.pending_scopes, None
+                # 提交后再让缓存失效，其他线程不会把提交前读到的旧数据当作新版本缓存
+                self.cache.invalidate(*scopes)
+
+    def _invalidate(self, *scopes):
+        if self.in_transaction:
+            self._local.pending_scopes.update(scopes)
+        else:
+            self.cache.invalidate(*scopes)
+
+    def release_thread(self):
+        """关闭当前线程的读连接（后台线程退出前调用）"""
+        self.connections.release_thread()
+
+    def close(self):
+        self.connections.close()
+
     def init_db(self):
-        # 创建单词本表
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS vocabularies (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL
-            )
-        ''')
+        # 按 PRAGMA user_version 逐版本升级数据库结构（包括索引）
+        writer = self.connections.writer
+        with self.connections.write_lock:
+            version = get_schema_version(writer)
+            migrate(writer)
+            # 从版本 9 起使用增量整理模式，切换需要 VACUUM 一次。新数据库是空的，立即执行
+            # （切换到 WAL 时已写入文件头，同样需要）；已有数据的数据库耗时与大小成正比，
+            # 不在启动时执行，由界面在第一帧之后调用 compact()，完成之前每次启动都会再次提示
+            self.needs_compaction = writer.execute('PRAGMA auto_vacuum').fetchone()[0] != 2
+            if self.needs_compaction and version == 0:
+                writer.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                writer.execute('VACUUM')
+                self.needs_compaction = False
+            self.has_fts = writer.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'word_fts'").fetchone() is not None
 
-        # 创建词性释义表
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS word_pos_meanings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word TEXT NOT NULL,
-                pos TEXT NOT NULL,
-                meaning TEXT NOT NULL,
-                type TEXT NOT NULL DEFAULT 'word',  -- 添加类型字段，默认为单词
-                vocabulary_id INTEGER,
-                FOREIGN KEY (vocabulary_id) REFERENCES vocabularies (id)
-            )
-        ''')
+    def compact(self, progress: Optional[Callable[[int], None]] = None,
+                is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[bool, str]:
+        """一次性整理：切换到增量整理模式并 VACUUM，同时归还规范化结构迁移后旧表留下的空间
 
-        # 添加学习记录表
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS study_records (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                vocabulary_id INTEGER,
-                word TEXT,
-                is_correct BOOLEAN,
-                study_mode TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (vocabulary_id) REFERENCES vocabularies (id)
-            )
-        ''')
+        progress(估计的百分比) 在整理过程中调用；is_cancelled() 返回 True 时中断，
+        数据库保持原样，下次启动时再整理。整理期间持有写锁。
+        """
+        writer = self.connections.writer
+        with self.connections.write_lock:
+            if writer.execute('PRAGMA auto_vacuum').fetchall()[0][0] == 2:
+                self.needs_compaction = False
+                return True, "数据库已整理"
+            pages = max(writer.execute('PRAGMA page_count').fetchall()[0][0], 1)
+            steps, reported = 0, -1
 
-        # 创建错题本表
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS wrong_words (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                vocabulary_id INTEGER,
-                word TEXT NOT NULL,
-                meaning TEXT NOT NULL,
-                first_wrong_time DATETIME DEFAULT CURRENT_TIMESTAMP,
-                wrong_count INTEGER DEFAULT 1,
-                FOREIGN KEY (vocabulary_id) REFERENCES vocabularies (id)
-            )
-        ''')
+            def on_step():
+                nonlocal steps, reported
+                steps += 1
+                percent = min(99, steps * 100 // pages)
+                if progress and percent != reported:
+                    reported = percent
+                    progress(percent)
+                return 1 if is_cancelled and is_cancelled() else 0
 
-        self.conn.commit()
-    
+            writer.set_progress_handler(on_step, COMPACT_PROGRESS_STEPS)
+            try:
+                writer.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                writer.execute('VACUUM')
+            except sqlite3.OperationalError as e:
+                if is_cancelled and is_cancelled():
+                    return False, "整理已取消，下次启动时继续"
+                return False, f"整理失败：{str(e)}"
+            finally:
+                writer.set_progress_handler(None, 0)
+        self.needs_compaction = False
+        if progress:
+            progress(100)
+        return True, "数据库整理完成"
+
+    @invalidates(vocabulary_list=True)
     def add_vocabulary(self, name: str) -> Tuple[bool, str]:
         try:
             if not name.strip():
                 return False, "单词本名称不能为空"
-            self.cursor.execute('INSERT INTO vocabularies (name) VALUES (?)', (name.strip(),))
-            self.conn.commit()
+            with self.transaction():
+                self.cursor.execute('INSERT INTO vocabularies (name) VALUES (?)', (name.strip(),))
             return True, "单词本创建成功"
         except sqlite3.IntegrityError:
             return False, "该单词本已存在"
         except Exception as e:
             return False, f"创建失败：{str(e)}"
     
+    @invalidates('vocab_id', vocabulary_list=True)
+    @retry_on_busy
     def delete_vocabulary(self, vocab_id):
-        self.cursor.execute('DELETE FROM word_pos_meanings WHERE vocabulary_id = ?', (vocab_id,))
-        self.cursor.execute('DELETE FROM vocabularies WHERE id = ?', (vocab_id,))
-        self.conn.commit()
+        # 汇总统计保留；删除单词时触发器一并删除释义和错题
+        with self.transaction():
+            for table in ('study_events', 'study_event_days'):
+                self.cursor.execute(f'DELETE FROM {table} WHERE word_id IN (SELECT id FROM words WHERE vocabulary_id = ?)',
+                                    (vocab_id,))
+            self.cursor.execute('DELETE FROM words WHERE vocabulary_id = ?', (vocab_id,))
+            self.cursor.execute('DELETE FROM vocabularies WHERE id = ?', (vocab_id,))
     
+    @read_through
     def get_vocabularies(self):
         self.cursor.execute('SELECT id, name FROM vocabularies')
         return self.cursor.fetchall()
@@ -87,111 +266,278 @@ class DatabaseManager:
             return True, "导出成功"
         except Exception as e:
             return False, f"导出失败：{str(e)}"
+    @invalidates('vocab_id')
+    def import_vocabulary(self, vocab_id: int, file_path: str, policy: str = 'skip',
+                          progress_callback=None, is_cancelled=None) -> Tuple[bool, str]:
+        try:
+            counts = VocabularyImporter(self).import_file(vocab_id, file_path, policy,
+                                                         progress_callback=progress_callback,
+                                                         is_cancelled=is_cancelled)
+            message = (f"导入完成：新增 {counts['added']} 个，合并 {counts['merged']} 个，"
+                       f"覆盖 {counts['overwritten']} 个，跳过 {counts['skipped']} 个")
+            if counts['invalid']:
+                message += f"，无法解析 {counts['invalid']} 行"
+            return True, message
+        except ImportCancelled:
+            return False, "导入已取消，单词本没有改动"
+        except Exception as e:
+            return False, f"导入失败：{str(e)}"
+    def _word_id(self, word: str, vocab_id: int) -> Optional[int]:
+        self.cursor.execute('SELECT id FROM words WHERE vocabulary_id = ? AND word = ?', (vocab_id, word))
+        row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def _insert_senses(self, word_id: int, pos_meanings: List[Tuple[str, str]]):
+        """添加词性释义，新的词性先登记编码"""
+        self.cursor.executemany('INSERT OR IGNORE INTO parts_of_speech (name) VALUES (?)',
+                                [(pos,) for pos, _ in pos_meanings])
+        self.cursor.executemany('''
+            INSERT INTO senses (word_id, pos_id, meaning)
+            SELECT ?, id, ? FROM parts_of_speech WHERE name = ?
+        ''', [(word_id, meaning.strip(), pos) for pos, meaning in pos_meanings])
+
+    @invalidates('vocab_id')
     def delete_word(self, word: str, vocab_id: int):
         try:
-            # 先删除该单词的所有词性释义
-            self.cursor.execute('DELETE FROM word_pos_meanings WHERE word = ? AND vocabulary_id = ?', 
-                            (word, vocab_id))
-            # 同时删除学习记录
-            self.cursor.execute('DELETE FROM study_records WHERE word = ? AND vocabulary_id = ?', 
-                            (word, vocab_id))
-            # 同时删除错题记录
-            self.cursor.execute('DELETE FROM wrong_words WHERE word = ? AND vocabulary_id = ?', 
-                            (word, vocab_id))
-            self.conn.commit()
+            with self.transaction():
+                word_id = self._word_id(word, vocab_id)
+                if word_id is not None:
+                    # 先从汇总统计中扣除并删除学习记录
+                    self._subtract_study_stats(word_id, vocab_id)
+                    self.cursor.execute('DELETE FROM study_events WHERE word_id = ?', (word_id,))
+                    self.cursor.execute('DELETE FROM study_event_days WHERE word_id = ?', (word_id,))
+                    # 单词行包含复习调度状态，释义和错题由触发器一并删除
+                    self.cursor.execute('DELETE FROM words WHERE id = ?', (word_id,))
             return True, "单词删除成功"
         except Exception as e:
-            self.conn.rollback()
             return False, f"删除失败：{str(e)}"
-    def update_vocab_list(self, vocab_list):
+    def update_vocab_list(self, vocab_list, vocabularies=None):
+        # vocabularies 为已经查询到的单词本，同时刷新多个控件时只查询一次
         vocab_list.clear()
-        vocabularies = self.get_vocabularies()
+        if vocabularies is None:
+            vocabularies = self.get_vocabularies()
         for vocab_id, name in vocabularies:
             vocab_list.addItem(f"{name} (ID: {vocab_id})")
 
-    def update_vocab_combo(self, combo):
+    def update_vocab_combo(self, combo, vocabularies=None):
         combo.clear()
-        vocabularies = self.get_vocabularies()
+        if vocabularies is None:
+            vocabularies = self.get_vocabularies()
         for vocab_id, name in vocabularies:
             combo.addItem(name, vocab_id)
 
     def update_words_list(self, words_list, vocab_id):
+        # 使用 WordListModel 的列表交给模型分页读取
+        model = words_list.model() if hasattr(words_list, 'model') else None
+        if hasattr(model, 'set_vocabulary'):
+            model.set_vocabulary(vocab_id)
+            return
         words_list.clear()
         if vocab_id:
             words = self.get_words_with_pos_meanings(vocab_id)
             for word, meanings in words:
                 words_list.addItem(f"{word}: {meanings}")
-    def record_study(self, vocab_id: int, word: str, is_correct: bool, study_mode: str):
-        self.cursor.execute('INSERT INTO study_records (vocabulary_id, word, is_correct, study_mode) VALUES (?, ?, ?, ?)',
-                            (vocab_id, word, is_correct, study_mode))
-        self.conn.commit()
+    @retry_on_busy
+    def record_study(self, vocab_id: int, word: str, is_correct: bool, study_mode: str,
+                     response_ms: Optional[int] = None):
+        with self.transaction():
+            self._insert_study_events([(vocab_id, word, is_correct, study_mode, None, response_ms)])
+
+    def _insert_study_events(self, records: List[Tuple]):
+        """records 格式同 write_study_events；单词和模式换成整数编码，时间为空时取当前时间"""
+        self.cursor.executemany('INSERT OR IGNORE INTO study_modes (name) VALUES (?)',
+                                [(mode,) for mode in {record[3] or '' for record in records}])
+        self.cursor.executemany('''
+            INSERT INTO study_events (word_id, mode_id, is_correct, timestamp, response_ms)
+            SELECT w.id, (SELECT id FROM study_modes WHERE name = IFNULL(?4, '')), IFNULL(?3, 0),
+                   IFNULL(CAST(strftime('%s', ?5) AS INTEGER), CAST(strftime('%s', 'now') AS INTEGER)), ?6
+            FROM words w
+            WHERE w.vocabulary_id = ?1 AND w.word = ?2
+        ''', records)
+
+    @retry_on_busy
+    def write_study_events(self, records: List[Tuple], wrong_word_events: List[Tuple], card_states: List[Tuple] = ()):
+        """批量写入学习记录、错题和复习调度状态，整批在一个事务中提交
+
+        records: (vocab_id, word, is_correct, study_mode, timestamp, response_ms)
+        wrong_word_events: 按答题顺序的错题变化 (vocab_id, word, timestamp, is_correct)；
+            答错时错误次数加一、连续答对次数清零，错题复习答对时错误次数减一，减到 0 时移出错题本。
+            同一单词先错后对和先对后错的结果不同，按顺序分段执行
+        card_states: (vocab_id, word, due, stability, difficulty, lapses, reps, last_review)
+        """
+        with self.transaction():
+            if records:
+                self._insert_study_events(records)
+            for is_correct, events in itertools.groupby(wrong_word_events, key=lambda event: bool(event[3])):
+                rows = [event[:3] for event in events]
+                if not is_correct:
+                    # 释义不再单独保存，显示时从 senses 读取
+                    self.cursor.executemany('''
+                        INSERT INTO wrong_entries (word_id, wrong_count, first_wrong_time, last_wrong_time, correct_streak)
+                        SELECT id, 1, ?3, ?3, 0 FROM words WHERE vocabulary_id = ?1 AND word = ?2
+                        ON CONFLICT (word_id) DO UPDATE SET
+                            wrong_count = wrong_count + 1,
+                            last_wrong_time = excluded.last_wrong_time,
+                            correct_streak = 0
+                    ''', rows)
+                    continue
+                rows = [row[:2] for row in rows]
+                self.cursor.executemany('''
+                    UPDATE wrong_entries SET wrong_count = wrong_count - 1, correct_streak = correct_streak + 1
+                    WHERE word_id = (SELECT id FROM words WHERE vocabulary_id = ? AND word = ?)
+                ''', rows)
+                self.cursor.executemany('''
+                    DELETE FROM wrong_entries
+                    WHERE word_id = (SELECT id FROM words WHERE vocabulary_id = ? AND word = ?) AND wrong_count <= 0
+                ''', rows)
+            if card_states:
+                self.cursor.executemany('''
+                    UPDATE words SET due = ?3, stability = ?4, difficulty = ?5, lapses = ?6, reps = ?7,
+                                     last_review = ?8
+                    WHERE vocabulary_id = ?1 AND word = ?2
+                ''', card_states)
 
     def get_daily_stats(self, vocab_id: int = None):
+        # 读取增量维护的汇总表，耗时与学习记录条数无关
         if vocab_id:
             self.cursor.execute('''
-                SELECT DATE(timestamp) as date,
-                    COUNT(*) as total_words,
-                    SUM(is_correct) as correct_words,
-                    ROUND(SUM(is_correct) * 100.0 / COUNT(*), 2) as accuracy
-                FROM study_records
+                SELECT day as date,
+                    SUM(total) as total_words,
+                    SUM(correct) as correct_words,
+                    ROUND(SUM(correct) * 100.0 / SUM(total), 2) as accuracy,
+                    CAST(SUM(latency_total) / NULLIF(SUM(latency_count), 0) AS INTEGER) as avg_response_ms
+                FROM study_stats_daily
                 WHERE vocabulary_id = ?
-                GROUP BY DATE(timestamp)
-                ORDER BY DATE(timestamp) DESC
+                GROUP BY day
+                ORDER BY day DESC
             ''', (vocab_id,))
         else:
             self.cursor.execute('''
-                SELECT DATE(timestamp) as date,
-                    COUNT(*) as total_words,
-                    SUM(is_correct) as correct_words,
-                    ROUND(SUM(is_correct) * 100.0 / COUNT(*), 2) as accuracy
-                FROM study_records
-                GROUP BY DATE(timestamp)
-                ORDER BY DATE(timestamp) DESC
+                SELECT day as date,
+                    SUM(total) as total_words,
+                    SUM(correct) as correct_words,
+                    ROUND(SUM(correct) * 100.0 / SUM(total), 2) as accuracy,
+                    CAST(SUM(latency_total) / NULLIF(SUM(latency_count), 0) AS INTEGER) as avg_response_ms
+                FROM study_stats_daily
+                GROUP BY day
+                ORDER BY day DESC
             ''')
         return self.cursor.fetchall()
+
+    def _subtract_study_stats(self, word_id: int, vocab_id: int):
+        """删除学习记录前，从汇总统计表中扣除这些记录（包括已归档事件的按日汇总）"""
+        for table, period, expr in (('study_stats_daily', 'day', "DATE(e.timestamp, 'unixepoch')"),
+                                    ('study_stats_weekly', 'week', "strftime('%Y-%W', e.timestamp, 'unixepoch')")):
+            self.cursor.execute(f'''
+                SELECT {expr}, m.name, SUM(e.total), IFNULL(SUM(e.correct), 0),
+                       SUM(e.latency_total), SUM(e.latency_count)
+                FROM (
+                    SELECT timestamp, mode_id, 1 AS total, is_correct AS correct,
+                           IFNULL(response_ms, 0) AS latency_total, response_ms IS NOT NULL AS latency_count
+                    FROM study_events WHERE word_id = ?1
+                    UNION ALL
+                    SELECT day * 86400, mode_id, total, correct, latency_total, latency_count
+                    FROM study_event_days WHERE word_id = ?1
+                ) e
+                JOIN study_modes m ON m.id = e.mode_id
+                GROUP BY 1, 2
+            ''', (word_id,))
+            deltas = [(total, correct, latency_total, latency_count, vocab_id, period_value, mode)
+                      for period_value, mode, total, correct, latency_total, latency_count
+                      in self.cursor.fetchall()]
+            self.cursor.executemany(f'''
+                UPDATE {table} SET total = total - ?, correct = correct - ?,
+                                   latency_total = latency_total - ?, latency_count = latency_count - ?
+                WHERE vocabulary_id = ? AND {period} = ? AND study_mode = ?
+            ''', deltas)
+            self.cursor.executemany(f'''
+                DELETE FROM {table} WHERE vocabulary_id = ? AND {period} = ? AND study_mode = ? AND total <= 0
+            ''', [d[4:] for d in deltas])
+    @retry_on_busy
     def add_wrong_word(self, vocab_id: int, word: str, meaning: str):
-        self.cursor.execute('''
-            INSERT OR REPLACE INTO wrong_words (vocabulary_id, word, meaning, wrong_count)
-            VALUES (?, ?, ?, COALESCE((SELECT wrong_count FROM wrong_words 
-            WHERE vocabulary_id = ? AND word = ?), 0) + 1)
-        ''', (vocab_id, word, meaning, vocab_id, word))
-        self.conn.commit()
+        # 每个单词最多一条错题，已存在时累加错误次数；释义显示时从 senses 读取
+        with self.transaction():
+            self.cursor.execute('''
+                INSERT INTO wrong_entries (word_id, wrong_count, last_wrong_time)
+                SELECT id, 1, CURRENT_TIMESTAMP FROM words WHERE vocabulary_id = ? AND word = ?
+                ON CONFLICT (word_id) DO UPDATE SET
+                    wrong_count = wrong_count + 1,
+                    last_wrong_time = excluded.last_wrong_time,
+                    correct_streak = 0
+            ''', (vocab_id, word))
 
     def get_wrong_words(self, vocab_id: int = None):
         if vocab_id:
-            self.cursor.execute('SELECT word, meaning, wrong_count FROM wrong_words WHERE vocabulary_id = ?', (vocab_id,))
+            self.cursor.execute(f'''
+                SELECT w.word, {MEANINGS_SQL.format(word_id='w.id')}, e.wrong_count
+                FROM wrong_entries e JOIN words w ON w.id = e.word_id
+                WHERE w.vocabulary_id = ?
+            ''', (vocab_id,))
         else:
-            self.cursor.execute('SELECT word, meaning, wrong_count FROM wrong_words')
+            self.cursor.execute(f'''
+                SELECT w.word, {MEANINGS_SQL.format(word_id='w.id')}, e.wrong_count
+                FROM wrong_entries e JOIN words w ON w.id = e.word_id
+            ''')
         return self.cursor.fetchall()
 
-    def remove_wrong_word(self, word: str):
-        self.cursor.execute('DELETE FROM wrong_words WHERE word = ?', (word,))
-        self.conn.commit()
+    def get_wrong_word_cards(self, vocab_id: int):
+        """错题复习用：[(单词, 词性释义, 错误次数, 最近答错时间, 连续答对次数)]"""
+        self.cursor.execute(f'''
+            SELECT w.word, {MEANINGS_SQL.format(word_id='w.id')}, e.wrong_count,
+                   IFNULL(e.last_wrong_time, e.first_wrong_time), e.correct_streak
+            FROM wrong_entries e JOIN words w ON w.id = e.word_id
+            WHERE w.vocabulary_id = ?
+        ''', (vocab_id,))
+        return self.cursor.fetchall()
+
+    @retry_on_busy
+    def remove_wrong_word(self, word: str, vocab_id: int = None):
+        with self.transaction():
+            if vocab_id:
+                self.cursor.execute('''
+                    DELETE FROM wrong_entries WHERE word_id = (SELECT id FROM words WHERE vocabulary_id = ? AND word = ?)
+                ''', (vocab_id, word))
+            else:
+                self.cursor.execute('DELETE FROM wrong_entries WHERE word_id IN (SELECT id FROM words WHERE word = ?)',
+                                    (word,))
+
+    @retry_on_busy
+    def clear_wrong_words(self, vocab_id: int = None):
+        """清空错题本，vocab_id 为空时清空所有单词本的错题"""
+        with self.transaction():
+            if vocab_id:
+                self.cursor.execute('DELETE FROM wrong_entries WHERE word_id IN (SELECT id FROM words WHERE vocabulary_id = ?)',
+                                    (vocab_id,))
+            else:
+                self.cursor.execute('DELETE FROM wrong_entries')
     def get_detailed_stats(self, vocab_id: int = None):
         if vocab_id:
+            # 主键是覆盖索引，优化器会选它再排序；强制走与 ORDER BY 顺序一致的索引
             self.cursor.execute('''
                 SELECT 
-                    DATE(timestamp) as date,
+                    day as date,
                     study_mode,
-                    COUNT(*) as total_words,
-                    SUM(is_correct) as correct_words,
-                    ROUND(SUM(is_correct) * 100.0 / COUNT(*), 2) as accuracy
-                FROM study_records
+                    SUM(total) as total_words,
+                    SUM(correct) as correct_words,
+                    ROUND(SUM(correct) * 100.0 / SUM(total), 2) as accuracy,
+                    CAST(SUM(latency_total) / NULLIF(SUM(latency_count), 0) AS INTEGER) as avg_response_ms
+                FROM study_stats_daily INDEXED BY idx_study_stats_daily_vocab_day
                 WHERE vocabulary_id = ?
-                GROUP BY DATE(timestamp), study_mode
-                ORDER BY DATE(timestamp) DESC, study_mode
+                GROUP BY day, study_mode
+                ORDER BY day DESC, study_mode
             ''', (vocab_id,))
         else:
             self.cursor.execute('''
                 SELECT 
-                    DATE(timestamp) as date,
+                    day as date,
                     study_mode,
-                    COUNT(*) as total_words,
-                    SUM(is_correct) as correct_words,
-                    ROUND(SUM(is_correct) * 100.0 / COUNT(*), 2) as accuracy
-                FROM study_records
-                GROUP BY DATE(timestamp), study_mode
-                ORDER BY DATE(timestamp) DESC, study_mode
+                    SUM(total) as total_words,
+                    SUM(correct) as correct_words,
+                    ROUND(SUM(correct) * 100.0 / SUM(total), 2) as accuracy,
+                    CAST(SUM(latency_total) / NULLIF(SUM(latency_count), 0) AS INTEGER) as avg_response_ms
+                FROM study_stats_daily
+                GROUP BY day, study_mode
+                ORDER BY day DESC, study_mode
             ''')
         return self.cursor.fetchall()
 
@@ -199,179 +545,286 @@ class DatabaseManager:
         if vocab_id:
             self.cursor.execute('''
                 SELECT 
-                    strftime('%Y-%W', timestamp) as week,
-                    COUNT(*) as total_words,
-                    SUM(is_correct) as correct_words,
-                    ROUND(SUM(is_correct) * 100.0 / COUNT(*), 2) as accuracy
-                FROM study_records
+                    week,
+                    SUM(total) as total_words,
+                    SUM(correct) as correct_words,
+                    ROUND(SUM(correct) * 100.0 / SUM(total), 2) as accuracy,
+                    CAST(SUM(latency_total) / NULLIF(SUM(latency_count), 0) AS INTEGER) as avg_response_ms
+                FROM study_stats_weekly
                 WHERE vocabulary_id = ?
-                GROUP BY strftime('%Y-%W', timestamp)
+                GROUP BY week
                 ORDER BY week DESC
                 LIMIT 8
             ''', (vocab_id,))
         else:
             self.cursor.execute('''
                 SELECT 
-                    strftime('%Y-%W', timestamp) as week,
-                    COUNT(*) as total_words,
-                    SUM(is_correct) as correct_words,
-                    ROUND(SUM(is_correct) * 100.0 / COUNT(*), 2) as accuracy
-                FROM study_records
-                GROUP BY strftime('%Y-%W', timestamp)
+                    week,
+                    SUM(total) as total_words,
+                    SUM(correct) as correct_words,
+                    ROUND(SUM(correct) * 100.0 / SUM(total), 2) as accuracy,
+                    CAST(SUM(latency_total) / NULLIF(SUM(latency_count), 0) AS INTEGER) as avg_response_ms
+                FROM study_stats_weekly
+                GROUP BY week
                 ORDER BY week DESC
                 LIMIT 8
             ''')
         return self.cursor.fetchall()
     def search_words(self, vocab_id: int, search_text: str):
-        self.cursor.execute('''
-            SELECT word, GROUP_CONCAT(pos || ': ' || meaning, '; ')
-            FROM word_pos_meanings 
-            WHERE vocabulary_id = ? AND (LOWER(word) LIKE ? OR LOWER(meaning) LIKE ?)
-            GROUP BY word
-        ''', (vocab_id, f'%{search_text}%', f'%{search_text}%'))
-        words = self.cursor.fetchall()
+        words = self.search_words_ranked(search_text, vocab_id)
         # 添加序号
-        return [(f"{i+1}. {word}", meanings) for i, (word, meanings) in enumerate(words)]
+        return [(f"{i+1}. {word}", meanings) for i, (_, word, meanings, _) in enumerate(words)]
+
+    @staticmethod
+    def _fts_quote(text: str) -> str:
+        return '"' + text.replace('"', '""') + '"'
+
+    def search_words_ranked(self, search_text: str, vocab_id: int = None, mode: str = 'terms',
+                            limit: int = 500):
+        """全文搜索单词和释义，按相关度排序
+
+        mode: 'terms' 每个空格分隔的词都要出现；'phrase' 整个输入作为连续短语；
+              'prefix' 单词以输入开头。vocab_id 为空时跨所有单词本搜索。
+        返回 [(单词本ID, 单词, 全部词性释义, 得分)]，得分越小越相关。
+        """
+        search_text = search_text.strip()
+        if not search_text:
+            return []
+        if mode == 'phrase' or mode == 'prefix':
+            terms = [search_text]
+        else:
+            terms = search_text.split()
+
+        # trigram 分词无法匹配少于 3 个字符的词，这些词用 instr 在候选结果上过滤
+        long_terms = [t for t in terms if len(t) >= 3]
+        short_terms = [t for t in terms if len(t) < 3]
+        use_fts = self.has_fts and bool(long_terms)
+
+        filters = []
+        params = []
+        if vocab_id:
+            filters.append('w.vocabulary_id = ?')
+            params.append(vocab_id)
+        if mode == 'prefix':
+            filters.append('substr(LOWER(w.word), 1, ?) = LOWER(?)')
+            params.extend([len(search_text), search_text])
+        for term in (short_terms if use_fts else terms):
+            if mode == 'prefix':
+                break
+            filters.append('(instr(LOWER(w.word), LOWER(?)) > 0 OR instr(LOWER(s.meaning), LOWER(?)) > 0)')
+            params.extend([term, term])
+        where = ' AND '.join(filters) if filters else '1'
+
+        # 完全匹配的单词排在最前，其次是前缀匹配，再按相关度
+        order = '''
+            ORDER BY LOWER(word) = LOWER(?) DESC,
+                     substr(LOWER(word), 1, ?) = LOWER(?) DESC,
+                     score, word
+        '''
+        order_params = [search_text, len(search_text), search_text]
+
+        if use_fts:
+            match = ' AND '.join(self._fts_quote(t) for t in long_terms)
+            if mode == 'prefix':
+                match = 'word : ' + match
+            hits = f'''
+                WITH matched AS (
+                    SELECT rowid AS id, rank AS score FROM word_fts WHERE word_fts MATCH ?
+                )
+                SELECT w.id AS word_id, w.vocabulary_id, w.word, MIN(m.score) AS score
+                FROM matched m CROSS JOIN senses s ON s.id = m.id  -- 强制先走全文索引
+                JOIN words w ON w.id = s.word_id
+                WHERE {where}
+                GROUP BY w.id
+            '''
+            params = [match] + params
+        else:
+            hits = f'''
+                SELECT w.id AS word_id, w.vocabulary_id, w.word, 0 AS score
+                FROM words w
+                JOIN senses s ON s.word_id = w.id
+                WHERE {where}
+                GROUP BY w.id
+            '''
+
+        # 先在命中的单词上排序截断，再拼接完整的词性释义
+        self.cursor.execute(f'''
+            WITH hits AS (
+                SELECT * FROM ({hits}) {order} LIMIT ?
+            )
+            SELECT h.vocabulary_id, h.word, {MEANINGS_SQL.format(word_id='h.word_id')}, h.score
+            FROM hits h
+            ORDER BY LOWER(h.word) = LOWER(?) DESC,
+                     substr(LOWER(h.word), 1, ?) = LOWER(?) DESC,
+                     h.score, h.word
+        ''', params + order_params + [limit] + order_params)
+        return self.cursor.fetchall()
+
     def add_word_with_pos_meanings(self, word: str, pos_meanings: List[Tuple[str, str]], vocab_id: int) -> Tuple[bool, str]:
+        # 使用默认类型'word'
+        return self.add_word_with_pos_meanings_and_type(word, pos_meanings, 'word', vocab_id)
+
+    @invalidates('vocab_id')
+    def add_word_with_pos_meanings_and_type(self, word: str, pos_meanings: List[Tuple[str, str]], word_type: str, vocab_id: int) -> Tuple[bool, str]:
         try:
             if not word.strip():
                 return False, "单词不能为空"
-                
-            # 检查单词是否已存在
-            self.cursor.execute('SELECT id FROM word_pos_meanings WHERE word = ? AND vocabulary_id = ?', 
-                            (word.strip(), vocab_id))
-            if self.cursor.fetchone():
-                return False, "该单词已存在于当前单词本中"
-            
-            # 添加词性和释义（使用默认类型'word'）
-            for pos, meaning in pos_meanings:
-                self.cursor.execute('INSERT INTO word_pos_meanings (word, pos, meaning, vocabulary_id, type) VALUES (?, ?, ?, ?, ?)',
-                                (word.strip(), pos, meaning.strip(), vocab_id, 'word'))
-            
-            self.conn.commit()
+            if not pos_meanings:
+                return False, "请至少填写一个词性释义"
+
+            with self.transaction():
+                # 检查单词是否已存在
+                if self._word_id(word.strip(), vocab_id) is not None:
+                    return False, "该单词已存在于当前单词本中"
+
+                # 新单词立即到期（due 默认为当前时间）
+                self.cursor.execute('INSERT INTO words (vocabulary_id, word, type) VALUES (?, ?, ?)',
+                                    (vocab_id, word.strip(), WORD_TYPE_CODES.get(word_type, 0)))
+                self._insert_senses(self.cursor.lastrowid, pos_meanings)
             return True, "单词添加成功"
         except sqlite3.Error as e:
-            self.conn.rollback()
             return False, f"添加失败：{str(e)}"
-    
-    def add_word_with_pos_meanings_and_type(self, word: str, pos_meanings: List[Tuple[str, str]], word_type: str, vocab_id: int) -> Tuple[bool, str]:
+
+    @invalidates('vocab_id')
+    def update_word(self, word: str, vocab_id: int, new_word: str, pos_meanings: List[Tuple[str, str]],
+                    word_type: str) -> Tuple[bool, str]:
+        """原地修改单词：改名、改类型并替换全部词性释义，学习记录、错题和复习进度保留"""
         try:
-            if not word.strip():
+            new_word = new_word.strip()
+            if not new_word:
                 return False, "单词不能为空"
-                
-            # 检查单词是否已存在
-            self.cursor.execute('SELECT id FROM word_pos_meanings WHERE word = ? AND vocabulary_id = ?', 
-                            (word.strip(), vocab_id))
-            if self.cursor.fetchone():
-                return False, "该单词已存在于当前单词本中"
-            
-            # 添加词性和释义（使用传入的类型）
-            for pos, meaning in pos_meanings:
-                self.cursor.execute('INSERT INTO word_pos_meanings (word, pos, meaning, vocabulary_id, type) VALUES (?, ?, ?, ?, ?)',
-                                (word.strip(), pos, meaning.strip(), vocab_id, word_type))
-            
-            self.conn.commit()
-            return True, "单词添加成功"
+            if not pos_meanings:
+                return False, "请至少填写一个词性释义"
+            with self.transaction():
+                word_id = self._word_id(word, vocab_id)
+                if word_id is None:
+                    return False, "在当前单词本中未找到该单词"
+                if new_word != word and self._word_id(new_word, vocab_id) is not None:
+                    return False, "该单词已存在于当前单词本中"
+
+                self.cursor.execute('UPDATE words SET word = ?, type = ? WHERE id = ?',
+                                    (new_word, WORD_TYPE_CODES.get(word_type, 0), word_id))
+                self.cursor.execute('DELETE FROM senses WHERE word_id = ?', (word_id,))
+                self._insert_senses(word_id, pos_meanings)
+            return True, "单词修改成功"
         except sqlite3.Error as e:
-            self.conn.rollback()
-            return False, f"添加失败：{str(e)}"
+            return False, f"修改失败：{str(e)}"
 
+    @read_through
     def get_words_with_pos_meanings(self, vocab_id, word_type=None):
+        conditions = ['w.vocabulary_id = ?']
+        params = [vocab_id]
         if word_type:
-            if isinstance(word_type, list):
-                # 处理多个类型的情况
-                placeholders = ','.join(['?' for _ in word_type])
-                self.cursor.execute(f'''
-                    SELECT word, GROUP_CONCAT(pos || ': ' || meaning, '; ')
-                    FROM word_pos_meanings
-                    WHERE vocabulary_id = ? AND type IN ({placeholders})
-                    GROUP BY word
-                ''', [vocab_id] + word_type)
-            else:
-                # 处理单个类型的情况
-                self.cursor.execute('''
-                    SELECT word, GROUP_CONCAT(pos || ': ' || meaning, '; ')
-                    FROM word_pos_meanings
-                    WHERE vocabulary_id = ? AND type = ?
-                    GROUP BY word
-                ''', (vocab_id, word_type))
-        else:
-            self.cursor.execute('''
-                SELECT word, GROUP_CONCAT(pos || ': ' || meaning, '; ')
-                FROM word_pos_meanings
-                WHERE vocabulary_id = ?
-                GROUP BY word
-            ''', (vocab_id,))
+            # 单个类型或多个类型
+            types = word_type if isinstance(word_type, list) else [word_type]
+            conditions.append(f"w.type IN ({','.join('?' for _ in types)})")
+            params.extend(WORD_TYPE_CODES.get(t, -1) for t in types)
+        self.cursor.execute(f'''
+            SELECT w.word, {MEANINGS_SQL.format(word_id='w.id')}
+            FROM words w
+            WHERE {' AND '.join(conditions)}
+            ORDER BY w.word
+        ''', params)
         words = self.cursor.fetchall()
         return [(f"{i+1}. {word}", meanings) for i, (word, meanings) in enumerate(words)]
+    @read_through
+    def count_words(self, vocab_id: int) -> int:
+        self.cursor.execute('SELECT COUNT(*) FROM words WHERE vocabulary_id = ?', (vocab_id,))
+        return self.cursor.fetchone()[0]
+
+    @read_through
+    def get_words_page(self, vocab_id: int, after_word: Optional[str] = None, limit: int = 200):
+        """按单词排序分页读取（键集分页），返回 [(单词, 词性释义, 类型, 单词ID)]
+
+        after_word 为上一页最后一个单词，走 (vocabulary_id, word) 唯一索引的范围扫描，
+        翻到第几页都不需要跳过前面的行。
+        """
+        if after_word is None:
+            condition, params = '', (vocab_id, limit)
+        else:
+            condition, params = 'AND w.word > ?', (vocab_id, after_word, limit)
+        self.cursor.execute(f'''
+            SELECT w.word, {MEANINGS_SQL.format(word_id='w.id')}, w.type, w.id
+            FROM words w
+            WHERE w.vocabulary_id = ? {condition}
+            ORDER BY w.word
+            LIMIT ?
+        ''', params)
+        return [(word, meanings, WORD_TYPE_NAMES.get(word_type, 'word'), word_id)
+                for word, meanings, word_type, word_id in self.cursor.fetchall()]
+
+    @read_through
+    def get_word_type(self, word: str, vocab_id: int) -> Optional[str]:
+        self.cursor.execute('SELECT type FROM words WHERE word = ? AND vocabulary_id = ?', (word, vocab_id))
+        result = self.cursor.fetchone()
+        return WORD_TYPE_NAMES.get(result[0], 'word') if result else None
+
+    def get_study_cards(self, vocab_id: int, word_type=None, due_before: Optional[str] = None):
+        """读取学习卡及其调度状态
+
+        due_before 不为空时只读取在该时间之前到期的卡，走 (vocabulary_id, due) 索引，
+        耗时与到期卡数成正比而不是与单词本大小成正比。
+        返回 [(单词, 词性释义, due, stability, difficulty, lapses, reps)]
+        """
+        conditions = ['w.vocabulary_id = ?']
+        params = [vocab_id]
+        # 查询优化器可能倾向 (vocabulary_id, word) 唯一索引而扫描整个单词本，到期查询强制走到期索引
+        index_hint = ''
+        if due_before is not None:
+            conditions.append('w.due <= ?')
+            params.append(due_before)
+            index_hint = 'INDEXED BY idx_words_due'
+        if word_type:
+            types = word_type if isinstance(word_type, list) else [word_type]
+            conditions.append(f"w.type IN ({','.join('?' for _ in types)})")
+            params.extend(WORD_TYPE_CODES.get(t, -1) for t in types)
+        self.cursor.execute(f'''
+            SELECT w.word, {MEANINGS_SQL.format(word_id='w.id')},
+                   w.due, w.stability, w.difficulty, w.lapses, w.reps
+            FROM words w {index_hint}
+            WHERE {' AND '.join(conditions)}
+        ''', params)
+        return self.cursor.fetchall()
+
+    @read_through
     def get_word_pos_meanings(self, word: str, vocab_id: int):
         self.cursor.execute('''
-            SELECT pos, meaning
-            FROM word_pos_meanings
-            WHERE vocabulary_id = ? AND word = ?
+            SELECT p.name, s.meaning
+            FROM words w
+            JOIN senses s ON s.word_id = w.id
+            JOIN parts_of_speech p ON p.id = s.pos_id
+            WHERE w.vocabulary_id = ? AND w.word = ?
+            ORDER BY s.id
         ''', (vocab_id, word))
         return self.cursor.fetchall()
+    @invalidates('from_vocab_id', 'to_vocab_id')
     def move_word(self, word: str, from_vocab_id: int, to_vocab_id: int) -> Tuple[bool, str]:
         try:
-            # 开始事务 - 使用一致的方式
-            self.cursor.execute('BEGIN TRANSACTION')
-            
-            # 检查目标单词本是否已存在该单词
-            self.cursor.execute('SELECT id FROM word_pos_meanings WHERE word = ? AND vocabulary_id = ?', 
-                            (word, to_vocab_id))
-            if self.cursor.fetchone():
-                self.conn.rollback()  # 使用一致的rollback方式
-                return False, "目标单词本中已存在该单词"
-                
-            # 获取原单词的所有词性释义
-            self.cursor.execute('''
-                SELECT pos, meaning
-                FROM word_pos_meanings
-                WHERE vocabulary_id = ? AND word = ?
-            ''', (from_vocab_id, word))
-            pos_meanings = self.cursor.fetchall()
-            
-            if not pos_meanings:
-                self.conn.rollback()
-                return False, "在原单词本中未找到该单词"
-            
-            # 添加到新单词本
-            for pos, meaning in pos_meanings:
-                self.cursor.execute('''
-                    INSERT INTO word_pos_meanings (word, pos, meaning, vocabulary_id) 
-                    VALUES (?, ?, ?, ?)
-                ''', (word, pos, meaning, to_vocab_id))
-                
-                # 检查插入是否成功
-                if self.cursor.rowcount == 0:
-                    self.conn.rollback()
-                    return False, "添加到目标单词本失败"
-            
-            # 从原单词本删除 - 使用参数化查询确保准确性
-            self.cursor.execute('''
-                DELETE FROM word_pos_meanings 
-                WHERE word = ? AND vocabulary_id = ?
-            ''', (word, from_vocab_id))
-            
-            deleted_count = self.cursor.rowcount
-            
-            # 同时删除相关的学习记录和错题记录
-            self.cursor.execute('DELETE FROM study_records WHERE word = ? AND vocabulary_id = ?', 
-                            (word, from_vocab_id))
-            self.cursor.execute('DELETE FROM wrong_words WHERE word = ? AND vocabulary_id = ?', 
-                            (word, from_vocab_id))
-            
-            # 提交事务
-            self.conn.commit()
-            
-            if deleted_count > 0:
-                return True, "单词移动成功"
-            else:
-                return False, "从原单词本删除失败"
-                
+            # 检查和修改在同一个事务中完成
+            with self.transaction():
+                # 检查目标单词本是否已存在该单词
+                if self._word_id(word, to_vocab_id) is not None:
+                    return False, "目标单词本中已存在该单词"
+
+                word_id = self._word_id(word, from_vocab_id)
+                if word_id is None:
+                    return False, "在原单词本中未找到该单词"
+
+                # 原单词本中的学习记录和错题记录不带到新单词本
+                self._subtract_study_stats(word_id, from_vocab_id)
+                self.cursor.execute('DELETE FROM study_events WHERE word_id = ?', (word_id,))
+                self.cursor.execute('DELETE FROM study_event_days WHERE word_id = ?', (word_id,))
+                self.cursor.execute('DELETE FROM wrong_entries WHERE word_id = ?', (word_id,))
+
+                # 释义随单词 id 一起移动，复习调度状态从头开始
+                self.cursor.execute("""
+                    UPDATE words SET vocabulary_id = ?, due = CURRENT_TIMESTAMP, stability = 0, difficulty = 5,
+                                     lapses = 0, reps = 0, last_review = NULL
+                    WHERE id = ?
+                """, (to_vocab_id, word_id))
+            return True, "单词移动成功"
+
         except sqlite3.Error as e:
-            self.conn.rollback()
             return False, f"移动失败：{str(e)}"
         except Exception as e:
-            self.conn.rollback()
             return False, f"移动过程中发生错误：{str(e)}"
\ No newline at end of file
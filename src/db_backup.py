@@ -0,0 +1,191 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from db_migrations import get_schema_version
+
+SNAPSHOT_PREFIX = 'vocabulary-'
+SNAPSHOT_SUFFIX = '.db'
+PARTIAL_SUFFIX = '.partial'
+TIME_FORMAT = '%Y%m%d-%H%M%S'
+
+PAGES_PER_STEP = 256          # 每步复制的页数（默认页大小 4 KiB 时约 1 MiB）
+DEFAULT_KEEP = 7              # 轮换保留的快照数
+BACKUP_INTERVAL_HOURS = 24    # 定时备份的间隔
+
+
+def _open_read_only(path: str) -> sqlite3.Connection:
+    return sqlite3.connect(Path(path).resolve().as_uri() + '?mode=ro', uri=True)
+
+
+def verify_snapshot(path: str, quick: bool = False) -> Tuple[bool, str]:
+    """检查快照文件：完整性检查通过，并且是本程序的数据库
+
+    quick 为 True 时使用 quick_check，不核对索引与表内容是否一致，速度快数倍。
+    """
+    if not os.path.isfile(path):
+        return False, "备份文件不存在"
+    try:
+        conn = _open_read_only(path)
+        try:
+            result = conn.execute('PRAGMA quick_check' if quick else 'PRAGMA integrity_check').fetchall()
+            if result != [('ok',)]:
+                return False, f"完整性检查失败：{'; '.join(row[0] for row in result[:5])}"
+            has_words = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'words'").fetchone()
+            if get_schema_version(conn) == 0 or has_words is None:
+                return False, "不是单词本数据库的备份"
+            return True, "备份完整"
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return False, f"无法读取备份：{str(e)}"
+
+
+class BackupManager:
+    """在线备份和恢复
+
+    使用 SQLite 备份接口按页分步复制，程序运行和写入时也能得到一致的副本。
+    备份从独立的连接读取，复制期间保持一个读事务：WAL 模式下写入不会被阻塞，
+    复制也不会因其他连接的写入而从头开始。快照先写到 .partial 文件，
+    通过完整性检查后才改为正式文件名，并按 keep 轮换删除最旧的快照。
+    """
+
+    def __init__(self, db, backup_dir: Optional[str] = None, keep: int = DEFAULT_KEEP,
+                 pages_per_step: int = PAGES_PER_STEP):
+        self.db = db
+        if backup_dir is None and db.db_name != ':memory:':
+            backup_dir = os.path.join(os.path.dirname(os.path.abspath(db.db_name)), 'backups')
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self.pages_per_step = pages_per_step
+
+    def snapshots(self) -> List[Tuple[str, datetime]]:
+        """已有的快照，最新的在前：[(路径, 备份时间)]"""
+        return [(path, created) for path, created, _ in self._parsed_snapshots()]
+
+    def _parsed_snapshots(self) -> List[Tuple[str, datetime, int]]:
+        """已有的快照，最新的在前：[(路径, 备份时间, 同一秒内的序号)]"""
+        if not self.backup_dir or not os.path.isdir(self.backup_dir):
+            return []
+        found = []
+        for name in os.listdir(self.backup_dir):
+            if not (name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX)):
+                continue
+            stem = name[len(SNAPSHOT_PREFIX):-len(SNAPSHOT_SUFFIX)]
+            # 同一秒内创建的后续快照带有 -1、-2 … 序号，按 (时间, 序号) 排序才是创建顺序
+            stamp, suffix = stem[:15], stem[15:]
+            try:
+                created = datetime.strptime(stamp, TIME_FORMAT)
+                counter = int(suffix[1:]) if suffix else 0
+            except ValueError:
+                continue
+            if suffix and not suffix.startswith('-'):
+                continue
+            found.append((created, counter, os.path.join(self.backup_dir, name)))
+        found.sort(reverse=True)
+        return [(path, created, counter) for created, counter, path in found]
+
+    def is_due(self, interval_hours: float = BACKUP_INTERVAL_HOURS) -> bool:
+        """距离最近一次备份已超过间隔"""
+        snapshots = self.snapshots()
+        return not snapshots or datetime.now() - snapshots[0][1] >= timedelta(hours=interval_hours)
+
+    def _new_snapshot_path(self) -> str:
+        now = datetime.now().replace(microsecond=0)
+        stamp = now.strftime(TIME_FORMAT)
+        # 同一秒内的序号接在已有的最大序号之后：轮换删掉较早的快照后，不能重新使用空出来的名字，
+        # 否则新快照会排在同一秒的旧快照后面
+        counters = [counter for path, created, counter in self._parsed_snapshots() if created == now]
+        if not counters:
+            return os.path.join(self.backup_dir, f'{SNAPSHOT_PREFIX}{stamp}{SNAPSHOT_SUFFIX}')
+        return os.path.join(self.backup_dir, f'{SNAPSHOT_PREFIX}{stamp}-{max(counters) + 1}{SNAPSHOT_SUFFIX}')
+
+    def backup(self, progress: Optional[Callable[[int, int], None]] = None,
+               rotate: bool = True, quick_check: bool = False) -> Tuple[bool, str]:
+        """备份当前数据库，成功时消息为快照路径
+
+        progress(已复制页数, 总页数) 在每步复制后调用。
+        """
+        if not self.backup_dir:
+            return False, "内存数据库不支持备份"
+        os.makedirs(self.backup_dir, exist_ok=True)
+        path = self._new_snapshot_path()
+        partial = path + PARTIAL_SUFFIX
+        try:
+            source = sqlite3.connect(self.db.db_name, isolation_level=None)
+            target = sqlite3.connect(partial)
+            try:
+                # 在读事务中复制，整个副本对应同一时刻的数据
+                source.execute('BEGIN')
+                source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+
+                def on_step(status, remaining, total):
+                    if progress:
+                        progress(total - remaining, total)
+
+                source.backup(target, pages=self.pages_per_step, progress=on_step, sleep=0.01)
+                source.execute('COMMIT')
+                # 快照使用回滚日志模式，单个文件即可完整复制或恢复
+                target.execute('PRAGMA journal_mode = DELETE')
+            finally:
+                target.close()
+                source.close()
+
+            ok, message = verify_snapshot(partial, quick_check)
+            if not ok:
+                os.remove(partial)
+                return False, message
+            os.replace(partial, path)
+        except (sqlite3.Error, OSError) as e:
+            if os.path.exists(partial):
+                os.remove(partial)
+            return False, f"备份失败：{str(e)}"
+
+        if rotate:
+            self.rotate()
+        return True, path
+
+    def rotate(self) -> List[str]:
+        """只保留最新的 keep 个快照，返回删除的文件"""
+        removed = []
+        for path, _ in self.snapshots()[self.keep:]:
+            try:
+                os.remove(path)
+                removed.append(path)
+            except OSError:
+                pass
+        return removed
+
+    def restore(self, path: str, progress: Optional[Callable[[int, int], None]] = None) -> Tuple[bool, str]:
+        """用快照替换当前数据库的全部内容
+
+        快照创建时已做过完整检查，这里只做 quick_check；当前数据先保存为一个新快照以便撤销，
+        然后在写连接上一次复制全部页面：复制在一个写事务中完成，其他线程的读连接
+        在提交前仍读到原来的数据。旧版本的快照恢复后按迁移升级，查询缓存全部作废。
+        """
+        ok, message = verify_snapshot(path, quick=True)
+        if not ok:
+            return False, message
+        ok, saved = self.backup(rotate=False, quick_check=True)
+        if not ok:
+            return False, f"恢复前保存当前数据失败：{saved}"
+        try:
+            source = _open_read_only(path)
+            try:
+                def on_step(status, remaining, total):
+                    if progress:
+                        progress(total - remaining, total)
+
+                with self.db.connections.write_lock:
+                    source.backup(self.db.connections.writer, pages=-1, progress=on_step, sleep=0.01)
+                    self.db.init_db()
+            finally:
+                source.close()
+        except sqlite3.Error as e:
+            return False, f"恢复失败：{str(e)}"
+        finally:
+            self.db.cache.clear()
+        return True, f"已从 {os.path.basename(path)} 恢复，恢复前的数据保存在 {os.path.basename(saved)}"
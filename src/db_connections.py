@@ -0,0 +1,114 @@
+import sqlite3
+import threading
+from typing import List, Tuple
+
+# 连接配置档：durable 每次提交都落盘，balanced 为默认，fast 牺牲掉电安全换取速度
+CONNECTION_PROFILES = {
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -8000,         # 负数表示 KiB
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 10000,       # 毫秒
+    },
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',     # WAL 下只在检查点时 fsync
+        'cache_size': -32000,
+        'mmap_size': 128 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 2000,
+    },
+}
+
+
+def apply_profile(conn: sqlite3.Connection, profile: str):
+    """按配置档设置连接的 PRAGMA"""
+    settings = CONNECTION_PROFILES[profile]
+    conn.execute(f"PRAGMA busy_timeout = {int(settings['busy_timeout'])}")
+    conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']}")
+    conn.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+    conn.execute(f"PRAGMA cache_size = {int(settings['cache_size'])}")
+    conn.execute(f"PRAGMA mmap_size = {int(settings['mmap_size'])}")
+    conn.execute(f"PRAGMA temp_store = {settings['temp_store']}")
+
+
+class ConnectionManager:
+    """按线程分配 SQLite 连接
+
+    所有写入共用一个写连接，由 write_lock 互斥，同一进程内的写入排队而不是互相等待 busy_timeout；
+    每个读取数据的线程第一次读取时得到自己的只读连接（query_only），WAL 模式下读连接
+    不阻塞写入，也不被写入阻塞，界面线程、后台数据库线程和批处理任务可以同时查询。
+    连接都在自动提交模式（isolation_level=None）下打开，事务由调用方显式开始和提交。
+    内存数据库无法在多个连接间共享，读写都使用写连接。
+    """
+
+    def __init__(self, db_name: str, profile: str = 'balanced'):
+        if profile not in CONNECTION_PROFILES:
+            raise ValueError(f"未知的连接配置：{profile}")
+        self.db_name = db_name
+        self.profile = profile
+        self.shared = db_name == ':memory:'
+        self.write_lock = threading.RLock()
+        self.writer = self._connect()
+        self.writer_cursor = self.writer.cursor()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        settings = CONNECTION_PROFILES[self.profile]
+        # 读连接只在所属线程中使用；允许跨线程是为了 close() 能在主线程统一关闭
+        conn = sqlite3.connect(self.db_name, timeout=settings['busy_timeout'] / 1000,
+                               isolation_level=None, check_same_thread=False)
+        apply_profile(conn, self.profile)
+        if read_only:
+            conn.execute('PRAGMA query_only = ON')
+        return conn
+
+    def reader(self) -> Tuple[sqlite3.Connection, sqlite3.Cursor]:
+        """当前线程的读连接和游标，第一次调用时创建"""
+        if self.shared:
+            return self.writer, self.writer_cursor
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            conn = local.conn = self._connect(read_only=True)
+            local.cursor = conn.cursor()
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn, local.cursor
+
+    @property
+    def reader_count(self) -> int:
+        return len(self._readers)
+
+    def release_thread(self):
+        """关闭当前线程的读连接，线程结束前调用"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = self._local.cursor = None
+        with self._readers_lock:
+            self._readers.remove(conn)
+        conn.close()
+
+    def close(self):
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            conn.close()
+        with self.write_lock:
+            try:
+                self.writer.execute('PRAGMA optimize')
+            finally:
+                self.writer.close()
@@ -0,0 +1,557 @@
+import sqlite3
+from typing import Callable, List, Tuple
+
+
+def _create_base_tables(cursor: sqlite3.Cursor):
+    """版本1：基础表结构"""
+    # 创建单词本表
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS vocabularies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )
+    ''')
+
+    # 创建词性释义表
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS word_pos_meanings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word TEXT NOT NULL,
+            pos TEXT NOT NULL,
+            meaning TEXT NOT NULL,
+            type TEXT NOT NULL DEFAULT 'word',  -- 添加类型字段，默认为单词
+            vocabulary_id INTEGER,
+            FOREIGN KEY (vocabulary_id) REFERENCES vocabularies (id)
+        )
+    ''')
+
+    # 添加学习记录表
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS study_records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            vocabulary_id INTEGER,
+            word TEXT,
+            is_correct BOOLEAN,
+            study_mode TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (vocabulary_id) REFERENCES vocabularies (id)
+        )
+    ''')
+
+    # 创建错题本表
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS wrong_words (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            vocabulary_id INTEGER,
+            word TEXT NOT NULL,
+            meaning TEXT NOT NULL,
+            first_wrong_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+            wrong_count INTEGER DEFAULT 1,
+            FOREIGN KEY (vocabulary_id) REFERENCES vocabularies (id)
+        )
+    ''')
+
+
+def _add_lookup_indexes(cursor: sqlite3.Cursor):
+    """版本2：为高频查询列添加索引"""
+    # 旧版本的 INSERT OR REPLACE 没有唯一约束，会产生重复错题，先合并
+    cursor.execute('''
+        UPDATE wrong_words
+        SET wrong_count = (SELECT MAX(w.wrong_count) FROM wrong_words w
+                           WHERE w.vocabulary_id IS wrong_words.vocabulary_id AND w.word = wrong_words.word),
+            first_wrong_time = (SELECT MIN(w.first_wrong_time) FROM wrong_words w
+                                WHERE w.vocabulary_id IS wrong_words.vocabulary_id AND w.word = wrong_words.word)
+        WHERE id IN (SELECT MAX(id) FROM wrong_words
+                     GROUP BY vocabulary_id, word HAVING COUNT(*) > 1)
+    ''')
+    cursor.execute('''
+        DELETE FROM wrong_words
+        WHERE id NOT IN (SELECT MAX(id) FROM wrong_words GROUP BY vocabulary_id, word)
+    ''')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_wpm_vocab_word ON word_pos_meanings (vocabulary_id, word)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_wpm_vocab_type ON word_pos_meanings (vocabulary_id, type, word)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_study_vocab_time ON study_records (vocabulary_id, timestamp)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_study_vocab_word ON study_records (vocabulary_id, word)')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS uq_wrong_vocab_word ON wrong_words (vocabulary_id, word)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_wrong_word ON wrong_words (word)')
+
+
+def _fts_tokenizer(cursor: sqlite3.Cursor):
+    """选择全文索引分词器：trigram 可以匹配中文释义的任意子串，旧版 SQLite 退回 unicode61"""
+    for tokenizer in ('trigram', 'unicode61'):
+        try:
+            cursor.execute(f"CREATE VIRTUAL TABLE temp._fts_probe USING fts5(x, tokenize='{tokenizer}')")
+            cursor.execute('DROP TABLE temp._fts_probe')
+            return tokenizer
+        except sqlite3.OperationalError:
+            continue
+    return None
+
+
+def _add_word_fts(cursor: sqlite3.Cursor):
+    """版本3：单词和释义的 FTS5 全文索引，由触发器与 word_pos_meanings 保持同步"""
+    tokenizer = _fts_tokenizer(cursor)
+    if tokenizer is None:
+        # SQLite 未编译 FTS5，搜索退回 LIKE 查询
+        return
+    cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS word_fts USING fts5(
+            word, meaning,
+            content='word_pos_meanings', content_rowid='id',
+            tokenize='{tokenizer}'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS word_fts_ai AFTER INSERT ON word_pos_meanings BEGIN
+            INSERT INTO word_fts (rowid, word, meaning) VALUES (new.id, new.word, new.meaning);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS word_fts_ad AFTER DELETE ON word_pos_meanings BEGIN
+            INSERT INTO word_fts (word_fts, rowid, word, meaning) VALUES ('delete', old.id, old.word, old.meaning);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS word_fts_au AFTER UPDATE OF word, meaning ON word_pos_meanings BEGIN
+            INSERT INTO word_fts (word_fts, rowid, word, meaning) VALUES ('delete', old.id, old.word, old.meaning);
+            INSERT INTO word_fts (rowid, word, meaning) VALUES (new.id, new.word, new.meaning);
+        END
+    ''')
+    # 为已有数据建立索引
+    cursor.execute("INSERT INTO word_fts (word_fts) VALUES ('rebuild')")
+
+
+def _add_study_stats_rollups(cursor: sqlite3.Cursor):
+    """版本4：按 天/周 × 单词本 × 学习模式 汇总的统计表，写入学习记录时由触发器增量维护"""
+    for table, period in (('study_stats_daily', 'day'), ('study_stats_weekly', 'week')):
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                vocabulary_id INTEGER NOT NULL,
+                {period} TEXT NOT NULL,
+                study_mode TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (vocabulary_id, {period}, study_mode)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{period} ON {table} ({period})')
+
+    # 日期口径与原统计查询一致：DATE(timestamp) 和 strftime('%Y-%W', timestamp)
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS study_records_stats_ai AFTER INSERT ON study_records BEGIN
+            INSERT INTO study_stats_daily (vocabulary_id, day, study_mode, total, correct)
+            VALUES (IFNULL(new.vocabulary_id, 0), DATE(new.timestamp), IFNULL(new.study_mode, ''),
+                    1, IFNULL(new.is_correct, 0))
+            ON CONFLICT (vocabulary_id, day, study_mode) DO UPDATE SET
+                total = total + 1,
+                correct = correct + excluded.correct;
+            INSERT INTO study_stats_weekly (vocabulary_id, week, study_mode, total, correct)
+            VALUES (IFNULL(new.vocabulary_id, 0), strftime('%Y-%W', new.timestamp), IFNULL(new.study_mode, ''),
+                    1, IFNULL(new.is_correct, 0))
+            ON CONFLICT (vocabulary_id, week, study_mode) DO UPDATE SET
+                total = total + 1,
+                correct = correct + excluded.correct;
+        END
+    ''')
+
+    # 一次性回填已有的学习记录
+    cursor.execute('''
+        INSERT OR REPLACE INTO study_stats_daily (vocabulary_id, day, study_mode, total, correct)
+        SELECT IFNULL(vocabulary_id, 0), DATE(timestamp), IFNULL(study_mode, ''),
+               COUNT(*), IFNULL(SUM(is_correct), 0)
+        FROM study_records
+        GROUP BY 1, 2, 3
+    ''')
+    cursor.execute('''
+        INSERT OR REPLACE INTO study_stats_weekly (vocabulary_id, week, study_mode, total, correct)
+        SELECT IFNULL(vocabulary_id, 0), strftime('%Y-%W', timestamp), IFNULL(study_mode, ''),
+               COUNT(*), IFNULL(SUM(is_correct), 0)
+        FROM study_records
+        GROUP BY 1, 2, 3
+    ''')
+
+
+def _add_card_states(cursor: sqlite3.Cursor):
+    """版本5：间隔重复调度状态，(vocabulary_id, due) 索引支持按到期时间范围查询"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS card_states (
+            vocabulary_id INTEGER NOT NULL,
+            word TEXT NOT NULL,
+            due DATETIME NOT NULL,              -- 与 timestamp 相同的 UTC 格式
+            stability REAL NOT NULL DEFAULT 0,  -- 复习间隔（天）
+            difficulty REAL NOT NULL DEFAULT 5, -- 1（容易）到 10（困难）
+            lapses INTEGER NOT NULL DEFAULT 0,
+            reps INTEGER NOT NULL DEFAULT 0,
+            last_review DATETIME,
+            PRIMARY KEY (vocabulary_id, word)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_card_states_due ON card_states (vocabulary_id, due)')
+    # 新单词立即到期
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS word_card_state_ai AFTER INSERT ON word_pos_meanings BEGIN
+            INSERT OR IGNORE INTO card_states (vocabulary_id, word, due)
+            VALUES (new.vocabulary_id, new.word, CURRENT_TIMESTAMP);
+        END
+    ''')
+    cursor.execute('''
+        INSERT OR IGNORE INTO card_states (vocabulary_id, word, due)
+        SELECT DISTINCT vocabulary_id, word, CURRENT_TIMESTAMP
+        FROM word_pos_meanings
+        WHERE vocabulary_id IS NOT NULL
+    ''')
+
+
+def _add_response_latency(cursor: sqlite3.Cursor):
+    """版本6：记录每次作答的反应时间（毫秒），汇总表同时累计用时和计数以便求平均"""
+    cursor.execute('ALTER TABLE study_records ADD COLUMN response_ms INTEGER')
+    for table in ('study_stats_daily', 'study_stats_weekly'):
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN latency_total INTEGER NOT NULL DEFAULT 0')
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN latency_count INTEGER NOT NULL DEFAULT 0')
+
+    # 旧记录没有反应时间（NULL），不计入平均
+    cursor.execute('DROP TRIGGER IF EXISTS study_records_stats_ai')
+    cursor.execute('''
+        CREATE TRIGGER study_records_stats_ai AFTER INSERT ON study_records BEGIN
+            INSERT INTO study_stats_daily (vocabulary_id, day, study_mode, total, correct,
+                                           latency_total, latency_count)
+            VALUES (IFNULL(new.vocabulary_id, 0), DATE(new.timestamp), IFNULL(new.study_mode, ''),
+                    1, IFNULL(new.is_correct, 0), IFNULL(new.response_ms, 0), new.response_ms IS NOT NULL)
+            ON CONFLICT (vocabulary_id, day, study_mode) DO UPDATE SET
+                total = total + 1,
+                correct = correct + excluded.correct,
+                latency_total = latency_total + excluded.latency_total,
+                latency_count = latency_count + excluded.latency_count;
+            INSERT INTO study_stats_weekly (vocabulary_id, week, study_mode, total, correct,
+                                            latency_total, latency_count)
+            VALUES (IFNULL(new.vocabulary_id, 0), strftime('%Y-%W', new.timestamp), IFNULL(new.study_mode, ''),
+                    1, IFNULL(new.is_correct, 0), IFNULL(new.response_ms, 0), new.response_ms IS NOT NULL)
+            ON CONFLICT (vocabulary_id, week, study_mode) DO UPDATE SET
+                total = total + 1,
+                correct = correct + excluded.correct,
+                latency_total = latency_total + excluded.latency_total,
+                latency_count = latency_count + excluded.latency_count;
+        END
+    ''')
+
+
+def _add_wrong_word_review(cursor: sqlite3.Cursor):
+    """版本7：错题复习需要的最近答错时间和连续答对次数"""
+    cursor.execute('ALTER TABLE wrong_words ADD COLUMN last_wrong_time DATETIME')
+    cursor.execute('ALTER TABLE wrong_words ADD COLUMN correct_streak INTEGER NOT NULL DEFAULT 0')
+    cursor.execute('UPDATE wrong_words SET last_wrong_time = first_wrong_time')
+
+
+# 改为规范化结构（words / senses / study_events）的版本
+NORMALIZED_SCHEMA_VERSION = 8
+# 单词类型的整数编码
+WORD_TYPE_CODES = {'word': 0, 'phrase': 1}
+# 内置学习模式的整数编码，其他模式第一次写入时追加
+STUDY_MODE_CODES = {'recognize': 1, 'choice': 2, 'spell': 3, 'sprint': 4}
+
+
+def _normalize_schema(cursor: sqlite3.Cursor):
+    """版本8：规范化的单词/释义/学习事件结构
+
+    words 每个单词一行（整数 id，同时保存复习调度状态），senses 每个释义一行，
+    词性和学习模式用小整数编码，学习事件和错题用 word_id 引用单词，事件时间为 Unix 秒。
+    原来的 word_pos_meanings / study_records / wrong_words / card_states 改为同名同列的只读视图，
+    旧的查询语句仍然可以读取。
+    """
+    cursor.execute('''
+        CREATE TABLE parts_of_speech (
+            id INTEGER PRIMARY KEY,
+            name TEXT UNIQUE NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE study_modes (
+            id INTEGER PRIMARY KEY,
+            name TEXT UNIQUE NOT NULL
+        )
+    ''')
+    cursor.executemany('INSERT INTO study_modes (id, name) VALUES (?, ?)',
+                       [(code, name) for name, code in STUDY_MODE_CODES.items()])
+    cursor.execute('''
+        CREATE TABLE words (
+            id INTEGER PRIMARY KEY,
+            vocabulary_id INTEGER NOT NULL REFERENCES vocabularies (id),
+            word TEXT NOT NULL,
+            type INTEGER NOT NULL DEFAULT 0,    -- WORD_TYPE_CODES
+            due DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            stability REAL NOT NULL DEFAULT 0,
+            difficulty REAL NOT NULL DEFAULT 5,
+            lapses INTEGER NOT NULL DEFAULT 0,
+            reps INTEGER NOT NULL DEFAULT 0,
+            last_review DATETIME,
+            UNIQUE (vocabulary_id, word)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE senses (
+            id INTEGER PRIMARY KEY,
+            word_id INTEGER NOT NULL REFERENCES words (id),
+            pos_id INTEGER NOT NULL REFERENCES parts_of_speech (id),
+            meaning TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE study_events (
+            id INTEGER PRIMARY KEY,
+            word_id INTEGER NOT NULL,
+            mode_id INTEGER NOT NULL REFERENCES study_modes (id),
+            is_correct INTEGER NOT NULL,
+            timestamp INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),  -- Unix 秒（UTC）
+            response_ms INTEGER
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE wrong_entries (
+            word_id INTEGER PRIMARY KEY,
+            wrong_count INTEGER NOT NULL DEFAULT 1,
+            first_wrong_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+            last_wrong_time DATETIME,
+            correct_streak INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+    # 搬移数据：按原来的插入顺序生成 id；没有单词本的旧释义无法访问，不再保留
+    cursor.execute('''
+        INSERT INTO words (vocabulary_id, word, type, due, stability, difficulty, lapses, reps, last_review)
+        SELECT m.vocabulary_id, m.word, m.type,
+               IFNULL(c.due, CURRENT_TIMESTAMP), IFNULL(c.stability, 0), IFNULL(c.difficulty, 5),
+               IFNULL(c.lapses, 0), IFNULL(c.reps, 0), c.last_review
+        FROM (SELECT vocabulary_id, word, MAX(type = 'phrase') AS type, MIN(id) AS first_id
+              FROM word_pos_meanings
+              WHERE vocabulary_id IS NOT NULL
+              GROUP BY vocabulary_id, word) m
+        LEFT JOIN card_states c ON c.vocabulary_id = m.vocabulary_id AND c.word = m.word
+        ORDER BY m.first_id
+    ''')
+    cursor.execute('INSERT INTO parts_of_speech (name) SELECT DISTINCT pos FROM word_pos_meanings ORDER BY pos')
+    cursor.execute('''
+        INSERT INTO senses (word_id, pos_id, meaning)
+        SELECT w.id, p.id, m.meaning
+        FROM word_pos_meanings m
+        JOIN words w ON w.vocabulary_id = m.vocabulary_id AND w.word = m.word
+        JOIN parts_of_speech p ON p.name = m.pos
+        ORDER BY m.id
+    ''')
+    cursor.execute('''
+        INSERT OR IGNORE INTO study_modes (name)
+        SELECT DISTINCT IFNULL(study_mode, '') FROM study_records
+    ''')
+    # 已删除单词的学习记录无法再对应到单词，只保留在汇总统计中
+    cursor.execute('''
+        INSERT INTO study_events (word_id, mode_id, is_correct, timestamp, response_ms)
+        SELECT w.id, sm.id, IFNULL(r.is_correct, 0), CAST(strftime('%s', r.timestamp) AS INTEGER), r.response_ms
+        FROM study_records r
+        JOIN words w ON w.vocabulary_id = r.vocabulary_id AND w.word = r.word
+        JOIN study_modes sm ON sm.name = IFNULL(r.study_mode, '')
+        ORDER BY r.id
+    ''')
+    cursor.execute('''
+        INSERT INTO wrong_entries (word_id, wrong_count, first_wrong_time, last_wrong_time, correct_streak)
+        SELECT w.id, ww.wrong_count, ww.first_wrong_time, ww.last_wrong_time, ww.correct_streak
+        FROM wrong_words ww
+        JOIN words w ON w.vocabulary_id = ww.vocabulary_id AND w.word = ww.word
+    ''')
+
+    # 删除旧表和旧触发器，全文索引随后按新表重建
+    for trigger in ('word_fts_ai', 'word_fts_ad', 'word_fts_au', 'word_card_state_ai', 'study_records_stats_ai'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    cursor.execute('DROP TABLE IF EXISTS word_fts')
+    for table in ('word_pos_meanings', 'study_records', 'wrong_words', 'card_states'):
+        cursor.execute(f'DROP TABLE {table}')
+
+    cursor.execute('CREATE INDEX idx_words_due ON words (vocabulary_id, due)')
+    cursor.execute('CREATE INDEX idx_senses_word ON senses (word_id)')
+    cursor.execute('CREATE INDEX idx_study_events_word ON study_events (word_id, timestamp)')
+
+    # 兼容视图：与旧表同名同列
+    cursor.execute('''
+        CREATE VIEW word_pos_meanings AS
+        SELECT s.id AS id, w.word AS word, p.name AS pos, s.meaning AS meaning,
+               CASE w.type WHEN 1 THEN 'phrase' ELSE 'word' END AS type, w.vocabulary_id AS vocabulary_id
+        FROM senses s
+        JOIN words w ON w.id = s.word_id
+        JOIN parts_of_speech p ON p.id = s.pos_id
+    ''')
+    cursor.execute('''
+        CREATE VIEW study_records AS
+        SELECT e.id AS id, w.vocabulary_id AS vocabulary_id, w.word AS word, e.is_correct AS is_correct,
+               m.name AS study_mode, datetime(e.timestamp, 'unixepoch') AS timestamp,
+               e.response_ms AS response_ms
+        FROM study_events e
+        JOIN words w ON w.id = e.word_id
+        JOIN study_modes m ON m.id = e.mode_id
+    ''')
+    cursor.execute('''
+        CREATE VIEW wrong_words AS
+        SELECT e.word_id AS id, w.vocabulary_id AS vocabulary_id, w.word AS word,
+               (SELECT GROUP_CONCAT(p.name || ': ' || s.meaning, '; ')
+                FROM senses s JOIN parts_of_speech p ON p.id = s.pos_id
+                WHERE s.word_id = w.id) AS meaning,
+               e.first_wrong_time AS first_wrong_time, e.wrong_count AS wrong_count,
+               e.last_wrong_time AS last_wrong_time, e.correct_streak AS correct_streak
+        FROM wrong_entries e
+        JOIN words w ON w.id = e.word_id
+    ''')
+    cursor.execute('''
+        CREATE VIEW card_states AS
+        SELECT vocabulary_id, word, due, stability, difficulty, lapses, reps, last_review
+        FROM words
+    ''')
+
+    # 删除单词时一并删除其释义和错题；先删释义，全文索引的删除触发器还能读到单词
+    cursor.execute('''
+        CREATE TRIGGER words_bd BEFORE DELETE ON words BEGIN
+            DELETE FROM senses WHERE word_id = old.id;
+            DELETE FROM wrong_entries WHERE word_id = old.id;
+        END
+    ''')
+
+    # 全文索引以兼容视图 word_pos_meanings 为外部内容表，由 senses / words 上的触发器同步
+    tokenizer = _fts_tokenizer(cursor)
+    if tokenizer is not None:
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE word_fts USING fts5(
+                word, meaning,
+                content='word_pos_meanings', content_rowid='id',
+                tokenize='{tokenizer}'
+            )
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER word_fts_ai AFTER INSERT ON senses BEGIN
+                INSERT INTO word_fts (rowid, word, meaning)
+                VALUES (new.id, (SELECT word FROM words WHERE id = new.word_id), new.meaning);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER word_fts_ad AFTER DELETE ON senses BEGIN
+                INSERT INTO word_fts (word_fts, rowid, word, meaning)
+                VALUES ('delete', old.id, (SELECT word FROM words WHERE id = old.word_id), old.meaning);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER word_fts_au AFTER UPDATE OF meaning ON senses BEGIN
+                INSERT INTO word_fts (word_fts, rowid, word, meaning)
+                VALUES ('delete', old.id, (SELECT word FROM words WHERE id = old.word_id), old.meaning);
+                INSERT INTO word_fts (rowid, word, meaning)
+                VALUES (new.id, (SELECT word FROM words WHERE id = new.word_id), new.meaning);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER word_fts_word_au AFTER UPDATE OF word ON words BEGIN
+                INSERT INTO word_fts (word_fts, rowid, word, meaning)
+                SELECT 'delete', id, old.word, meaning FROM senses WHERE word_id = new.id;
+                INSERT INTO word_fts (rowid, word, meaning)
+                SELECT id, new.word, meaning FROM senses WHERE word_id = new.id;
+            END
+        ''')
+        cursor.execute("INSERT INTO word_fts (word_fts) VALUES ('rebuild')")
+
+    # 汇总统计的口径不变，单词本和模式名称由 word_id / mode_id 查出
+    cursor.execute('''
+        CREATE TRIGGER study_events_stats_ai AFTER INSERT ON study_events BEGIN
+            INSERT INTO study_stats_daily (vocabulary_id, day, study_mode, total, correct,
+                                           latency_total, latency_count)
+            VALUES (IFNULL((SELECT vocabulary_id FROM words WHERE id = new.word_id), 0),
+                    DATE(new.timestamp, 'unixepoch'),
+                    (SELECT name FROM study_modes WHERE id = new.mode_id),
+                    1, new.is_correct, IFNULL(new.response_ms, 0), new.response_ms IS NOT NULL)
+            ON CONFLICT (vocabulary_id, day, study_mode) DO UPDATE SET
+                total = total + 1,
+                correct = correct + excluded.correct,
+                latency_total = latency_total + excluded.latency_total,
+                latency_count = latency_count + excluded.latency_count;
+            INSERT INTO study_stats_weekly (vocabulary_id, week, study_mode, total, correct,
+                                            latency_total, latency_count)
+            VALUES (IFNULL((SELECT vocabulary_id FROM words WHERE id = new.word_id), 0),
+                    strftime('%Y-%W', new.timestamp, 'unixepoch'),
+                    (SELECT name FROM study_modes WHERE id = new.mode_id),
+                    1, new.is_correct, IFNULL(new.response_ms, 0), new.response_ms IS NOT NULL)
+            ON CONFLICT (vocabulary_id, week, study_mode) DO UPDATE SET
+                total = total + 1,
+                correct = correct + excluded.correct,
+                latency_total = latency_total + excluded.latency_total,
+                latency_count = latency_count + excluded.latency_count;
+        END
+    ''')
+
+
+# 从这个版本起数据库使用 auto_vacuum = INCREMENTAL，归档后可以分步归还空闲页
+INCREMENTAL_VACUUM_VERSION = 9
+
+
+def _add_study_event_days(cursor: sqlite3.Cursor):
+    """版本9：超过保留期的学习事件按单词、日期（UTC）和模式汇总后保存在这里，原始事件移入归档库"""
+    cursor.execute('''
+        CREATE TABLE study_event_days (
+            word_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,               -- Unix 天数（UTC），即 timestamp / 86400
+            mode_id INTEGER NOT NULL REFERENCES study_modes (id),
+            total INTEGER NOT NULL,
+            correct INTEGER NOT NULL,
+            latency_total INTEGER NOT NULL DEFAULT 0,
+            latency_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (word_id, day, mode_id)
+        ) WITHOUT ROWID
+    ''')
+
+
+def _add_detailed_stats_index(cursor: sqlite3.Cursor):
+    """版本10：详细统计按日期倒序、同一天内按模式排列，主键顺序无法直接提供，单独建索引避免排序"""
+    cursor.execute('CREATE INDEX idx_study_stats_daily_vocab_day ON study_stats_daily (vocabulary_id, day DESC, study_mode)')
+
+
+# 迁移列表：(目标版本, 迁移函数)，只能在末尾追加，不能修改已发布的迁移
+MIGRATIONS: List[Tuple[int, Callable[[sqlite3.Cursor], None]]] = [
+    (1, _create_base_tables),
+    (2, _add_lookup_indexes),
+    (3, _add_word_fts),
+    (4, _add_study_stats_rollups),
+    (5, _add_card_states),
+    (6, _add_response_latency),
+    (7, _add_wrong_word_review),
+    (8, _normalize_schema),
+    (9, _add_study_event_days),
+    (10, _add_detailed_stats_index),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """将数据库升级到最新版本，返回升级后的版本号
+
+    每个迁移在独立事务中执行，并在同一事务内更新 user_version，
+    中途失败时数据库停留在上一个完整版本。
+    """
+    current = get_schema_version(conn)
+    if current > SCHEMA_VERSION:
+        raise sqlite3.DatabaseError(
+            f"数据库版本({current})高于程序支持的版本({SCHEMA_VERSION})，请升级程序")
+
+    for version, migration in MIGRATIONS:
+        if version <= current:
+            continue
+        cursor = conn.cursor()
+        try:
+            cursor.execute('BEGIN')
+            migration(cursor)
+            # PRAGMA 不支持参数绑定，version 来自上面的常量列表
+            cursor.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        current = version
+    return current
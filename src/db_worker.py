@@ -0,0 +1,185 @@
+import queue
+import threading
+from typing import Callable, Optional
+from PyQt6.QtCore import QThread, pyqtSignal, pyqtSlot
+from data_manager import DatabaseManager
+from db_backup import BackupManager
+from retention import RetentionEngine
+
+
+class DbTask:
+    """提交给数据库线程的任务，结果和进度在 GUI 线程中回调"""
+
+    def __init__(self, func: Callable, worker: Optional['DatabaseWorker'] = None):
+        self.func = func
+        self._worker = worker
+        self._on_result = []
+        self._on_error = []
+        self._on_progress = []
+        self._cancelled = threading.Event()
+
+    def then(self, on_result: Callable, on_error: Optional[Callable] = None) -> 'DbTask':
+        self._on_result.append(on_result)
+        if on_error:
+            self._on_error.append(on_error)
+        return self
+
+    def on_progress(self, callback: Callable) -> 'DbTask':
+        self._on_progress.append(callback)
+        return self
+
+    def report(self, *values):
+        """在数据库线程中调用，values 通过信号传给 on_progress 注册的回调"""
+        if self._worker is not None:
+            self._worker._task_progress.emit(self, values)
+
+    def cancel(self):
+        """请求取消；任务自己检查 is_cancelled() 并提前结束"""
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+class DatabaseWorker(QThread):
+    """独立的数据库线程，与界面共用同一个 DatabaseManager，读取时使用本线程自己的读连接
+
+    页面提交查询后立即返回，查询在后台执行，结果通过信号回到 GUI 线程，
+    避免耗时的查询和导出阻塞事件循环。任务按提交顺序执行。
+    """
+    busy_changed = pyqtSignal(bool)
+    _task_done = pyqtSignal(object, object, object)
+    _task_progress = pyqtSignal(object, object)
+
+    def __init__(self, db: DatabaseManager, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.error_handler = None
+        self._queue = queue.Queue()
+        self._pending = 0
+        self._task_done.connect(self._dispatch)
+        self._task_progress.connect(self._dispatch_progress)
+
+    def submit(self, method, *args, **kwargs) -> DbTask:
+        """提交任务：method 可以是 DatabaseManager 的方法名，也可以是接收 db 参数的函数"""
+        if isinstance(method, str):
+            name = method
+            func = lambda db: getattr(db, name)(*args, **kwargs)
+        else:
+            func = lambda db: method(db, *args, **kwargs)
+        return self._enqueue(DbTask(func, self))
+
+    def submit_cancellable(self, func: Callable, *args, **kwargs) -> DbTask:
+        """提交可以报告进度和取消的任务：func(db, task, ...)
+
+        func 在数据库线程中调用 task.report(...) 报告进度，并检查 task.is_cancelled()。
+        """
+        task = DbTask(None, self)
+        task.func = lambda db: func(db, task, *args, **kwargs)
+        return self._enqueue(task)
+
+    def _enqueue(self, task: DbTask) -> DbTask:
+        self._pending += 1
+        if self._pending == 1:
+            self.busy_changed.emit(True)
+        self._queue.put(task)
+        return task
+
+    def run(self):
+        db = self.db
+        try:
+            while True:
+                task = self._queue.get()
+                if task is None:
+                    break
+                try:
+                    result = task.func(db)
+                    self._task_done.emit(task, result, None)
+                except Exception as e:
+                    self._task_done.emit(task, None, e)
+        finally:
+            # 读连接在本线程中创建，线程退出前关闭
+            db.release_thread()
+
+    @pyqtSlot(object, object, object)
+    def _dispatch(self, task, result, error):
+        self._pending -= 1
+        try:
+            if error is None:
+                for callback in task._on_result:
+                    callback(result)
+            elif task._on_error:
+                for callback in task._on_error:
+                    callback(error)
+            elif self.error_handler:
+                self.error_handler(error)
+        finally:
+            if self._pending == 0:
+                self.busy_changed.emit(False)
+
+    @pyqtSlot(object, object)
+    def _dispatch_progress(self, task, values):
+        for callback in task._on_progress:
+            callback(*values)
+
+    def stop(self):
+        self._queue.put(None)
+        self.wait()
+
+
+class BackupWorker(QThread):
+    """备份和恢复线程
+
+    复制按页分步进行，进度（百分比）和结果通过信号回到 GUI 线程；同一时间只执行一个任务。
+    备份成功后在同一线程中接着运行保留期归档（retention），归档使用自己的连接，
+    不占用数据库线程的任务队列；requestInterruption() 让归档在当前批次提交后停止。
+    """
+    progress = pyqtSignal(int)
+    done = pyqtSignal(str, bool, str)   # 任务（'backup'、'restore' 或 'retention'）、是否成功、消息
+
+    def __init__(self, backups: BackupManager, parent=None, retention: Optional[RetentionEngine] = None):
+        super().__init__(parent)
+        self.backups = backups
+        self.retention = retention
+        self._job = None
+
+    def start_backup(self) -> bool:
+        # 备份和随后的归档都可以慢慢进行，不与界面线程争抢处理器
+        return self._start(('backup', None), QThread.Priority.LowPriority)
+
+    def start_restore(self, path: str) -> bool:
+        return self._start(('restore', path))
+
+    def _start(self, job, priority=QThread.Priority.InheritPriority) -> bool:
+        if self.isRunning():
+            return False
+        self._job = job
+        self.start(priority)
+        return True
+
+    def _on_step(self, copied, total):
+        self.progress.emit(copied * 100 // total if total else 100)
+
+    def run(self):
+        kind, path = self._job
+        try:
+            if kind == 'backup':
+                ok, message = self.backups.backup(self._on_step)
+            else:
+                ok, message = self.backups.restore(path, self._on_step)
+        except Exception as e:
+            ok, message = False, str(e)
+        finally:
+            self.backups.db.release_thread()
+        self.done.emit(kind, ok, message)
+        # 备份已包含全部原始事件，这时再归档早于保留期的学习记录
+        if kind == 'backup' and ok and self.retention is not None and not self.isInterruptionRequested():
+            self._run_retention()
+
+    def _run_retention(self):
+        try:
+            counts = self.retention.run(is_cancelled=self.isInterruptionRequested)
+            ok, message = True, f"已归档 {counts['events']} 条早期学习记录" if counts['events'] else ''
+        except Exception as e:
+            ok, message = False, f"归档早期学习记录失败：{str(e)}"
+        self.done.emit('retention', ok, message)
@@ -0,0 +1,93 @@
+import random
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+
+def _first_pos(meanings: str) -> str:
+    """从 "n.: 苹果; v.: 跑" 中取第一个词性，没有词性时返回空字符串"""
+    head = meanings.split(';', 1)[0]
+    return head.split(': ', 1)[0].strip().lower() if ': ' in head else ''
+
+
+def _word_key(word: str) -> str:
+    """拼写相近的单词放在同一组：按前两个字母分组"""
+    return word.strip().lower()[:2]
+
+
+class DistractorIndex:
+    """选择模式的干扰项索引
+
+    会话开始时对卡组的释义建立一次索引：不同的释义各分配一个编号，
+    再按 (词性, 拼写前缀) 和 词性 分组。取干扰项时依次从
+    同词性且拼写相近、同词性、全部释义 三层候选中随机抽取，
+    每层的尝试次数与 k 成正比，通常总耗时 O(k)，与卡组大小无关；随机抽取的次数用完时
+    改为打乱整层候选逐个检查，只要有足够的不同释义就一定返回 k 个。
+    不同释义不足时返回尽可能多的干扰项，而不会陷入死循环。
+    """
+
+    def __init__(self, cards: List[Tuple[str, str]], rng: Optional[random.Random] = None):
+        self._rng = rng or random.Random()
+        self.meanings: List[str] = []
+        meaning_ids: Dict[str, int] = {}
+        by_similar = defaultdict(set)
+        by_pos = defaultdict(set)
+        for word, meaning in cards:
+            meaning_id = meaning_ids.get(meaning)
+            if meaning_id is None:
+                meaning_id = meaning_ids[meaning] = len(self.meanings)
+                self.meanings.append(meaning)
+            pos = _first_pos(meaning)
+            similar_key = (pos, _word_key(word))
+            by_similar[similar_key].add(meaning_id)
+            by_pos[pos].add(meaning_id)
+        self._meaning_ids = meaning_ids
+        self._by_similar = {key: list(ids) for key, ids in by_similar.items()}
+        self._by_pos = {key: list(ids) for key, ids in by_pos.items()}
+        self._all = list(range(len(self.meanings)))
+
+    def __len__(self):
+        return len(self.meanings)
+
+    def sample(self, card: Tuple[str, str], k: int = 3) -> List[str]:
+        """返回最多 k 个与正确释义不同、互不相同的干扰项"""
+        word, correct_meaning = card
+        pos = _first_pos(correct_meaning)
+        chosen = []
+        seen = {self._meaning_ids.get(correct_meaning, -1)}
+        for pool in (self._by_similar.get((pos, _word_key(word))), self._by_pos.get(pos), self._all):
+            if pool:
+                self._draw(pool, k, chosen, seen)
+            if len(chosen) >= k:
+                break
+        return [self.meanings[i] for i in chosen]
+
+    def options(self, card: Tuple[str, str], k: int = 3) -> List[str]:
+        """正确释义加上干扰项，打乱顺序"""
+        options = self.sample(card, k)
+        options.append(card[1])
+        self._rng.shuffle(options)
+        return options
+
+    def _draw(self, pool: List[int], k: int, chosen: List[int], seen: set):
+        needed = k - len(chosen)
+        if len(pool) > 2 * (k + 1):
+            # 候选较多时随机抽取，已选中的最多 k + 1 个，重复概率低于一半，限制尝试次数
+            attempts = 4 * needed
+            randrange = self._rng.randrange
+            while needed and attempts:
+                attempts -= 1
+                meaning_id = pool[randrange(len(pool))]
+                if meaning_id not in seen:
+                    seen.add(meaning_id)
+                    chosen.append(meaning_id)
+                    needed -= 1
+            if not needed:
+                return
+        # 候选很少，或随机抽取的次数用完：打乱全部候选逐个检查，保证能取到的都取到
+        for meaning_id in self._rng.sample(pool, len(pool)):
+            if meaning_id not in seen:
+                seen.add(meaning_id)
+                chosen.append(meaning_id)
+                needed -= 1
+                if needed == 0:
+                    return
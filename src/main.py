@@ -1,17 +1,66 @@
 import sys
+import time
+# 启动基准测试从这里开始计时
+_START_TIME = time.perf_counter()
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
 from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout
+from PyQt6.QtCore import QEvent, QObject, QTimer, Qt
 from data_manager import DatabaseManager
+from db_backup import BackupManager, BACKUP_INTERVAL_HOURS
+from db_worker import DatabaseWorker, BackupWorker
+from retention import RetentionEngine
+from study_buffer import StudyWriteBuffer
 from ui_components import UICreator
 from ui_controller import UIController
 from study_modes import StudyModes
 from theme_manager import ThemeManager, Theme
 
+_IMPORT_SECONDS = time.perf_counter() - _START_TIME
+
+BACKUP_CHECK_INTERVAL_MS = 60 * 60 * 1000
+BACKUP_FIRST_CHECK_MS = 60 * 1000
+COMPACT_DELAY_MS = 1000
+# 启动基准测试默认使用的临时数据库中的单词数
+BENCHMARK_WORDS = 2000
+
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, db_name='vocabulary.db'):
         super().__init__()
         self.theme_manager = ThemeManager()
         self.theme_manager.theme_changed.connect(self.apply_theme)
-        self.db = DatabaseManager()
+        # 在创建控件之前设置主窗口的样式表，控件创建时直接使用
+        self.apply_theme(self.theme_manager.get_current_theme().value)
+        self.db = DatabaseManager(db_name)
+        # 学习记录写缓冲，定时批量落盘
+        self.study_buffer = StudyWriteBuffer(self.db)
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush_study_buffer)
+        self.flush_timer.start(int(self.study_buffer.max_delay * 1000))
+        # 后台数据库线程，耗时查询不阻塞界面
+        self.db_worker = DatabaseWorker(self.db, self)
+        self.db_worker.busy_changed.connect(self.on_db_busy)
+        self.db_worker.error_handler = lambda e: self.statusBar().showMessage(f'数据库操作失败：{str(e)}', 3000)
+        self.db_worker.start()
+        # 在线备份：后台线程复制，进度显示在状态栏和设置页面
+        self.backups = BackupManager(self.db)
+        # 备份成功后在备份线程中归档早于保留期的学习记录
+        self.backup_worker = BackupWorker(self.backups, self, RetentionEngine(self.db))
+        self.backup_worker.progress.connect(lambda percent: UIController.on_backup_progress(self, percent))
+        self.backup_worker.done.connect(lambda kind, ok, message: UIController.on_backup_done(self, kind, ok, message))
+        # 每小时检查一次是否到了定时备份的时间；第一次检查推迟到启动完成之后
+        self.backup_timer = QTimer(self)
+        self.backup_timer.timeout.connect(self.scheduled_backup)
+        self.backup_timer.start(BACKUP_CHECK_INTERVAL_MS)
+        QTimer.singleShot(BACKUP_FIRST_CHECK_MS, self.scheduled_backup)
+        # 旧版本数据库的一次性整理放到第一帧之后，在数据库线程中执行
+        if self.db.needs_compaction:
+            QTimer.singleShot(COMPACT_DELAY_MS, lambda: UIController.compact_database(self))
+        # 学习卡片预取线程，第一次学习时才创建
+        self.prefetch_pool = None
         self.current_vocabulary = None
         self.current_vocab_id = None
         self.study_mode = 'recognize'
@@ -24,6 +73,46 @@ class MainWindow(QMainWindow):
         
         self.init_ui()
         
+    def flush_study_buffer(self):
+        try:
+            self.study_buffer.flush()
+        except sqlite3.Error as e:
+            self.statusBar().showMessage(f'学习记录保存失败，稍后重试：{str(e)}', 3000)
+
+    def submit_prefetch(self, func, *args):
+        """在预取线程中执行 func，只准备内存中的卡组，不访问数据库"""
+        if self.prefetch_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch')
+        self.prefetch_pool.submit(func, *args)
+
+    def scheduled_backup(self):
+        if self.backups.is_due(BACKUP_INTERVAL_HOURS):
+            self.flush_study_buffer()
+            self.backup_worker.start_backup()
+
+    def on_db_busy(self, busy):
+        if busy:
+            QApplication.setOverrideCursor(Qt.CursorShape.BusyCursor)
+            self.statusBar().showMessage('正在加载...')
+        else:
+            QApplication.restoreOverrideCursor()
+            if self.statusBar().currentMessage() == '正在加载...':
+                self.statusBar().showMessage('就绪')
+
+    def closeEvent(self, event):
+        self.flush_timer.stop()
+        self.flush_study_buffer()
+        self.db_worker.stop()
+        self.backup_timer.stop()
+        # 正在进行的备份或恢复必须完成后才能关闭数据库；归档在当前批次提交后停止
+        self.backup_worker.requestInterruption()
+        self.backup_worker.wait()
+        if self.prefetch_pool is not None:
+            self.prefetch_pool.shutdown()
+        self.db.close()
+        super().closeEvent(event)
+        
     def apply_theme(self, theme_name):
         UICreator.apply_theme_to_window(self, theme_name)
         
@@ -42,14 +131,9 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout(central_widget)
         layout.addWidget(self.stack)
         
-        # 设置初始页面
+        # 设置初始页面，其他页面和单词本列表在第一次切换过去时创建和读取
         self.stack.setCurrentWidget(self.main_page)
         
-        # 初始化数据
-        self.db.update_vocab_list(self.vocab_list)
-        self.db.update_vocab_combo(self.vocab_combo)
-        self.db.update_vocab_combo(self.settings_vocab_combo)
-        
     def switch_page(self, page):
         UIController.switch_page(self, page)
         
@@ -71,6 +155,9 @@ class MainWindow(QMainWindow):
     def export_vocabulary(self):
         UIController.export_vocabulary(self)
         
+    def import_vocabulary(self):
+        UIController.import_vocabulary(self)
+        
     def delete_vocabulary(self):
         UIController.delete_vocabulary(self)
         
@@ -86,17 +173,106 @@ class MainWindow(QMainWindow):
     def clear_all_wrong_words(self):
         UIController.clear_all_wrong_words(self)
 
+    def backup_now(self):
+        UIController.backup_now(self)
+
+    def restore_backup(self):
+        UIController.restore_backup(self)
+
+def create_benchmark_db(path: str, words: int = BENCHMARK_WORDS):
+    """启动基准测试用的数据库：一个单词本，words 个单词"""
+    db = DatabaseManager(path)
+    try:
+        db.add_vocabulary('启动基准')
+        vocab_id = db.get_vocabularies()[0][0]
+        with db.transaction():
+            for i in range(words):
+                db.add_word_with_pos_meanings(f'word{i}', [('n.', f'释义{i}')], vocab_id)
+    finally:
+        db.close()
+
+
+class StartupBenchmark(QObject):
+    """启动基准测试：记录主窗口第一次绘制的时间，输出结果后退出
+
+    setup_seconds 为准备基准数据库的时间，不计入首帧时间。
+    """
+
+    def __init__(self, app, window, threshold_ms, setup_seconds=0.0):
+        super().__init__()
+        self.app = app
+        self.window = window
+        self.threshold_ms = threshold_ms
+        self.setup_seconds = setup_seconds
+        self.window_seconds = 0.0
+        self.first_frame_seconds = None
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and self.first_frame_seconds is None:
+            self.first_frame_seconds = time.perf_counter() - _START_TIME - self.setup_seconds
+            QTimer.singleShot(0, self.app.quit)
+        return False
+
+    def report(self) -> int:
+        """打印各阶段耗时，首帧时间超过阈值时返回 1"""
+        first_frame_ms = self.first_frame_seconds * 1000
+        print(f"导入模块 {_IMPORT_SECONDS * 1000:.1f} ms")
+        print(f"创建主窗口 {self.window_seconds * 1000:.1f} ms")
+        print(f"首帧 {first_frame_ms:.1f} ms（阈值 {self.threshold_ms:.0f} ms）")
+        if first_frame_ms > self.threshold_ms:
+            print("启动时间超过阈值")
+            return 1
+        return 0
+
+
+def run_startup_benchmark(app, args) -> int:
+    """在 --db 指定的数据库上测量启动时间；没有指定时使用临时目录中预先填充的数据库，不改动用户数据"""
+    setup_start = time.perf_counter()
+    work_dir = None
+    db_name = args.db
+    if db_name is None:
+        work_dir = tempfile.mkdtemp(prefix='vocab-startup-')
+        db_name = os.path.join(work_dir, 'vocabulary.db')
+        create_benchmark_db(db_name)
+    try:
+        window_start = time.perf_counter()
+        window = MainWindow(db_name)
+        benchmark = StartupBenchmark(app, window, args.startup_threshold, window_start - setup_start)
+        benchmark.window_seconds = time.perf_counter() - window_start
+        window.installEventFilter(benchmark)
+        window.show()
+        app.exec()
+        window.close()
+        return benchmark.report()
+    finally:
+        if work_dir is not None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description='智能背单词')
+    parser.add_argument('--startup-benchmark', action='store_true',
+                        help='测量导入时间和首帧时间后退出，首帧超过阈值时返回非零状态')
+    parser.add_argument('--startup-threshold', type=float, default=800, metavar='MS',
+                        help='启动基准测试的首帧时间阈值（毫秒），默认 800')
+    parser.add_argument('--db', metavar='PATH',
+                        help='数据库文件，默认 vocabulary.db；启动基准测试默认使用临时目录中'
+                             f'预先填充 {BENCHMARK_WORDS} 个单词的数据库')
+    # 其余参数交给 Qt
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
     
     # 设置应用样式
     app.setStyle('Fusion')
     
+    if args.startup_benchmark:
+        sys.exit(run_startup_benchmark(app, args))
+    
     # 创建并显示主窗口
-    window = MainWindow()
+    window = MainWindow(args.db or 'vocabulary.db')
     window.show()
     
     sys.exit(app.exec())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
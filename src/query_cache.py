@@ -0,0 +1,108 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple
+
+# 单词本列表本身的版本号（不属于任何一个单词本）
+VOCABULARY_LIST = 'vocabularies'
+
+
+def estimate_size(value) -> int:
+    """估算查询结果占用的内存（字节）：结果为行的列表，行为字段的元组"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            size += sys.getsizeof(item)
+            if isinstance(item, tuple):
+                size += sum(sys.getsizeof(field) for field in item)
+    return size
+
+
+class QueryCache:
+    """带版本号的读穿透缓存
+
+    缓存项按 (范围, 键) 保存，范围通常是单词本 ID。每个范围有一个版本号，
+    修改单词本的方法执行后调用 invalidate() 把版本号加一，旧版本的缓存项在下次读取时作废，
+    不需要逐个查找要删除的键。缓存项按最近使用排序，总大小超过 max_bytes 时淘汰最久未用的项。
+
+    同一个数据库文件的多个 DatabaseManager（例如界面线程和后台数据库线程各一个连接）
+    通过 shared() 使用同一个缓存，一个连接上的修改会让另一个连接读到的缓存失效。
+    """
+
+    _shared: Dict[str, 'QueryCache'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Tuple, Tuple[int, object, int]]' = OrderedDict()
+        self._versions: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def shared(cls, db_name: str, max_bytes: int = 8 * 1024 * 1024) -> 'QueryCache':
+        """按数据库文件共享的缓存；内存数据库每个连接各自独立"""
+        if db_name == ':memory:' or db_name.startswith('file:'):
+            return cls(max_bytes)
+        path = os.path.abspath(db_name)
+        with cls._shared_lock:
+            cache = cls._shared.get(path)
+            if cache is None:
+                cache = cls._shared[path] = cls(max_bytes)
+            return cache
+
+    def version(self, scope: Hashable) -> int:
+        return self._versions.get(scope, 0)
+
+    def read(self, scope: Hashable, key: Hashable, load: Callable[[], object]):
+        """返回缓存的结果，没有或已过期时调用 load() 查询并缓存
+
+        列表结果返回副本，调用方修改返回值不会影响缓存。
+        """
+        full_key = (scope, key)
+        with self._lock:
+            version = self._versions.get(scope, 0)
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                value = entry[1]
+                return list(value) if isinstance(value, list) else value
+            self.misses += 1
+
+        # 查询在锁外执行；期间范围被修改时，按旧版本号保存的结果下次读取即作废
+        value = load()
+        size = estimate_size(value)
+        if size <= self.max_bytes:
+            with self._lock:
+                old = self._entries.pop(full_key, None)
+                if old is not None:
+                    self.bytes -= old[2]
+                self._entries[full_key] = (version, value, size)
+                self.bytes += size
+                while self.bytes > self.max_bytes:
+                    _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                    self.bytes -= evicted_size
+                    self.evictions += 1
+        return list(value) if isinstance(value, list) else value
+
+    def invalidate(self, *scopes: Hashable):
+        """范围内的数据已修改：版本号加一，已缓存的结果全部作废"""
+        with self._lock:
+            for scope in scopes:
+                self._versions[scope] = self._versions.get(scope, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            for scope in self._versions:
+                self._versions[scope] += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self._entries), 'bytes': self.bytes}
@@ -0,0 +1,354 @@
+import argparse
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from array import array
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from db_connections import apply_profile
+
+SECONDS_PER_DAY = 86400
+DEFAULT_HORIZON_DAYS = 180    # 保留最近多少天的原始学习事件
+CHUNK_EVENTS = 10000          # 每个事务处理的事件 id 范围
+RUN_CACHE_KIB = 128 * 1024    # 归档连接的页缓存，随机删除索引项时少重复读取页面
+VACUUM_PAGES_PER_STEP = 2048  # 增量整理每步归还的页数
+PAUSE_SECONDS = 0.1           # 每个事务提交后的停顿，等待锁的程序写入在这时执行
+
+# 归档库的表结构：原始事件按 UTC 日期分批压缩保存，单词和模式名称一并保存，归档库可以单独读取
+ARCHIVE_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS archive.event_batches (
+        id INTEGER PRIMARY KEY,
+        day INTEGER NOT NULL,           -- Unix 天数（UTC）
+        first_id INTEGER NOT NULL,
+        last_id INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        data BLOB NOT NULL              -- encode_events() 的结果
+    )''',
+    'CREATE INDEX IF NOT EXISTS archive.idx_event_batches_day ON event_batches (day)',
+    # 每个事件只归档一次：批次的第一个事件 id 唯一；按 last_id 查找与一段 id 重叠的已有批次。
+    # 建唯一索引之前先去掉旧版本重复归档的批次
+    '''DELETE FROM archive.event_batches WHERE id NOT IN (SELECT MIN(id) FROM archive.event_batches GROUP BY first_id)''',
+    'CREATE UNIQUE INDEX IF NOT EXISTS archive.uq_event_batches_first_id ON event_batches (first_id)',
+    'CREATE INDEX IF NOT EXISTS archive.idx_event_batches_last_id ON event_batches (last_id)',
+    '''CREATE TABLE IF NOT EXISTS archive.words (
+        id INTEGER PRIMARY KEY,
+        vocabulary_id INTEGER,
+        word TEXT
+    )''',
+    '''CREATE TABLE IF NOT EXISTS archive.study_modes (
+        id INTEGER PRIMARY KEY,
+        name TEXT
+    )''',
+)
+
+EVENT_COLUMNS = 6   # id, word_id, mode_id, is_correct, timestamp, response_ms
+
+
+def encode_events(first_id: int, day: int, rows: List[Tuple]) -> bytes:
+    """把同一天的事件（按 id 排序）编码为按列存放的压缩数据
+
+    id 和时间保存与前一行的差值，没有反应时间时保存 -1，整数列压缩后每个事件只占几个字节。
+    """
+    columns = [array('q') for _ in range(EVENT_COLUMNS)]
+    previous_id, previous_time = first_id, day * SECONDS_PER_DAY
+    for event_id, word_id, mode_id, is_correct, timestamp, response_ms in rows:
+        columns[0].append(event_id - previous_id)
+        columns[1].append(word_id)
+        columns[2].append(mode_id)
+        columns[3].append(int(is_correct))
+        columns[4].append(timestamp - previous_time)
+        columns[5].append(-1 if response_ms is None else response_ms)
+        previous_id, previous_time = event_id, timestamp
+    if sys.byteorder == 'big':
+        for column in columns:
+            column.byteswap()
+    return zlib.compress(b''.join(column.tobytes() for column in columns), 6)
+
+
+def decode_events(first_id: int, day: int, count: int, data: bytes) -> List[Tuple]:
+    """encode_events() 的逆过程，返回 [(id, word_id, mode_id, is_correct, timestamp, response_ms)]"""
+    values = array('q')
+    values.frombytes(zlib.decompress(data))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    columns = [values[i * count:(i + 1) * count] for i in range(EVENT_COLUMNS)]
+    rows = []
+    event_id, timestamp = first_id, day * SECONDS_PER_DAY
+    for delta_id, word_id, mode_id, is_correct, delta_time, response_ms in zip(*columns):
+        event_id += delta_id
+        timestamp += delta_time
+        rows.append((event_id, word_id, mode_id, is_correct, timestamp, None if response_ms < 0 else response_ms))
+    return rows
+
+
+def read_archive(conn, day_from: Optional[int] = None, day_to: Optional[int] = None) -> Iterator[Tuple]:
+    """按 id 顺序读取归档库中的原始事件，day_from / day_to 为 Unix 天数（含两端）
+
+    conn 为打开归档库的连接。
+    """
+    conditions, params = [], []
+    if day_from is not None:
+        conditions.append('day >= ?')
+        params.append(day_from)
+    if day_to is not None:
+        conditions.append('day <= ?')
+        params.append(day_to)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    for first_id, day, count, data in conn.execute(
+            f'SELECT first_id, day, count, data FROM event_batches {where} ORDER BY day, first_id', params):
+        yield from decode_events(first_id, day, count, data)
+
+
+class RetentionEngine:
+    """学习事件的保留期管理
+
+    早于保留期（按 UTC 日期对齐）的原始事件按单词、日期和模式汇总到 study_event_days，
+    原始事件压缩后写入独立的归档库，然后从 study_events 删除，最后用 incremental_vacuum
+    分步归还空闲页。每日、每周统计读取的汇总表不变；删除或移动单词时连同按日汇总一起扣除，
+    统计在归档前后保持一致。
+
+    每次运行打开自己的连接，归档库只 ATTACH 在这个连接上，不占用程序共用的写连接和写锁；
+    写入归档和删除原始事件在同一个事务中完成，中途失败时两边都回滚。按 id 范围分批处理，
+    每批一个事务，提交后停顿片刻，程序的写入在批次之间进行。已经在归档库中的事件
+    （例如恢复了归档之前的备份）只汇总和删除，不重复归档。
+    """
+
+    def __init__(self, db, horizon_days: int = DEFAULT_HORIZON_DAYS, archive_path: Optional[str] = None,
+                 chunk_events: int = CHUNK_EVENTS, pause: float = PAUSE_SECONDS):
+        if horizon_days < 1:
+            raise ValueError("保留天数至少为 1")
+        self.db = db
+        self.horizon_days = horizon_days
+        if archive_path is None and db.db_name != ':memory:':
+            archive_path = os.path.splitext(os.path.abspath(db.db_name))[0] + '-archive.db'
+        self.archive_path = archive_path
+        self.chunk_events = chunk_events
+        self.pause = pause
+        self._conn = None
+        self._lock = nullcontext()
+
+    def cutoff(self, now: Optional[float] = None) -> int:
+        """保留期的起点（Unix 秒），对齐到 UTC 零点，同一天的事件不会一部分汇总一部分保留"""
+        now = time.time() if now is None else now
+        return (int(now) // SECONDS_PER_DAY - self.horizon_days) * SECONDS_PER_DAY
+
+    def run(self, now: Optional[float] = None, archive: bool = True,
+            progress: Optional[Callable[[int, int], None]] = None,
+            is_cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, int]:
+        """执行一次汇总和归档，返回 {'events': 处理的事件数, 'batches': 归档批次数, 'freed_pages': 归还的页数}
+
+        progress(已处理到的事件 id, 最大事件 id) 在每批处理后调用；is_cancelled() 在每批之后检查，
+        返回 True 时停在已提交的批次，下次运行从剩下的事件继续。
+        """
+        cutoff = self.cutoff(now)
+        counts = {'events': 0, 'batches': 0, 'freed_pages': 0}
+        archive = archive and self.archive_path is not None
+        self._open(archive)
+        try:
+            with self._lock:
+                first_id, last_id = self._conn.execute('SELECT MIN(id), MAX(id) FROM study_events').fetchall()[0]
+            if first_id is None:
+                return counts
+
+            archived_words = set()
+            start = first_id
+            while start <= last_id:
+                end = start + self.chunk_events - 1
+                events, batches = self._process_chunk(start, end, cutoff, archived_words if archive else None)
+                counts['events'] += events
+                counts['batches'] += batches
+                if progress:
+                    progress(min(end, last_id), last_id)
+                if is_cancelled and is_cancelled():
+                    break
+                # 事件 id 随时间增长；批次中已没有过期事件，并且剩余事件都晚于保留期起点一天以上
+                # （缓冲写入的事件时间可能略早于插入顺序），后面的批次不会再有过期事件
+                if events == 0:
+                    with self._lock:
+                        oldest = self._conn.execute('SELECT MIN(timestamp) FROM study_events WHERE id BETWEEN ? AND ?',
+                                                    (start, end)).fetchall()[0][0]
+                    if oldest is not None and oldest >= cutoff + SECONDS_PER_DAY:
+                        break
+                else:
+                    time.sleep(self.pause)
+                start = end + 1
+
+            if counts['events']:
+                counts['freed_pages'] = self.incremental_vacuum(is_cancelled)
+            return counts
+        finally:
+            self._close()
+
+    def _open(self, archive: bool):
+        """打开本次运行的连接；内存数据库无法从其他连接访问，只能使用共用的写连接并持有写锁"""
+        connections = self.db.connections
+        if connections.shared:
+            self._conn, self._lock = connections.writer, connections.write_lock
+            return
+        self._conn = sqlite3.connect(self.db.db_name, isolation_level=None, check_same_thread=False)
+        apply_profile(self._conn, self.db.profile)
+        self._conn.execute(f'PRAGMA cache_size = {-RUN_CACHE_KIB}')
+        if archive:
+            self._conn.execute('ATTACH DATABASE ? AS archive', (self.archive_path,))
+            with self._transaction() as cursor:
+                for statement in ARCHIVE_SCHEMA:
+                    cursor.execute(statement)
+                cursor.execute('INSERT OR REPLACE INTO archive.study_modes (id, name) SELECT id, name FROM main.study_modes')
+
+    def _close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None and conn is not self.db.connections.writer:
+            conn.close()
+        self._lock = nullcontext()
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            conn = self._conn
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn.cursor()
+                conn.execute('COMMIT')
+            except BaseException:
+                # 提交失败时事务仍然打开，同样回滚
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+
+    @staticmethod
+    def _archived_ids(cursor, start: int, end: int) -> set:
+        """id 在 [start, end] 中、已经保存在归档库里的事件"""
+        archived = set()
+        for first_id, day, count, data in cursor.execute('''
+            SELECT first_id, day, count, data FROM archive.event_batches
+            WHERE last_id >= ? AND first_id <= ?
+        ''', (start, end)).fetchall():
+            archived.update(row[0] for row in decode_events(first_id, day, count, data) if start <= row[0] <= end)
+        return archived
+
+    @classmethod
+    def _read_chunk(cls, cursor, where: str, params: Tuple) -> Tuple[int, float, List[Tuple], set]:
+        """读取并压缩一批过期事件，返回 (事件数, id 之和, 归档批次行, 涉及的单词 id)
+
+        事件数和 id 之和包括已经归档过的事件，批次行和单词 id 只包括尚未归档的事件。
+        """
+        rows = cursor.execute(f'''
+            SELECT id, word_id, mode_id, is_correct, timestamp, response_ms
+            FROM main.study_events WHERE {where} ORDER BY id
+        ''', params).fetchall()
+        archived = cls._archived_ids(cursor, params[0], params[1]) if rows else set()
+        by_day: Dict[int, List[Tuple]] = {}
+        for row in rows:
+            if row[0] not in archived:
+                by_day.setdefault(row[4] // SECONDS_PER_DAY, []).append(row)
+        batches = [(day, day_rows[0][0], day_rows[-1][0], len(day_rows), encode_events(day_rows[0][0], day, day_rows))
+                   for day, day_rows in by_day.items()]
+        word_ids = {row[1] for day_rows in by_day.values() for row in day_rows}
+        return len(rows), float(sum(row[0] for row in rows)), batches, word_ids
+
+    def _process_chunk(self, start: int, end: int, cutoff: int, archived_words: Optional[set]) -> Tuple[int, int]:
+        """汇总、归档并删除 id 在 [start, end] 中早于 cutoff 的事件，返回 (事件数, 归档批次数)
+
+        archived_words 为本次已写入归档库的单词 id，为 None 时不归档。
+        读取和压缩在事务之外进行，不阻塞程序的写入；事务内核对事件数和 id 之和，
+        这段事件在读取后被修改（例如单词被删除）时在事务内重新读取。
+        """
+        where = 'id BETWEEN ?1 AND ?2 AND timestamp < ?3'
+        params = (start, end, cutoff)
+        prepared = None
+        if archived_words is not None:
+            with self._lock:
+                prepared = self._read_chunk(self._conn.cursor(), where, params)
+            if prepared[0] == 0:
+                return 0, 0
+
+        with self._transaction() as cursor:
+            batches = 0
+            if prepared is not None:
+                count, id_total = cursor.execute(
+                    f'SELECT COUNT(*), TOTAL(id) FROM main.study_events WHERE {where}', params).fetchall()[0]
+                if (count, id_total) != prepared[:2]:
+                    prepared = self._read_chunk(cursor, where, params)
+                _, _, batch_rows, word_ids = prepared
+                cursor.executemany('''
+                    INSERT INTO archive.event_batches (day, first_id, last_id, count, data) VALUES (?, ?, ?, ?, ?)
+                ''', batch_rows)
+                batches = len(batch_rows)
+                new_words = word_ids - archived_words
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO archive.words (id, vocabulary_id, word)
+                    SELECT id, vocabulary_id, word FROM main.words WHERE id = ?
+                ''', [(word_id,) for word_id in new_words])
+
+            cursor.execute(f'''
+                INSERT INTO main.study_event_days (word_id, day, mode_id, total, correct, latency_total, latency_count)
+                SELECT word_id, timestamp / {SECONDS_PER_DAY}, mode_id, COUNT(*), IFNULL(SUM(is_correct), 0),
+                       IFNULL(SUM(response_ms), 0), COUNT(response_ms)
+                FROM main.study_events
+                WHERE {where}
+                GROUP BY 1, 2, 3
+                ON CONFLICT (word_id, day, mode_id) DO UPDATE SET
+                    total = total + excluded.total,
+                    correct = correct + excluded.correct,
+                    latency_total = latency_total + excluded.latency_total,
+                    latency_count = latency_count + excluded.latency_count
+            ''', params)
+            cursor.execute(f'DELETE FROM main.study_events WHERE {where}', params)
+            events = cursor.rowcount
+        if archived_words is not None:
+            archived_words.update(new_words)
+        return events, batches
+
+    def incremental_vacuum(self, is_cancelled: Optional[Callable[[], bool]] = None) -> int:
+        """分步归还空闲页，每步之间停顿，返回归还的页数；数据库不是增量整理模式时不做任何事
+
+        在 run() 中调用，使用本次运行的连接。
+        """
+        conn = self._conn
+        freed = 0
+        # 内存数据库使用共用的写连接，每条语句都在写锁内执行并取完结果
+        with self._lock:
+            if conn.execute('PRAGMA auto_vacuum').fetchall()[0][0] != 2:
+                return 0
+        while not (is_cancelled and is_cancelled()):
+            with self._lock:
+                free = conn.execute('PRAGMA freelist_count').fetchall()[0][0]
+                if free == 0:
+                    break
+                # execute() 只执行一步，每步只归还一页；executescript() 执行到结束
+                conn.executescript(f'PRAGMA incremental_vacuum({min(free, VACUUM_PAGES_PER_STEP)})')
+                remaining = conn.execute('PRAGMA freelist_count').fetchall()[0][0]
+            if remaining >= free:
+                break
+            freed += free - remaining
+            time.sleep(self.pause)
+        # WAL 模式下文件在检查点时才真正变小
+        with self._lock:
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
+        return freed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='汇总并归档早于保留期的学习事件')
+    parser.add_argument('--db', default='vocabulary.db', help='数据库文件，默认 vocabulary.db')
+    parser.add_argument('--horizon-days', type=int, default=DEFAULT_HORIZON_DAYS,
+                        help=f'保留最近多少天的原始事件，默认 {DEFAULT_HORIZON_DAYS}')
+    parser.add_argument('--archive', metavar='FILE', help='归档库文件，默认为数据库文件名加 -archive')
+    parser.add_argument('--no-archive', action='store_true', help='只汇总和删除，不保存原始事件')
+    args = parser.parse_args()
+
+    from data_manager import DatabaseManager
+    db = DatabaseManager(args.db)
+    engine = RetentionEngine(db, args.horizon_days, args.archive)
+    started = time.perf_counter()
+    counts = engine.run(archive=not args.no_archive)
+    db.close()
+    print(f"处理事件 {counts['events']} 条，归档批次 {counts['batches']} 个，"
+          f"归还 {counts['freed_pages']} 页，用时 {time.perf_counter() - started:.1f} 秒")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+# 与 SQLite CURRENT_TIMESTAMP 相同的 UTC 时间格式，字符串比较即时间比较
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 答错后多久再次到期
+RELEARN_DELAY = timedelta(minutes=10)
+MIN_DIFFICULTY = 1.0
+MAX_DIFFICULTY = 10.0
+
+
+def utc_now() -> datetime:
+    """当前 UTC 时间，不带时区，与数据库中读出的时间直接比较"""
+    return datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None)
+
+
+def format_time(value: datetime) -> str:
+    return value.strftime(TIME_FORMAT)
+
+
+def end_of_today() -> str:
+    """本地时间今天结束时对应的 UTC 时间，用于查询今天到期的卡"""
+    local_now = datetime.now()
+    local_end = local_now.replace(hour=23, minute=59, second=59, microsecond=0)
+    return format_time(utc_now() + (local_end - local_now.replace(microsecond=0)))
+
+
+class CardState:
+    """一张卡的调度状态"""
+    __slots__ = ('due', 'stability', 'difficulty', 'lapses', 'reps', 'last_review')
+
+    def __init__(self, due: str, stability: float = 0.0, difficulty: float = 5.0,
+                 lapses: int = 0, reps: int = 0, last_review: Optional[str] = None):
+        self.due = due
+        self.stability = stability
+        self.difficulty = difficulty
+        self.lapses = lapses
+        self.reps = reps
+        self.last_review = last_review
+
+    def as_row(self, vocab_id: int, word: str) -> Tuple:
+        return (vocab_id, word, self.due, self.stability, self.difficulty,
+                self.lapses, self.reps, self.last_review)
+
+
+def review(state: CardState, is_correct: bool, now: Optional[datetime] = None) -> CardState:
+    """根据作答结果计算新的调度状态（SM-2 的简化变体）
+
+    答对：难度降低，间隔依次为 1 天、3 天，之后按难度决定的倍数增长；
+    答错：难度升高，记一次遗忘，间隔缩短并在几分钟后重新到期。
+    """
+    now = now or utc_now()
+    if is_correct:
+        difficulty = max(MIN_DIFFICULTY, state.difficulty - 0.5)
+        if state.reps == 0:
+            stability = 1.0
+        elif state.reps == 1:
+            stability = 3.0
+        else:
+            # 难度 1 时间隔约乘 2.8，难度 10 时约乘 1.3
+            ease = 1.3 + (MAX_DIFFICULTY - difficulty) * 0.17
+            stability = max(state.stability, 1.0) * ease
+        lapses = state.lapses
+        reps = state.reps + 1
+        due = now + timedelta(days=stability)
+    else:
+        difficulty = min(MAX_DIFFICULTY, state.difficulty + 1.0)
+        stability = state.stability * 0.3
+        lapses = state.lapses + 1
+        reps = 0
+        due = now + RELEARN_DELAY
+    return CardState(format_time(due), stability, difficulty, lapses, reps, format_time(now))
+
+
+def order_due_cards(rows: List[Tuple], limit: Optional[int] = None,
+                    now: Optional[datetime] = None) -> List[Tuple]:
+    """用优先队列挑选本次要学习的卡
+
+    rows: [(单词, 词性释义, due, stability, difficulty, lapses, reps)]
+    逾期时间相对间隔越长、遗忘次数越多的卡越优先；只取前 limit 张。
+    """
+    now = now or utc_now()
+    fromisoformat = datetime.fromisoformat
+
+    def priority(i):
+        row = rows[i]
+        overdue_days = (now - fromisoformat(row[2])).total_seconds() / 86400
+        return -(overdue_days / max(row[3], 0.5)) - row[5] * 0.1
+
+    if limit is None or limit >= len(rows):
+        order = sorted(range(len(rows)), key=priority)
+    else:
+        # 堆选前 limit 个，O(n log limit)
+        order = heapq.nsmallest(limit, range(len(rows)), key=priority)
+    return [rows[i] for i in order]
+
+
+def order_wrong_words(rows: List[Tuple], limit: Optional[int] = None,
+                      now: Optional[datetime] = None) -> List[Tuple]:
+    """用优先队列挑选要复习的错题
+
+    rows: [(单词, 词性释义, 错误次数, 最近答错时间, 连续答对次数)]
+    错误次数越多、最近越常答错的越优先；上次复习已经答对的往后排。
+    """
+    now = now or utc_now()
+    fromisoformat = datetime.fromisoformat
+
+    def priority(i):
+        row = rows[i]
+        try:
+            days = max(0.0, (now - fromisoformat(row[3])).total_seconds() / 86400)
+        except (TypeError, ValueError):
+            days = 30.0
+        return -(row[2] + 2.0 / (1.0 + days) - 0.5 * row[4])
+
+    if limit is None or limit >= len(rows):
+        order = sorted(range(len(rows)), key=priority)
+    else:
+        order = heapq.nsmallest(limit, range(len(rows)), key=priority)
+    return [rows[i] for i in order]
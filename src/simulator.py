@@ -0,0 +1,249 @@
+"""无界面学习模拟器
+
+用合成的学习者模型驱动 StudySession 的作答流程（与界面中认识/选择/拼写模式
+调用的是同一个 answer()），把模拟的多天学习写入临时数据库，统计吞吐量、
+数据库大小增长和各操作的耗时分位数。不依赖 Qt，可以在没有显示器的机器上运行：
+
+    python simulator.py --learners 200 --days 30 --words 300 --workers 4
+"""
+import argparse
+import math
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from datetime import timedelta
+from multiprocessing import Pool
+from typing import Dict, List
+
+import scheduler
+from data_manager import DatabaseManager
+from study_buffer import StudyWriteBuffer
+from study_session import STUDY_MODES, StudySession
+
+POS_LIST = ['n.', 'v.', 'adj.', 'adv.']
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+# 每题约 8 秒
+SECONDS_PER_ANSWER = 8
+
+
+def write_book(path: str, words: int, rng: random.Random):
+    """生成合成单词本（导出格式的 TSV）"""
+    with open(path, 'w', encoding='utf-8') as file:
+        for i in range(words):
+            word = ''.join(rng.choice(LETTERS) for _ in range(rng.randint(3, 9))) + str(i)
+            senses = '; '.join(f"{rng.choice(POS_LIST)}: 释义{i}-{j}" for j in range(rng.randint(1, 2)))
+            file.write(f"{word}\t{senses}\n")
+
+
+class SimulatedLearner:
+    """合成学习者：每个单词有一个真实记忆强度（天），回忆概率随时间指数衰减"""
+
+    def __init__(self, vocab_id: int, mode: str, rng: random.Random):
+        self.vocab_id = vocab_id
+        self.mode = mode
+        self.rng = rng
+        self.skill = min(0.98, max(0.5, rng.gauss(0.85, 0.07)))
+        self.memory: Dict[str, List[float]] = {}   # 单词 -> [记忆强度, 上次复习的时间（天）]
+
+    def recalls(self, word: str, day: float) -> bool:
+        memory = self.memory.get(word)
+        if memory is None:
+            p = 0.35 * self.skill
+            memory = self.memory[word] = [0.5, day]
+        else:
+            p = self.skill * math.exp(-(day - memory[1]) / memory[0])
+        recalled = self.rng.random() < p
+        memory[0] = memory[0] * 2.2 if recalled else max(0.5, memory[0] * 0.5)
+        memory[1] = day
+        return recalled
+
+    def response_ms(self) -> int:
+        """模拟的反应时间：对数正态分布，中位数约 2.5 秒"""
+        return int(self.rng.lognormvariate(math.log(2500), 0.5))
+
+    def respond(self, session: StudySession, card, day: float):
+        """按学习模式构造回答：认识模式给布尔值，选择模式给选中的释义，拼写模式给输入的单词"""
+        word, meaning = card
+        recalled = self.recalls(word, day)
+        if self.mode == 'recognize':
+            return recalled
+        if self.mode in ('choice', 'sprint'):
+            wrong = [option for option in session.options if option != meaning]
+            return meaning if recalled or not wrong else self.rng.choice(wrong)
+        return word if recalled else ''
+
+
+class LatencyRecorder:
+    """按操作名记录耗时（秒）"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def time(self, name: str, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.samples[name].append(time.perf_counter() - start)
+        return result
+
+    def merge(self, samples: Dict[str, List[float]]):
+        for name, values in samples.items():
+            self.samples[name].extend(values)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def db_size(db_path: str) -> int:
+    return sum(os.path.getsize(path) for path in (db_path, db_path + '-wal') if os.path.exists(path))
+
+
+def run_shard(args):
+    """在独立的数据库中模拟一组学习者，返回统计结果（可在子进程中运行）"""
+    shard, db_path, book_path, learners, days, session_size, modes, seed, start_time = args
+    rng = random.Random(seed * 1000 + shard)
+    latency = LatencyRecorder()
+    db = DatabaseManager(db_path, profile='fast')
+    buffer = StudyWriteBuffer(db)
+
+    population = []
+    for i in range(learners):
+        name = f"learner-{shard}-{i}"
+        db.add_vocabulary(name)
+        vocab_id = db.cursor.execute('SELECT id FROM vocabularies WHERE name = ?', (name,)).fetchone()[0]
+        latency.time('import', db.import_vocabulary, vocab_id, book_path)
+        population.append(SimulatedLearner(vocab_id, modes[i % len(modes)], random.Random(rng.random())))
+
+    answers = 0
+    study_seconds = 0.0
+    sizes = []
+    for day in range(days):
+        day_start = time.perf_counter()
+        for learner in population:
+            now = [start_time + timedelta(days=day)]
+            clock = lambda: now[0]
+            session = latency.time('session_start', StudySession.from_database, db, learner.vocab_id,
+                                   learner.mode, ['word'], buffer, session_size,
+                                   rng=learner.rng, clock=clock)
+            if session is None:
+                continue
+            while True:
+                card = session.next_card()
+                if card is None:
+                    break
+                response = learner.respond(session, card, (now[0] - start_time).total_seconds() / 86400)
+                latency.time('answer', session.answer, response, learner.response_ms())
+                now[0] += timedelta(seconds=SECONDS_PER_ANSWER)
+                answers += 1
+            latency.time('flush', buffer.flush)
+        latency.time('daily_stats', db.get_daily_stats, population[rng.randrange(len(population))].vocab_id)
+        latency.time('wrong_words', db.get_wrong_words, population[rng.randrange(len(population))].vocab_id)
+        study_seconds += time.perf_counter() - day_start
+        db.connections.writer.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        sizes.append(db_size(db_path))
+
+    buffer.close()
+    db.close()
+    return {'answers': answers, 'seconds': study_seconds, 'sizes': sizes, 'latency': dict(latency.samples)}
+
+
+def simulate(learners: int = 100, days: int = 30, words: int = 300, session_size: int = 100,
+             modes: List[str] = None, workers: int = 1, seed: int = 0, work_dir: str = None) -> Dict:
+    """运行模拟，返回汇总结果；学习者平均分配到 workers 个数据库分片"""
+    modes = modes or list(STUDY_MODES)
+    workers = max(1, min(workers, learners))
+    rng = random.Random(seed)
+    book_path = os.path.join(work_dir, 'book.tsv')
+    write_book(book_path, words, rng)
+
+    # 导入的新单词按真实时间到期，模拟从导入之后开始，每天同一时间学习
+    start_time = scheduler.utc_now() + timedelta(minutes=1)
+    jobs = []
+    for shard in range(workers):
+        count = learners // workers + (1 if shard < learners % workers else 0)
+        db_path = os.path.join(work_dir, f'sim_{shard}.db')
+        jobs.append((shard, db_path, book_path, count, days, session_size, modes, seed, start_time))
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [run_shard(jobs[0])]
+    else:
+        with Pool(workers) as pool:
+            results = pool.map(run_shard, jobs)
+    wall_seconds = time.perf_counter() - start
+
+    latency = LatencyRecorder()
+    for result in results:
+        latency.merge(result['latency'])
+    answers = sum(result['answers'] for result in results)
+    sizes = [sum(result['sizes'][day] for result in results) for day in range(days)]
+    return {
+        'learners': learners, 'days': days, 'words': words, 'workers': workers,
+        'answers': answers,
+        'wall_seconds': wall_seconds,
+        # 整体吞吐按总耗时计算，单进程吞吐按各分片学习耗时之和计算
+        'answers_per_second': answers / wall_seconds if wall_seconds else 0.0,
+        'answers_per_cpu_second': answers / sum(r['seconds'] for r in results) if answers else 0.0,
+        'db_sizes': sizes,
+        'latency': {name: sorted(values) for name, values in latency.samples.items()},
+    }
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"学习者 {report['learners']}，天数 {report['days']}，单词本 {report['words']} 词，"
+        f"进程 {report['workers']}",
+        f"作答 {report['answers']} 次，总耗时 {report['wall_seconds']:.1f} 秒，"
+        f"吞吐量 {report['answers_per_second']:.0f} 次/秒（单进程 {report['answers_per_cpu_second']:.0f} 次/秒）",
+        '',
+        '数据库大小（所有分片合计）：',
+    ]
+    sizes = report['db_sizes']
+    step = max(1, len(sizes) // 10)
+    for day in list(range(0, len(sizes), step)) + ([len(sizes) - 1] if (len(sizes) - 1) % step else []):
+        lines.append(f"  第 {day + 1:>4} 天  {sizes[day] / 1024 / 1024:8.2f} MB")
+    if len(sizes) > 1:
+        lines.append(f"  平均每天增长 {(sizes[-1] - sizes[0]) / (len(sizes) - 1) / 1024:.1f} KB")
+    lines += ['', f"{'操作':<14}{'次数':>9}{'p50(ms)':>10}{'p90(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}"]
+    for name, values in report['latency'].items():
+        lines.append(f"{name:<14}{len(values):>9}" + ''.join(
+            f"{percentile(values, q) * 1000:>10.3f}" for q in (0.5, 0.9, 0.99, 1.0)))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='无界面学习模拟：吞吐量、数据库增长和操作耗时')
+    parser.add_argument('--learners', type=int, default=100, help='模拟的学习者数量')
+    parser.add_argument('--days', type=int, default=30, help='模拟的天数')
+    parser.add_argument('--words', type=int, default=300, help='每个单词本的单词数')
+    parser.add_argument('--session-size', type=int, default=100, help='每次学习最多安排的卡数')
+    parser.add_argument('--modes', default=','.join(STUDY_MODES), help='学习模式，逗号分隔，按学习者轮流分配')
+    parser.add_argument('--workers', type=int, default=1, help='并行进程数，每个进程使用独立的数据库')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--keep', metavar='DIR', help='把模拟数据库保存到指定目录，默认运行结束后删除')
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = [mode for mode in modes if mode not in STUDY_MODES]
+    if unknown:
+        parser.error(f"未知的学习模式: {', '.join(unknown)}")
+
+    work_dir = args.keep or tempfile.mkdtemp(prefix='vocab-sim-')
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        report = simulate(args.learners, args.days, args.words, args.session_size, modes,
+                          args.workers, args.seed, work_dir)
+        print(format_report(report))
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
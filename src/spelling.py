@@ -0,0 +1,155 @@
+import difflib
+import html
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 按单词长度允许的拼写错误数：(最大长度, 允许的编辑距离)，最后一项的长度为 None 表示更长的单词
+DEFAULT_THRESHOLDS: Sequence[Tuple[Optional[int], int]] = ((3, 0), (7, 1), (None, 2))
+
+
+@lru_cache(maxsize=4096)
+def _pattern_masks(pattern: str) -> Tuple[Dict[str, int], int]:
+    """每个字符在 pattern 中出现位置的位掩码，同一个单词反复评分时复用"""
+    masks: Dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    return masks, (1 << len(pattern)) - 1
+
+
+def edit_distance(text: str, pattern: str, max_distance: Optional[int] = None) -> int:
+    """Levenshtein 编辑距离，Myers/Hyyrö 位并行算法
+
+    pattern 的每个位置对应整数的一位，每读入 text 的一个字符用几次位运算更新整列，
+    复杂度 O(len(text) * ⌈len(pattern) / 字长⌉)。
+    给出 max_distance 时，距离必然超过它就提前返回 max_distance + 1。
+    """
+    m = len(pattern)
+    if text == pattern:
+        return 0
+    if max_distance is not None and abs(len(text) - m) > max_distance:
+        return max_distance + 1
+    if m == 0:
+        return len(text)
+
+    masks, full = _pattern_masks(pattern)
+    high = 1 << (m - 1)
+    pv, mv = full, 0
+    score = m
+    remaining = len(text)
+    for ch in text:
+        eq = masks.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+        remaining -= 1
+        # 剩余每个字符最多让距离减 1
+        if max_distance is not None and score - remaining > max_distance:
+            return max_distance + 1
+    return score
+
+
+class SpellingResult:
+    """一次拼写评分的结果，布尔值为是否判为正确"""
+    __slots__ = ('answer', 'word', 'distance', 'allowed', 'is_correct', 'exact', 'score')
+
+    def __init__(self, answer: str, word: str, distance: int, allowed: int):
+        self.answer = answer
+        self.word = word
+        self.distance = distance
+        self.allowed = allowed
+        self.exact = distance == 0
+        self.is_correct = distance <= allowed
+        # 部分得分：按错误字母数占单词长度的比例扣分
+        self.score = max(0.0, 1.0 - distance / max(len(word), 1))
+
+    def __bool__(self):
+        return self.is_correct
+
+    def diff(self) -> List[Tuple[str, str, str]]:
+        """逐段比较输入和正确拼写：[(标记, 输入中的片段, 正确拼写中的片段)]
+
+        标记为 difflib 的 equal / replace / delete（多输入的字母）/ insert（漏掉的字母）。
+        """
+        answer, word = self.answer.lower(), self.word.lower()
+        matcher = difflib.SequenceMatcher(None, answer, word, autojunk=False)
+        return [(tag, self.answer[i1:i2], self.word[j1:j2])
+                for tag, i1, i2, j1, j2 in matcher.get_opcodes()]
+
+    def diff_html(self) -> str:
+        """用于 QLabel 的富文本：错误的字母标红划掉，漏掉或改正的字母标绿"""
+        parts = []
+        for tag, typed, expected in self.diff():
+            if tag == 'equal':
+                parts.append(html.escape(expected))
+                continue
+            if typed:
+                parts.append(f'<s style="color:#F44336">{html.escape(typed)}</s>')
+            if expected:
+                parts.append(f'<u style="color:#4CAF50">{html.escape(expected)}</u>')
+        return ''.join(parts)
+
+
+class SpellingGrader:
+    """拼写评分：忽略大小写和首尾空白，按单词长度容忍少量拼写错误"""
+
+    def __init__(self, thresholds: Sequence[Tuple[Optional[int], int]] = DEFAULT_THRESHOLDS):
+        self.thresholds = tuple(thresholds)
+
+    def allowed_errors(self, word: str) -> int:
+        length = len(word)
+        for max_length, allowed in self.thresholds:
+            if max_length is None or length <= max_length:
+                return allowed
+        return 0
+
+    def grade(self, answer: str, word: str) -> SpellingResult:
+        answer = (answer or '').strip()
+        allowed = self.allowed_errors(word)
+        distance = edit_distance(answer.lower(), word.lower())
+        return SpellingResult(answer, word, distance, allowed)
+
+    def grade_many(self, pairs: Iterable[Tuple[str, str]]) -> List[bool]:
+        """批量评分（离线导入、模拟），只返回是否正确
+
+        相同的 (输入, 单词) 只计算一次；距离计算在超过允许的错误数后提前结束。
+        纯 Python 实现的吞吐量受每对输入的解释器开销限制：大多数输入正确或只有一处
+        错误时约每毫秒 700～800 个，完全随机的输入约每毫秒 300 个，达不到每毫秒数千个。
+        """
+        results = []
+        cache: Dict[Tuple[str, str], bool] = {}
+        allowed_cache: Dict[int, int] = {}
+        for answer, word in pairs:
+            key = (answer, word)
+            is_correct = cache.get(key)
+            if is_correct is None:
+                typed = (answer or '').strip().lower()
+                expected = word.lower()
+                if typed == expected:
+                    is_correct = True
+                else:
+                    allowed = allowed_cache.get(len(word))
+                    if allowed is None:
+                        allowed = allowed_cache[len(word)] = self.allowed_errors(word)
+                    if allowed == 0:
+                        is_correct = False
+                    elif len(typed) == len(expected) and sum(
+                            a != b for a, b in zip(typed, expected)) <= allowed:
+                        # 等长时替换次数是编辑距离的上界，常见的个别字母打错不必走完整算法
+                        is_correct = True
+                    else:
+                        is_correct = edit_distance(typed, expected, allowed) <= allowed
+                cache[key] = is_correct
+            results.append(is_correct)
+        return results
+
+
+default_grader = SpellingGrader()
@@ -0,0 +1,99 @@
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+
+class StudyWriteBuffer:
+    """学习记录写缓冲
+
+    答题时只把学习记录、错题和复习状态追加到内存，达到数量或时间阈值时
+    用 executemany 在一个事务中批量写入。写入失败时事件保留在缓冲中，
+    下次 flush 重试。缓冲不自动在退出时写入，使用者在关闭数据库之前调用 close()。
+    """
+
+    def __init__(self, db, max_events: int = 50, max_delay: float = 2.0):
+        self.db = db
+        self.max_events = max_events
+        self.max_delay = max_delay
+        self._records: List[Tuple] = []
+        # 答错和错题复习答对按答题顺序放在同一个列表中，写入时按顺序执行
+        self._wrong_word_events: List[Tuple] = []
+        self._card_states: List[Tuple] = []
+        self._first_event_time = None
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._records) + len(self._wrong_word_events) + len(self._card_states)
+
+    def record_study(self, vocab_id: int, word: str, is_correct: bool, study_mode: str,
+                     timestamp: Optional[str] = None, response_ms: Optional[int] = None):
+        # 在答题时记录时间，格式与 CURRENT_TIMESTAMP 一致（UTC）
+        if timestamp is None:
+            timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        with self._lock:
+            self._records.append((vocab_id, word, is_correct, study_mode, timestamp, response_ms))
+            self._mark_event()
+        self.maybe_flush()
+
+    def add_wrong_word(self, vocab_id: int, word: str, meaning: str, timestamp: Optional[str] = None):
+        """答错一次，错误次数加一；释义不单独保存，显示时从 senses 读取"""
+        if timestamp is None:
+            timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        with self._lock:
+            self._wrong_word_events.append((vocab_id, word, timestamp, False))
+            self._mark_event()
+        self.maybe_flush()
+
+    def resolve_wrong_word(self, vocab_id: int, word: str):
+        """错题复习答对一次，写入时错误次数减一，减到 0 时移出错题本"""
+        with self._lock:
+            self._wrong_word_events.append((vocab_id, word, None, True))
+            self._mark_event()
+        self.maybe_flush()
+
+    def update_card_state(self, vocab_id: int, word: str, state):
+        with self._lock:
+            self._card_states.append(state.as_row(vocab_id, word))
+            self._mark_event()
+        self.maybe_flush()
+
+    def _mark_event(self):
+        if self._first_event_time is None:
+            self._first_event_time = time.monotonic()
+
+    def maybe_flush(self):
+        """超过数量或时间阈值时写入"""
+        if self._first_event_time is None:
+            return
+        if (self.pending >= self.max_events
+                or time.monotonic() - self._first_event_time >= self.max_delay):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # 事件已放回缓冲，交给下一次 flush 重试，不打断答题
+                pass
+
+    def flush(self) -> int:
+        """把缓冲中的所有事件在一个事务中写入数据库，返回写入的事件数"""
+        with self._lock:
+            if not self.pending:
+                return 0
+            count = self.pending
+            records, wrong_word_events, card_states = self._records, self._wrong_word_events, self._card_states
+            self._records, self._wrong_word_events, self._card_states = [], [], []
+            self._first_event_time = None
+            try:
+                self.db.write_study_events(records, wrong_word_events, card_states)
+            except Exception:
+                # 写入失败，放回缓冲等待下次重试
+                self._records = records + self._records
+                self._wrong_word_events = wrong_word_events + self._wrong_word_events
+                self._card_states = card_states + self._card_states
+                self._first_event_time = time.monotonic()
+                raise
+        return count
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,58 @@
+import random
+from collections import deque
+from itertools import islice
+from typing import List, Optional, Tuple
+
+
+class SessionDeck:
+    """一次学习会话的卡组
+
+    会话开始时读取一次单词，打乱（或按调度优先级排列）成不放回的下标队列，每张卡 O(1) 取出，
+    不再访问数据库。答错的卡可以重新插回队列稍后位置再练一次。
+    """
+
+    def __init__(self, cards: List[Tuple[str, str]], rng: Optional[random.Random] = None,
+                 max_requeues: int = 1, requeue_gap: int = 3, shuffle: bool = True):
+        self.cards = cards
+        self.max_requeues = max_requeues
+        self.requeue_gap = requeue_gap
+        self._rng = rng or random.Random()
+        order = list(range(len(cards)))
+        if shuffle:
+            self._rng.shuffle(order)
+        self._queue = deque(order)
+        self._requeued = bytearray(len(cards))   # 每张卡已重新入队的次数
+        self.current = None
+        self.total = len(cards)
+
+    def __len__(self):
+        return len(self._queue)
+
+    @property
+    def remaining(self) -> int:
+        return len(self._queue)
+
+    def peek(self, count: int) -> List[int]:
+        """接下来 count 张卡的下标，不取出（预取用）"""
+        return list(islice(self._queue, count))
+
+    def next_card(self) -> Optional[Tuple[str, str]]:
+        """取出下一张卡，卡组用完时返回 None"""
+        if not self._queue:
+            self.current = None
+            return None
+        self.current = self._queue.popleft()
+        return self.cards[self.current]
+
+    def finish_current(self):
+        """当前卡已作答"""
+        self.current = None
+
+    def requeue_current(self) -> bool:
+        """把当前卡放回队列中几张之后的位置，超过重练次数时返回 False"""
+        if self.current is None or self._requeued[self.current] >= self.max_requeues:
+            return False
+        self._requeued[self.current] += 1
+        self._queue.insert(min(self.requeue_gap, len(self._queue)), self.current)
+        self.total += 1
+        return True
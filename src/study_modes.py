@@ -1,140 +1,29 @@
-from PyQt6.QtWidgets import QPushButton, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QMessageBox, QProgressBar
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
-import random
-from typing import Optional
+from PyQt6.QtWidgets import QMessageBox, QStackedWidget
 from theme_manager import Theme
+from study_session import StudySession
 
 class StudyModes:
-    # 添加类变量来跟踪进度
-    current_word_index = 0
-    total_words = 0
-    correct_count = 0
+    """学习页面的界面逻辑
 
-    @staticmethod
-    def create_recognize_mode(study_layout, words):
-        from ui_components import AnimatedButton
-        
-        # 随机选择一个单词
-        word, meaning = random.choice(words)
-        
-        # 创建进度指示器
-        progress_layout = QHBoxLayout()
-        progress_label = QLabel("学习进度：")
-        progress_bar = QProgressBar()
-        progress_bar.setRange(0, StudyModes.total_words)
-        progress_bar.setValue(StudyModes.current_word_index)
-        progress_layout.addWidget(progress_label)
-        progress_layout.addWidget(progress_bar)
-        study_layout.addLayout(progress_layout)
-        
-        # 显示单词
-        word_label = QLabel(word)
-        word_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        word_label.setFont(QFont('Arial', 24))
-        study_layout.addWidget(word_label)
-        
-        # 添加状态标签
-        status_label = QLabel()
-        status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        status_label.setStyleSheet("color: green; font-size: 16px;")
-        study_layout.addWidget(status_label)
-        
-        # 显示释义按钮
-        btn_show = AnimatedButton('显示释义')
-        btn_show.clicked.connect(lambda: StudyModes.show_meaning(meaning, status_label))
-        study_layout.addWidget(btn_show)
-        
-        # 创建一个容器来放置按钮
-        button_container = QWidget()
-        button_layout = QHBoxLayout(button_container)
-        
-        # 认识/不认识按钮
-        btn_know = AnimatedButton('认识')
-        btn_unknown = AnimatedButton('不认识')
-        button_layout.addWidget(btn_know)
-        button_layout.addWidget(btn_unknown)
-        
-        study_layout.addWidget(button_container)
-        
-        return btn_know, btn_unknown, word, meaning
-        
-    @staticmethod
-    def show_meaning(meaning: str, status_label: QLabel) -> None:
-        status_label.setText(f"释义: {meaning}")
-        status_label.setStyleSheet("""
-            QLabel {
-                color: #2196F3;
-                font-size: 16px;
-                padding: 10px;
-                background-color: #E3F2FD;
-                border-radius: 4px;
-            }
-        """)
+    会话状态（卡组、进度、调度状态）都在 main_window.study_session 中，
+    这里只负责显示卡片和把用户的回答交给会话，本身不保存任何可变状态。
+    """
+    # 每次学习最多安排的到期卡数
+    session_size = 100
+
+    # 后台预取接下来几张卡的选项
+    prefetch_count = 5
 
     @staticmethod
-    def handle_choice(is_correct: bool, word: str, correct_meaning: str, 
-                    status_label: Optional[QLabel] = None, 
-                    main_window: Optional[object] = None) -> None:
-        StudyModes.current_word_index += 1
-        if is_correct:
-            StudyModes.correct_count += 1
-        else:
-            # 记录错题
-            if main_window:
-                main_window.db.add_wrong_word(
-                    main_window.current_vocab_id,
-                    word,
-                    correct_meaning
-                )
-        
-        # 优化进度条更新 - 缓存进度条引用
-        if hasattr(main_window, '_cached_progress_bar'):
-            progress_bar = main_window._cached_progress_bar
-            if progress_bar:
-                progress_bar.setValue(StudyModes.current_word_index)
-        else:
-            # 首次查找并缓存进度条
-            progress_bar = None
-            for i in range(main_window.study_layout.count()):
-                widget = main_window.study_layout.itemAt(i).widget()
-                if isinstance(widget, QProgressBar):
-                    progress_bar = widget
-                    main_window._cached_progress_bar = progress_bar
-                    break
-            if progress_bar:
-                progress_bar.setValue(StudyModes.current_word_index)
-        
-        # 记录学习数据
-        if main_window:
-            main_window.db.record_study(
-                main_window.current_vocab_id,
-                word,
-                is_correct,
-                'choice'
-            )
-        
-        # 检查是否完成所有单词
-        if StudyModes.current_word_index >= StudyModes.total_words:
-            main_window.statusBar().showMessage(
-                f'学习完成！总单词数：{StudyModes.total_words}，正确单词数：{StudyModes.correct_count}，正确率：{StudyModes.correct_count * 100 / StudyModes.total_words:.1f}%', 
-                5000
-            )
-            main_window.switch_page(main_window.main_page)
+    def handle_choice(main_window, chosen_meaning: str) -> None:
+        """选择模式：立即显示下一题，上一题的结果显示在状态标签中"""
+        session = main_window.study_session
+        word, correct_meaning = session.current_card
+        is_correct = session.answer(chosen_meaning)
+        if StudyModes._after_answer(main_window, session):
             return
-        
-        if is_correct:
-            if status_label:
-                status_label.setText("✓ 回答正确！")
-                status_label.setStyleSheet("color: #4CAF50; font-size: 16px; font-weight: bold;")
-        else:
-            if status_label:
-                status_label.setText(f"✗ 回答错误！\n正确答案是：{correct_meaning}")
-                status_label.setStyleSheet("color: #F44336; font-size: 16px;")
-        
-        from PyQt6.QtCore import QTimer
-        if main_window:
-            QTimer.singleShot(1000, lambda: StudyModes.start_study(main_window))
+        StudyModes.next_word(main_window)
+        main_window.study_views['choice'].show_result(is_correct, word, correct_meaning)
 
     @staticmethod
     def save_settings(main_window):
@@ -161,6 +50,8 @@ class StudyModes:
             main_window.study_mode = 'choice'
         elif main_window.settings_radio_spell.isChecked():
             main_window.study_mode = 'spell'
+        elif main_window.settings_radio_sprint.isChecked():
+            main_window.study_mode = 'sprint'
         
         # 保存学习类型 - 支持多选
         study_types = []
@@ -181,142 +72,71 @@ class StudyModes:
         main_window.switch_page(main_window.main_page)
 
     @staticmethod
-    def create_choice_mode(study_layout, words, main_window=None):
-        from ui_components import AnimatedButton
-        word, correct_meaning = random.choice(words)
-        
-        # 创建进度指示器
-        progress_layout = QHBoxLayout()
-        progress_label = QLabel("学习进度：")
-        progress_bar = QProgressBar()
-        progress_bar.setRange(0, StudyModes.total_words)
-        progress_bar.setValue(StudyModes.current_word_index)
-        progress_layout.addWidget(progress_label)
-        progress_layout.addWidget(progress_bar)
-        study_layout.addLayout(progress_layout)
-        
-        # 显示单词
-        word_label = QLabel(word)
-        word_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        word_label.setFont(QFont('Arial', 24))
-        study_layout.addWidget(word_label)
-        
-        # 创建选项
-        meanings = [correct_meaning]
-        while len(meanings) < 4:
-            _, meaning = random.choice(words)
-            if meaning not in meanings:
-                meanings.append(meaning)
-        random.shuffle(meanings)
-        
-        # 创建选项按钮
-        buttons = []
-        status_label = QLabel()
-        status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        study_layout.addWidget(status_label)
-        
-        for i, meaning in enumerate(meanings):
-            btn = AnimatedButton(meaning)
-            is_correct = meaning == correct_meaning
-            # 使用functools.partial来正确捕获变量值
-            from functools import partial
-            btn.clicked.connect(partial(StudyModes.handle_choice, is_correct=is_correct, 
-                                    word=word, correct_meaning=correct_meaning, 
-                                    status_label=status_label, main_window=main_window))
-            buttons.append((btn, is_correct))
-            study_layout.addWidget(btn)
-            
-        return buttons, word, correct_meaning
+    def handle_sprint(main_window, chosen_meaning: str) -> None:
+        """冲刺模式：不等待，立即显示下一题，上一题的结果和用时显示在状态标签中"""
+        session = main_window.study_session
+        correct_meaning = session.current_card[1]
+        is_correct = session.answer(chosen_meaning)
+        if StudyModes._after_answer(main_window, session):
+            return
+        StudyModes.next_word(main_window)
+        seconds = (session.last_response_ms or 0) / 1000
+        average = (session.average_response_ms or 0) / 1000
+        if is_correct:
+            feedback, style = f"✓ {seconds:.1f} 秒（平均 {average:.1f} 秒）", 'correct'
+        else:
+            feedback, style = f"✗ {seconds:.1f} 秒，上一题答案：{correct_meaning}", 'wrong'
+        main_window.study_views['sprint'].set_status(feedback, style)
 
     @staticmethod
-    def create_spell_mode(study_layout, words):
-        from ui_components import AnimatedButton
-        word, meaning = random.choice(words)
-        
-        # 创建进度指示器
-        progress_layout = QHBoxLayout()
-        progress_label = QLabel("学习进度：")
-        progress_bar = QProgressBar()
-        progress_bar.setRange(0, StudyModes.total_words)
-        progress_bar.setValue(StudyModes.current_word_index)
-        progress_layout.addWidget(progress_label)
-        progress_layout.addWidget(progress_bar)
-        study_layout.addLayout(progress_layout)
-        
-        # 显示释义
-        meaning_label = QLabel(meaning)
-        meaning_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        meaning_label.setFont(QFont('Arial', 18))
-        study_layout.addWidget(meaning_label)
-        
-        # 输入框
-        spell_input = QLineEdit()
-        spell_input.setPlaceholderText('请输入单词')
-        study_layout.addWidget(spell_input)
-        
-        # 检查按钮
-        btn_check = AnimatedButton('检查答案')
-        study_layout.addWidget(btn_check)
-        
-        return spell_input, btn_check, word, meaning
+    def handle_recognize(main_window, known: bool) -> None:
+        session = main_window.study_session
+        session.answer(known)
+        if StudyModes._after_answer(main_window, session):
+            return
+        # 继续下一个单词
+        StudyModes.next_word(main_window)
 
     @staticmethod
-    def handle_recognize(main_window, known, word, meaning):
-        StudyModes.current_word_index += 1
-        if known:
-            StudyModes.correct_count += 1
-        else:
-            # 记录错题
-            main_window.db.add_wrong_word(
-                main_window.current_vocab_id,
-                word,
-                meaning
-            )
-        
-        # 优化进度条更新 - 使用缓存
-        if hasattr(main_window, '_cached_progress_bar'):
-            progress_bar = main_window._cached_progress_bar
-            if progress_bar:
-                progress_bar.setValue(StudyModes.current_word_index)
+    def check_spelling(main_window, input_word: str) -> None:
+        session = main_window.study_session
+        correct_word = session.current_card[0]
+        session.answer(input_word)
+        result = session.last_grade
+        if result.exact:
+            main_window.statusBar().showMessage('拼写正确！', 2000)
+            feedback, style = '', 'none'
+        elif result.is_correct:
+            main_window.statusBar().showMessage(f'基本正确，注意拼写：{correct_word}', 3000)
+            feedback, style = f'上一个单词有 {result.distance} 处拼写错误：{result.diff_html()}', 'correct'
         else:
-            # 首次查找并缓存进度条
-            progress_bar = None
-            for i in range(main_window.study_layout.count()):
-                widget = main_window.study_layout.itemAt(i).widget()
-                if isinstance(widget, QProgressBar):
-                    progress_bar = widget
-                    main_window._cached_progress_bar = progress_bar
-                    break
-            if progress_bar:
-                progress_bar.setValue(StudyModes.current_word_index)
-        
-        # 记录学习数据
-        vocab_id = getattr(main_window, 'current_vocab_id', None)
-        if vocab_id:
-            main_window.db.record_study(
-                vocab_id,
-                word,
-                known,
-                'recognize'
-            )
-        
-        # 检查是否完成所有单词
-        if StudyModes.current_word_index >= StudyModes.total_words:
-            main_window.statusBar().showMessage(
-                f'学习完成！总单词数：{StudyModes.total_words}，认识单词数：{StudyModes.correct_count}，正确率：{StudyModes.correct_count * 100 / StudyModes.total_words:.1f}%', 
-                5000
-            )
-            main_window.switch_page(main_window.main_page)
+            main_window.statusBar().showMessage(f'拼写错误！正确答案是：{correct_word}', 3000)
+            feedback, style = f'上一个单词拼写错误：{result.diff_html()}', 'wrong'
+        if StudyModes._after_answer(main_window, session):
             return
-        
-        # 继续下一个单词
-        words = main_window.db.get_words_with_pos_meanings(vocab_id)
-        main_window.current_word = random.choice(words)
-        StudyModes.start_study(main_window)
+        StudyModes.next_word(main_window)
+        # 新卡显示后在状态栏下方保留上一个单词的逐字母比较
+        if feedback:
+            main_window.study_views['spell'].set_status(feedback, style)
 
     @staticmethod
-    def next_word(main_window):
-        StudyModes.start_study(main_window)
+    def _after_answer(main_window, session) -> bool:
+        """更新进度，会话完成时显示结果并返回首页，返回是否已完成"""
+        StudyModes._update_progress(main_window, session)
+        if not session.finished:
+            return False
+        correct_label = '认识单词数' if session.mode_name == 'recognize' else '正确单词数'
+        average = session.average_response_ms
+        average_text = f'，平均用时：{average / 1000:.1f} 秒' if average is not None else ''
+        transition = session.average_transition_ms
+        transition_text = f'，平均换题：{transition:.0f} 毫秒' if transition is not None else ''
+        main_window.statusBar().showMessage(
+            f'学习完成！总单词数：{session.total}，{correct_label}：{session.correct}，'
+            f'正确率：{session.accuracy:.1f}%{average_text}{transition_text}', 
+            5000
+        )
+        main_window.switch_page(main_window.main_page)
+        return True
 
     @staticmethod
     def check_answer(main_window, is_correct, words):
@@ -327,61 +147,8 @@ class StudyModes:
         StudyModes.next_word(main_window)
 
     @staticmethod
-    def check_spelling(main_window, input_word, correct_word, correct_meaning, words):
-        StudyModes.current_word_index += 1
-        is_correct = input_word.lower() == correct_word.lower()
-        
-        if is_correct:
-            StudyModes.correct_count += 1
-            main_window.statusBar().showMessage('拼写正确！', 2000)
-        else:
-            main_window.statusBar().showMessage(f'拼写错误！正确答案是：{correct_word}', 3000)
-            # 记录错题
-            main_window.db.add_wrong_word(
-                main_window.current_vocab_id,
-                correct_word,
-                correct_meaning
-            )
-        
-        # 优化进度条更新 - 使用缓存
-        if hasattr(main_window, '_cached_progress_bar'):
-            progress_bar = main_window._cached_progress_bar
-            if progress_bar:
-                progress_bar.setValue(StudyModes.current_word_index)
-        else:
-            # 首次查找并缓存进度条
-            progress_bar = None
-            for i in range(main_window.study_layout.count()):
-                widget = main_window.study_layout.itemAt(i).widget()
-                if isinstance(widget, QProgressBar):
-                    progress_bar = widget
-                    main_window._cached_progress_bar = progress_bar
-                    break
-            if progress_bar:
-                progress_bar.setValue(StudyModes.current_word_index)
-        
-        # 记录学习数据
-        vocab_id = getattr(main_window, 'current_vocab_id', None)
-        if vocab_id:
-            main_window.db.record_study(
-                vocab_id,
-                correct_word,
-                is_correct,
-                'spell'
-            )
-        
-        # 检查是否完成所有单词
-        if StudyModes.current_word_index >= StudyModes.total_words:
-            main_window.statusBar().showMessage(
-                f'学习完成！总单词数：{StudyModes.total_words}，正确单词数：{StudyModes.correct_count}，正确率：{StudyModes.correct_count * 100 / StudyModes.total_words:.1f}%', 
-                5000
-            )
-            main_window.switch_page(main_window.main_page)
-            return
-        
-        StudyModes.next_word(main_window)
-
     def start_study(main_window):
+        """开始学习：继续未完成的会话，或者读取单词本建立新的会话"""
         # 使用保存的设置而不是从界面获取
         vocab_id = getattr(main_window, 'current_vocab_id', None)
         if not vocab_id:
@@ -389,13 +156,27 @@ class StudyModes:
             main_window.switch_page(main_window.settings_page)
             return
         
-        # 切换到学习页面
-        main_window.switch_page(main_window.study_page)
-        
-        # 根据学习类型获取单词
         study_type = getattr(main_window, 'study_type', ['word'])  # 默认为包含'word'的列表
-        words = main_window.db.get_words_with_pos_meanings(vocab_id, study_type)
-        if not words:
+        mode = getattr(main_window, 'study_mode', 'recognize')
+        session_key = (vocab_id, tuple(study_type) if isinstance(study_type, list) else study_type, mode)
+        session = getattr(main_window, 'study_session', None)
+        if session is not None and not session.finished and session.key == session_key:
+            # 继续上次的会话，重新显示还没回答的那张卡
+            StudyModes.next_word(main_window)
+            return
+        
+        # 整个会话只查询一次：只读取今天到期的卡，按优先级排列
+        session = StudySession.from_database(main_window.db, vocab_id, mode, study_type,
+                                             main_window.study_buffer, StudyModes.session_size)
+        if session is None and main_window.db.count_words(vocab_id):
+            reply = QMessageBox.question(main_window, '提示', '今天的复习已经完成，要自由练习吗？',
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+            session = StudySession.from_database(main_window.db, vocab_id, mode, study_type,
+                                                 main_window.study_buffer, StudyModes.session_size,
+                                                 free_practice=True)
+        if session is None:
             types = []
             if isinstance(study_type, list):
                 types = ['单词' if t == 'word' else '短语' for t in study_type]
@@ -405,42 +186,91 @@ class StudyModes:
             type_str = '或'.join(types)
             QMessageBox.warning(main_window, '错误', f'该单词本中没有{type_str}！')
             return
+        session.key = session_key
+        main_window.study_session = session
+        StudyModes.next_word(main_window)
+
+    @staticmethod
+    def start_review(main_window):
+        """错题复习：用当前学习模式复习所选单词本的错题，答对的错题逐步移出错题本"""
+        vocab_id = getattr(main_window, 'current_vocab_id', None)
+        if not vocab_id:
+            QMessageBox.warning(main_window, '错误', '请先在学习设置中选择单词本！')
+            main_window.switch_page(main_window.settings_page)
+            return
         
-        # 初始化进度跟踪
-        if not hasattr(StudyModes, 'current_word_index') or StudyModes.current_word_index >= StudyModes.total_words:
-            StudyModes.current_word_index = 0
-            StudyModes.total_words = len(words)
-            StudyModes.correct_count = 0
-        
-        # 优化布局清理 - 批量删除
-        items_to_delete = []
-        for i in range(main_window.study_layout.count()):
-            item = main_window.study_layout.itemAt(i)
-            if item and item.widget():
-                items_to_delete.append(item.widget())
-        
-        # 清除布局项
-        for i in reversed(range(main_window.study_layout.count())):
-            main_window.study_layout.takeAt(i)
-        
-        # 批量删除widget
-        for widget in items_to_delete:
-            widget.deleteLater()
-        
-        # 清除进度条缓存
-        if hasattr(main_window, '_cached_progress_bar'):
-            delattr(main_window, '_cached_progress_bar')
+        mode = getattr(main_window, 'study_mode', 'recognize')
+        session_key = (vocab_id, 'wrong_words', mode)
+        session = getattr(main_window, 'study_session', None)
+        if session is None or session.finished or session.key != session_key:
+            # 复习前把缓冲中的错题写入，保证读到最新的错题本
+            main_window.flush_study_buffer()
+            session = StudySession.from_wrong_words(main_window.db, vocab_id, mode,
+                                                    main_window.study_buffer, StudyModes.session_size)
+            if session is None:
+                QMessageBox.information(main_window, '提示', '该单词本的错题本是空的！')
+                return
+            session.key = session_key
+            main_window.study_session = session
+        StudyModes.next_word(main_window)
+
+    @staticmethod
+    def next_word(main_window):
+        """从会话取下一张卡并显示，不访问数据库"""
+        session = getattr(main_window, 'study_session', None)
+        if session is None:
+            StudyModes.start_study(main_window)
+            return
+        card = session.next_card()
+        if card is None:
+            main_window.switch_page(main_window.main_page)
+            return
         
-        main_window.current_word = random.choice(words)
+        # 切换到学习页面
+        main_window.switch_page(main_window.study_page)
         
-        # 使用保存的学习模式
-        mode = getattr(main_window, 'study_mode', 'recognize')
-        if mode == 'recognize':
-            btn_know, btn_unknown, word, meaning = StudyModes.create_recognize_mode(main_window.study_layout, words)
-            btn_know.clicked.connect(lambda: StudyModes.handle_recognize(main_window, True, word, meaning))
-            btn_unknown.clicked.connect(lambda: StudyModes.handle_recognize(main_window, False, word, meaning))
-        elif mode == 'choice':
-            buttons, word, correct_meaning = StudyModes.create_choice_mode(main_window.study_layout, words, main_window=main_window)
-        elif mode == 'spell':
-            spell_input, btn_check, correct_word, correct_meaning = StudyModes.create_spell_mode(main_window.study_layout, words)
-            btn_check.clicked.connect(lambda: StudyModes.check_spelling(main_window, spell_input.text(), correct_word, correct_meaning, words))
+        # 视图只在第一次使用时创建，之后原地更新
+        view = StudyModes._get_view(main_window, session.mode_name)
+        if session.options is not None:
+            view.show_card(card, session.options)
+        else:
+            view.show_card(card)
+        StudyModes._update_progress(main_window, session)
+        session.mark_shown()
+        # 有选项的模式在用户看这张卡时后台准备后面几张，作答后直接显示
+        if session.options is not None:
+            main_window.submit_prefetch(session.prefetch, StudyModes.prefetch_count)
+
+    @staticmethod
+    def _get_view(main_window, mode):
+        """返回学习模式对应的卡片视图，第一次使用时创建并连接信号"""
+        from study_views import RecognizeCardView, ChoiceCardView, SprintCardView, SpellCardView
+        if not hasattr(main_window, 'study_views'):
+            main_window.study_views = {}
+            main_window.study_view_stack = QStackedWidget()
+            main_window.study_layout.addWidget(main_window.study_view_stack)
+        view = main_window.study_views.get(mode)
+        if view is None:
+            # 回答交给 main_window.study_session 的当前卡，信号只连接一次
+            if mode == 'choice':
+                view = ChoiceCardView()
+                view.answered.connect(lambda meaning: StudyModes.handle_choice(main_window, meaning))
+            elif mode == 'sprint':
+                view = SprintCardView()
+                view.answered.connect(lambda meaning: StudyModes.handle_sprint(main_window, meaning))
+            elif mode == 'spell':
+                view = SpellCardView()
+                view.submitted.connect(lambda text: StudyModes.check_spelling(main_window, text))
+            else:
+                view = RecognizeCardView()
+                view.answered.connect(lambda known: StudyModes.handle_recognize(main_window, known))
+            main_window.study_views[mode] = view
+            main_window.study_view_stack.addWidget(view)
+        main_window.study_view_stack.setCurrentWidget(view)
+        return view
+
+    @staticmethod
+    def _update_progress(main_window, session):
+        stack = getattr(main_window, 'study_view_stack', None)
+        if stack is not None:
+            stack.currentWidget().set_progress(session.answered, session.total)
@@ -0,0 +1,260 @@
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+import scheduler
+from distractors import DistractorIndex
+from spelling import SpellingGrader, SpellingResult, default_grader
+from study_deck import SessionDeck
+
+
+class RecognizeMode:
+    """认识模式：回答为 True/False（认识/不认识）"""
+    name = 'recognize'
+
+    def prepare(self, session, card):
+        return None
+
+    def grade(self, card, response) -> bool:
+        return bool(response)
+
+
+class ChoiceMode:
+    """选择模式：回答为选中的释义"""
+    name = 'choice'
+
+    def prepare(self, session, card):
+        return session.distractors.options(card)
+
+    def grade(self, card, response) -> bool:
+        return response == card[1]
+
+
+class SpellMode:
+    """拼写模式：回答为输入的单词，不区分大小写，按单词长度容忍个别拼写错误"""
+    name = 'spell'
+
+    def __init__(self, grader: SpellingGrader = default_grader):
+        self.grader = grader
+
+    def prepare(self, session, card):
+        return None
+
+    def grade(self, card, response) -> SpellingResult:
+        return self.grader.grade(response, card[0])
+
+
+class SprintMode(ChoiceMode):
+    """限时冲刺：与选择模式相同的题目，键盘作答，不等待直接出下一题"""
+    name = 'sprint'
+
+
+STUDY_MODES = {mode.name: mode for mode in (RecognizeMode(), ChoiceMode(), SpellMode(), SprintMode())}
+
+
+class StudySession:
+    """一次学习会话
+
+    持有卡组、调度状态、进度计数、学习模式和写缓冲，不依赖 Qt，
+    多个会话可以在同一进程中并存（多个学习者、并行模拟等）。
+    界面只负责显示 current_card / options，并把用户的回答交给 answer()。
+    prefetch() 可以在后台线程中调用，提前准备接下来几张卡的选项，
+    卡组和预取结果由锁保护。
+    """
+
+    def __init__(self, vocab_id: int, mode: str, rows: List[Tuple], buffer,
+                 rng: Optional[random.Random] = None, key=None,
+                 clock: Optional[Callable[[], datetime]] = None, review_wrong: bool = False):
+        """rows: get_study_cards 返回的 [(单词, 词性释义, due, stability, difficulty, lapses, reps)]
+
+        clock 返回当前 UTC 时间，默认为系统时间，模拟时可以传入虚拟时钟。
+        review_wrong 为 True 时是错题复习：rows 来自错题本，答对的错题会减少错误次数，
+        不更新间隔重复调度状态。
+        """
+        if mode not in STUDY_MODES:
+            raise ValueError(f"未知的学习模式: {mode}")
+        self.vocab_id = vocab_id
+        self.mode = STUDY_MODES[mode]
+        self.buffer = buffer
+        self.key = key
+        self._rng = rng or random.Random()
+        self.clock = clock or scheduler.utc_now
+        self.review_wrong = review_wrong
+        self.deck = SessionDeck([(row[0], row[1]) for row in rows], rng=self._rng, shuffle=False)
+        self.states = {} if review_wrong else {row[0]: scheduler.CardState(*row[2:]) for row in rows}
+        self._distractors = None
+        self.answered = 0
+        self.correct = 0
+        self.options = None
+        self.last_grade = None   # 上一次评分结果，拼写模式为 SpellingResult
+        # 反应时间：卡片显示到作答的单调时钟间隔，不受系统时间调整影响
+        self._shown_at = None
+        self.last_response_ms = None
+        self.response_ms_total = 0
+        self.response_count = 0
+        # 预取：卡的下标 -> 准备好的选项
+        self._lock = threading.Lock()
+        self._prepared: Dict[int, Optional[List[str]]] = {}
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+        # 换题耗时：作答到下一张卡显示完成的间隔
+        self._answered_at = None
+        self.last_transition_ms = None
+        self.transition_ms_total = 0.0
+        self.transition_ms_max = 0.0
+        self.transition_count = 0
+
+    @classmethod
+    def from_database(cls, db, vocab_id: int, mode: str, study_type, buffer,
+                      session_size: int = 100, free_practice: bool = False,
+                      rng: Optional[random.Random] = None,
+                      clock: Optional[Callable[[], datetime]] = None) -> Optional['StudySession']:
+        """读取今天到期的卡建立会话，按调度优先级排列；没有到期卡时返回 None
+
+        free_practice 为 True 时不看到期时间，从整个单词本随机抽取。
+        """
+        if free_practice:
+            rows = db.get_study_cards(vocab_id, study_type, None)
+            rows = (rng or random).sample(rows, min(len(rows), session_size))
+        else:
+            now = clock() if clock else None
+            due_before = scheduler.format_time(now) if now else scheduler.end_of_today()
+            rows = db.get_study_cards(vocab_id, study_type, due_before)
+            rows = scheduler.order_due_cards(rows, session_size, now)
+        if not rows:
+            return None
+        return cls(vocab_id, mode, rows, buffer, rng=rng, clock=clock)
+
+    @classmethod
+    def from_wrong_words(cls, db, vocab_id: int, mode: str, buffer, session_size: int = 100,
+                         rng: Optional[random.Random] = None,
+                         clock: Optional[Callable[[], datetime]] = None) -> Optional['StudySession']:
+        """从错题本建立复习会话，按错误次数、最近答错时间和上次结果排列；错题本为空时返回 None"""
+        rows = db.get_wrong_word_cards(vocab_id)
+        rows = scheduler.order_wrong_words(rows, session_size, clock() if clock else None)
+        if not rows:
+            return None
+        return cls(vocab_id, mode, rows, buffer, rng=rng, clock=clock, review_wrong=True)
+
+    @property
+    def mode_name(self) -> str:
+        return self.mode.name
+
+    @property
+    def distractors(self) -> DistractorIndex:
+        # 只有选择模式需要，第一次用到时建立
+        if self._distractors is None:
+            self._distractors = DistractorIndex(self.deck.cards, self._rng)
+        return self._distractors
+
+    @property
+    def total(self) -> int:
+        return self.deck.total
+
+    @property
+    def finished(self) -> bool:
+        return self.answered >= self.deck.total
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct * 100 / self.answered if self.answered else 0.0
+
+    @property
+    def average_response_ms(self) -> Optional[int]:
+        return self.response_ms_total // self.response_count if self.response_count else None
+
+    @property
+    def average_transition_ms(self) -> Optional[float]:
+        return self.transition_ms_total / self.transition_count if self.transition_count else None
+
+    @property
+    def current_card(self) -> Optional[Tuple[str, str]]:
+        deck = self.deck
+        return deck.cards[deck.current] if deck.current is not None else None
+
+    def next_card(self) -> Optional[Tuple[str, str]]:
+        """取下一张卡；上一张还没回答时（例如中途离开后继续）仍返回那一张和原来的选项
+
+        已经预取过的卡直接使用准备好的选项。
+        """
+        with self._lock:
+            card = self.current_card
+            if card is None:
+                card = self.deck.next_card()
+                if card is None:
+                    self.options = None
+                elif self.deck.current in self._prepared:
+                    self.options = self._prepared.pop(self.deck.current)
+                    self.prefetch_hits += 1
+                else:
+                    self.options = self.mode.prepare(self, card)
+                    self.prefetch_misses += 1
+        self._shown_at = time.monotonic() if card else None
+        return card
+
+    def prefetch(self, count: int = 5) -> int:
+        """为队列中接下来的 count 张卡准备选项（干扰项），返回新准备的张数
+
+        可以在后台线程中调用；答错重新入队的卡取出时已经用掉了预取结果，会重新准备。
+        """
+        prepared = 0
+        with self._lock:
+            for index in self.deck.peek(count):
+                if index not in self._prepared:
+                    self._prepared[index] = self.mode.prepare(self, self.deck.cards[index])
+                    prepared += 1
+        return prepared
+
+    def mark_shown(self):
+        """界面显示完当前卡后调用：从此刻开始计反应时间，并记录上次作答到本卡显示的换题耗时"""
+        now = time.monotonic()
+        if self._answered_at is not None:
+            elapsed = (now - self._answered_at) * 1000
+            self.last_transition_ms = elapsed
+            self.transition_ms_total += elapsed
+            self.transition_ms_max = max(self.transition_ms_max, elapsed)
+            self.transition_count += 1
+            self._answered_at = None
+        self._shown_at = now
+
+    def answer(self, response, response_ms: Optional[int] = None) -> bool:
+        """提交当前卡的回答，更新计数、调度状态并写入缓冲，返回是否正确
+
+        response_ms 为空时按 next_card() 显示卡片到现在的时间计算（模拟时可直接给出）。
+        """
+        card = self.current_card
+        if card is None:
+            raise RuntimeError("没有待回答的卡")
+        self._answered_at = time.monotonic()
+        if response_ms is None and self._shown_at is not None:
+            response_ms = int((self._answered_at - self._shown_at) * 1000)
+        self.last_response_ms = response_ms
+        if response_ms is not None:
+            self.response_ms_total += response_ms
+            self.response_count += 1
+        word, meaning = card
+        self.last_grade = self.mode.grade(card, response)
+        is_correct = bool(self.last_grade)
+        self.answered += 1
+        now = self.clock()
+        timestamp = scheduler.format_time(now)
+        if is_correct:
+            self.correct += 1
+            if self.review_wrong:
+                self.buffer.resolve_wrong_word(self.vocab_id, word)
+        else:
+            self.buffer.add_wrong_word(self.vocab_id, word, meaning, timestamp)
+        self.buffer.record_study(self.vocab_id, word, is_correct, self.mode.name, timestamp, response_ms)
+
+        # 更新间隔重复调度状态，随学习记录一起批量写入
+        state = self.states.get(word)
+        if state is not None:
+            self.states[word] = scheduler.review(state, is_correct, now)
+            self.buffer.update_card_state(self.vocab_id, word, self.states[word])
+        # 答错的卡稍后再练一次，总数随之增加
+        with self._lock:
+            if not is_correct:
+                self.deck.requeue_current()
+            self.deck.finish_current()
+        return is_correct
@@ -0,0 +1,203 @@
+import time
+from typing import List, Tuple
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QProgressBar
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QFont
+from ui_components import AnimatedButton
+
+# 状态标签的几种样式（none / meaning / correct / wrong）在主窗口样式表中按 status 属性定义
+
+
+class CardView(QWidget):
+    """学习卡片视图的基类
+
+    每种学习模式只创建一次视图，换卡时原地更新文字和状态，
+    不再逐卡销毁、重建控件，整个会话中控件数量保持不变。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.card_layout = QVBoxLayout(self)
+        self.card_layout.setContentsMargins(0, 0, 0, 0)
+
+        # 进度指示器
+        progress_layout = QHBoxLayout()
+        self.progress_label = QLabel("学习进度：")
+        self.progress_bar = QProgressBar()
+        progress_layout.addWidget(self.progress_label)
+        progress_layout.addWidget(self.progress_bar)
+        self.card_layout.addLayout(progress_layout)
+
+        self.status_label = QLabel()
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._status_style = None
+        self.last_render_ms = 0.0
+
+    def set_progress(self, value: int, total: int):
+        if self.progress_bar.maximum() != total:
+            self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(value)
+
+    def set_status(self, text: str, style: str = 'none'):
+        self.status_label.setText(text)
+        if style != self._status_style:
+            # 只切换动态属性，重新应用一次样式
+            label = self.status_label
+            label.setProperty('status', style)
+            label.style().unpolish(label)
+            label.style().polish(label)
+            self._status_style = style
+
+    def show_card(self, card: Tuple[str, str], *args):
+        """显示一张新卡，记录本次更新界面的耗时（毫秒）"""
+        start = time.perf_counter()
+        self.set_status('')
+        self._render(card, *args)
+        self.last_render_ms = (time.perf_counter() - start) * 1000
+
+    def _render(self, card, *args):
+        """把卡片内容写入控件，由各模式的视图覆盖；基类只有进度和状态标签，什么也不做
+
+        QWidget 的元类与 abc.ABCMeta 冲突，不能声明为抽象方法。
+        """
+
+
+class RecognizeCardView(CardView):
+    """认识模式：显示单词，作答结果通过 answered(是否认识) 发出"""
+    answered = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.meaning = ''
+
+        self.word_label = QLabel()
+        self.word_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.word_label.setFont(QFont('Arial', 24))
+        self.card_layout.addWidget(self.word_label)
+        self.card_layout.addWidget(self.status_label)
+
+        self.btn_show = AnimatedButton('显示释义')
+        self.btn_show.clicked.connect(lambda: self.set_status(f"释义: {self.meaning}", 'meaning'))
+        self.card_layout.addWidget(self.btn_show)
+
+        button_container = QWidget()
+        button_layout = QHBoxLayout(button_container)
+        self.btn_know = AnimatedButton('认识')
+        self.btn_unknown = AnimatedButton('不认识')
+        self.btn_know.clicked.connect(lambda: self.answered.emit(True))
+        self.btn_unknown.clicked.connect(lambda: self.answered.emit(False))
+        button_layout.addWidget(self.btn_know)
+        button_layout.addWidget(self.btn_unknown)
+        self.card_layout.addWidget(button_container)
+
+    def _render(self, card):
+        word, self.meaning = card
+        self.word_label.setText(word)
+
+
+class ChoiceCardView(CardView):
+    """选择模式：显示单词和若干释义选项，选中的释义通过 answered(释义) 发出
+
+    按钮数固定为 max_options，选项较少时隐藏多余的按钮。
+    点击后到显示下一题之前禁用选项，避免重复作答。
+    """
+    answered = pyqtSignal(str)
+
+    def __init__(self, max_options: int = 4, parent=None):
+        super().__init__(parent)
+        self.options: List[str] = []
+
+        self.word_label = QLabel()
+        self.word_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.word_label.setFont(QFont('Arial', 24))
+        self.card_layout.addWidget(self.word_label)
+        self.card_layout.addWidget(self.status_label)
+
+        self.option_buttons = []
+        for i in range(max_options):
+            btn = AnimatedButton('')
+            btn.clicked.connect(lambda checked=False, i=i: self._on_option(i))
+            self.option_buttons.append(btn)
+            self.card_layout.addWidget(btn)
+
+    def _render(self, card, options: List[str]):
+        self.word_label.setText(card[0])
+        self.options = options
+        for i, btn in enumerate(self.option_buttons):
+            if i < len(options):
+                btn.setText(self._option_text(i, options[i]))
+                btn.setEnabled(True)
+                btn.setVisible(True)
+            else:
+                btn.setVisible(False)
+
+    def _option_text(self, index: int, meaning: str) -> str:
+        return meaning
+
+    def _on_option(self, index: int):
+        for btn in self.option_buttons:
+            btn.setEnabled(False)
+        self.answered.emit(self.options[index])
+
+    def show_result(self, is_correct: bool, word: str, correct_meaning: str):
+        """显示上一题的结果"""
+        if is_correct:
+            self.set_status("✓ 上一题回答正确！", 'correct')
+        else:
+            self.set_status(f"✗ 上一题回答错误！\n{word} 的正确答案是：{correct_meaning}", 'wrong')
+
+
+class SprintCardView(ChoiceCardView):
+    """限时冲刺：选项前标出数字，按 1-4 键直接作答，作答后立即显示下一题"""
+
+    def __init__(self, max_options: int = 4, parent=None):
+        super().__init__(max_options, parent)
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self._number_keys = {getattr(Qt.Key, f'Key_{i + 1}'): i for i in range(max_options)}
+
+    def _render(self, card, options: List[str]):
+        super()._render(card, options)
+        self.setFocus()
+
+    def _option_text(self, index: int, meaning: str) -> str:
+        return f"{index + 1}. {meaning}"
+
+    def keyPressEvent(self, event):
+        index = self._number_keys.get(event.key())
+        if index is not None and index < len(self.options) and self.option_buttons[index].isEnabled():
+            self._on_option(index)
+            return
+        super().keyPressEvent(event)
+
+
+class SpellCardView(CardView):
+    """拼写模式：显示释义，提交的拼写通过 submitted(输入内容) 发出"""
+    submitted = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.meaning_label = QLabel()
+        self.meaning_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.meaning_label.setFont(QFont('Arial', 18))
+        self.card_layout.addWidget(self.meaning_label)
+
+        self.spell_input = QLineEdit()
+        self.spell_input.setPlaceholderText('请输入单词')
+        self.spell_input.returnPressed.connect(self._submit)
+        self.card_layout.addWidget(self.spell_input)
+
+        self.btn_check = AnimatedButton('检查答案')
+        self.btn_check.clicked.connect(self._submit)
+        self.card_layout.addWidget(self.btn_check)
+        # 拼写反馈用富文本标出错误的字母
+        self.status_label.setTextFormat(Qt.TextFormat.RichText)
+        self.card_layout.addWidget(self.status_label)
+
+    def _render(self, card):
+        _, meaning = card
+        self.meaning_label.setText(meaning)
+        self.spell_input.clear()
+        self.spell_input.setFocus()
+
+    def _submit(self):
+        self.submitted.emit(self.spell_input.text())
@@ -2,6 +2,7 @@
 from PyQt6.QtCore import QObject, pyqtSignal
 from PyQt6.QtWidgets import QApplication
 from enum import Enum
+from string import Template
 
 class Theme(Enum):
     LIGHT = "light"
@@ -9,12 +10,179 @@ class Theme(Enum):
     BLUE = "blue"
     GREEN = "green"
 
+# 主窗口的样式表模板，$名称 为主题颜色；每个主题只替换一次，结果缓存
+# 主题按钮（AnimatedButton）用动态属性 themed 选择，学习卡片的状态标签用 status 属性切换样式
+STYLESHEET_TEMPLATE = Template("""
+QMainWindow {
+    background-color: ${background};
+    color: ${text};
+}
+QLabel {
+    color: ${text};
+    font-size: 14px;
+}
+QLineEdit, QTextEdit {
+    background-color: ${button};
+    color: ${text};
+    border: 1px solid ${border};
+    padding: 5px;
+    border-radius: 4px;
+}
+QLineEdit:focus, QTextEdit:focus {
+    border: 2px solid ${accent};
+}
+QListView {
+    background-color: ${list_bg};
+    color: ${list_text};
+    border: 1px solid ${border};
+    border-radius: 4px;
+    padding: 5px;
+}
+QListView::item {
+    padding: 5px;
+    border-bottom: 1px solid ${border};
+}
+QListView::item:selected {
+    background-color: ${list_selected};
+    color: ${text};
+}
+QComboBox {
+    background-color: ${combo_bg};
+    color: ${combo_text};
+    border: 1px solid ${border};
+    padding: 5px;
+    border-radius: 4px;
+}
+QComboBox::drop-down {
+    border: none;
+    width: 20px;
+}
+QComboBox::down-arrow {
+    image: none;
+    border-left: 5px solid transparent;
+    border-right: 5px solid transparent;
+    border-top: 5px solid ${combo_text};
+}
+QComboBox QAbstractItemView {
+    background-color: ${combo_bg};
+    color: ${combo_text};
+    selection-background-color: ${list_selected};
+    padding: 0px;
+    border-radius: 0px;
+}
+QComboBox QAbstractItemView::item {
+    padding: 0px;
+    border-bottom: none;
+}
+QRadioButton {
+    color: ${radio_text};
+    spacing: 8px;
+}
+QRadioButton::indicator {
+    width: 16px;
+    height: 16px;
+    border: 2px solid ${border};
+    border-radius: 8px;
+    background-color: ${button};
+}
+QRadioButton::indicator:checked {
+    background-color: ${radio_indicator};
+    border-color: ${radio_indicator};
+}
+QRadioButton::indicator:hover {
+    border-color: ${accent};
+}
+QCheckBox {
+    color: ${text};
+    spacing: 8px;
+    font-weight: 500;
+    background-color: transparent;
+}
+QCheckBox::indicator {
+    width: 16px;
+    height: 16px;
+    border: 2px solid ${border};
+    border-radius: 4px;
+    background-color: ${button};
+}
+QCheckBox::indicator:checked {
+    background-color: ${accent};
+    border-color: ${accent};
+}
+QCheckBox::indicator:hover {
+    border-color: ${accent};
+}
+QCheckBox:disabled {
+    color: ${text_secondary};
+}
+QCheckBox::indicator:disabled {
+    background-color: ${border_light};
+    border-color: ${border};
+}
+QProgressBar {
+    border: 1px solid ${border};
+    border-radius: 4px;
+    text-align: center;
+    color: ${text};
+}
+QProgressBar::chunk {
+    background-color: ${accent};
+    border-radius: 3px;
+}
+QPushButton[themed="true"] {
+    background-color: ${button};
+    color: ${text};
+    border: 1px solid ${border};
+    padding: 10px 20px;
+    border-radius: 6px;
+    font-weight: 500;
+    font-size: 14px;
+    min-width: 100px;
+}
+QPushButton[themed="true"]:hover {
+    background-color: ${button_hover};
+    border: 2px solid ${accent};
+    padding: 9px 19px;
+}
+QPushButton[themed="true"]:pressed {
+    background-color: ${accent};
+    color: ${text};
+    border: 2px solid ${accent};
+}
+QPushButton[themed="true"]:disabled {
+    background-color: ${border_light};
+    color: ${text_secondary};
+    border: 1px solid ${border};
+}
+QLabel[status="none"] {
+    color: green;
+    font-size: 16px;
+}
+QLabel[status="meaning"] {
+    color: #2196F3;
+    font-size: 16px;
+    padding: 10px;
+    background-color: #E3F2FD;
+    border-radius: 4px;
+}
+QLabel[status="correct"] {
+    color: #4CAF50;
+    font-size: 16px;
+    font-weight: bold;
+}
+QLabel[status="wrong"] {
+    color: #F44336;
+    font-size: 16px;
+}
+""")
+
 class ThemeManager(QObject):
     theme_changed = pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
         self._current_theme = Theme.LIGHT
+        self._stylesheets = {}
         self._themes = {
             Theme.LIGHT: {
                 'background': '#fafafa',      # 柔和的浅灰背景
@@ -137,5 +305,13 @@ class ThemeManager(QObject):
         self._current_theme = theme
         self.theme_changed.emit(theme.value)
     
+    def stylesheet(self, theme: Theme = None) -> str:
+        """主题对应的完整样式表，第一次使用时生成"""
+        theme = theme or self._current_theme
+        qss = self._stylesheets.get(theme)
+        if qss is None:
+            qss = self._stylesheets[theme] = STYLESHEET_TEMPLATE.substitute(self._themes[theme])
+        return qss
+    
     def get_style(self, element: str):
         return self._themes[self._current_theme].get(element, '')
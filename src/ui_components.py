@@ -2,7 +2,7 @@ from PyQt6.QtWidgets import (
     QPushButton, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QLineEdit, QTextEdit, QListWidget, QComboBox, QRadioButton,
     QButtonGroup, QStackedWidget, QFrame, QInputDialog, QDialog,
-    QCheckBox, QProgressBar, QScrollArea
+    QCheckBox, QProgressBar, QScrollArea, QListView
 )
 from PyQt6.QtCore import QPropertyAnimation, QEasingCurve, pyqtProperty, QRect, Qt, QParallelAnimationGroup, QSequentialAnimationGroup
 from PyQt6.QtGui import QColor, QCursor, QFont, QPainter, QLinearGradient
@@ -17,36 +17,12 @@ class AnimatedButton(QPushButton):
         self.animation.setDuration(200)
         self.animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
         self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        # 主窗口样式表用这个动态属性选择主题按钮
+        self.setProperty('themed', True)
 
     def setup_theme_style(self, theme_colors):
+        # 按钮样式来自主窗口样式表（themed 属性），这里只记录动画的颜色
         self._color = QColor(theme_colors['accent'])
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {theme_colors['button']};
-                color: {theme_colors['text']};
-                border: 1px solid {theme_colors['border']};
-                padding: 10px 20px;
-                border-radius: 6px;
-                font-weight: 500;
-                font-size: 14px;
-                min-width: 100px;
-            }}
-            QPushButton:hover {{
-                background-color: {theme_colors['button_hover']};
-                border: 2px solid {theme_colors['accent']};
-                padding: 9px 19px;
-            }}
-            QPushButton:pressed {{
-                background-color: {theme_colors['accent']};
-                color: {theme_colors['text']};
-                border: 2px solid {theme_colors['accent']};
-            }}
-            QPushButton:disabled {{
-                background-color: {theme_colors['border_light']};
-                color: {theme_colors['text_secondary']};
-                border: 1px solid {theme_colors['border']};
-            }}
-        """)
 
     @pyqtProperty(QColor)
     def color(self):
@@ -331,7 +307,13 @@ class UICreator:
         search_layout.addWidget(btn_search)
         right_layout.addLayout(search_layout)
         
-        main_window.words_list = QListWidget()
+        # 单词列表使用虚拟化模型，按需分页读取；模型类在页面第一次创建时才导入
+        from word_list_model import WordListModel
+        main_window.words_model = WordListModel(main_window.db, parent=main_window)
+        main_window.words_list = QListView()
+        main_window.words_list.setModel(main_window.words_model)
+        main_window.words_list.setUniformItemSizes(True)
+        main_window.words_list.setLayoutMode(QListView.LayoutMode.Batched)
         right_layout.addWidget(main_window.words_list)
         
         # 单词操作按钮
@@ -340,7 +322,8 @@ class UICreator:
             ('添加单词', lambda: main_window.switch_page(main_window.add_word_page)),
             ('修改单词', main_window.edit_word),
             ('删除单词', main_window.delete_word),
-            ('导出单词本', lambda: main_window.export_vocabulary())
+            ('导出单词本', lambda: main_window.export_vocabulary()),
+            ('导入单词本', lambda: main_window.import_vocabulary())
         ]
         
         for text, callback in button_configs:
@@ -518,7 +501,8 @@ class UICreator:
         mode_buttons = {
             'recognize': QRadioButton('认识/不认识'),
             'choice': QRadioButton('选择释义'),
-            'spell': QRadioButton('拼写单词')
+            'spell': QRadioButton('拼写单词'),
+            'sprint': QRadioButton('限时冲刺（按 1-4 键作答）')
         }
         
         vocab_layout.addWidget(QLabel('学习模式：'))
@@ -552,7 +536,22 @@ class UICreator:
                                            lambda: StudyModes.save_settings(main_window), 
                                            theme_colors)
         layout.addWidget(btn_save)
-        
+
+        # 数据备份部分
+        backup_container, backup_layout = UICreator._create_section_container('数据备份')
+        main_window.backup_status_label = QLabel()
+        backup_layout.addWidget(main_window.backup_status_label)
+        main_window.backup_progress = QProgressBar()
+        main_window.backup_progress.setRange(0, 100)
+        main_window.backup_progress.hide()
+        backup_layout.addWidget(main_window.backup_progress)
+
+        backup_buttons = QHBoxLayout()
+        backup_buttons.addWidget(UICreator._create_button(main_window, '立即备份', main_window.backup_now, theme_colors))
+        backup_buttons.addWidget(UICreator._create_button(main_window, '从备份恢复', main_window.restore_backup, theme_colors))
+        backup_layout.addLayout(backup_buttons)
+        layout.addWidget(backup_container)
+
         # 添加弹性空间
         layout.addStretch()
 
@@ -601,6 +600,7 @@ class UICreator:
     def create_wrong_words_page(main_window):
         """创建错题本页面"""
         button_configs = [
+            ('复习错题', lambda: StudyModes.start_review(main_window)),
             ('清除错题', main_window.clear_wrong_word),
             ('清空错题本', main_window.clear_all_wrong_words)
         ]
@@ -622,160 +622,9 @@ class UICreator:
 
     @staticmethod
     def apply_theme_to_window(main_window, theme_name):
-        """应用主题到主窗口"""
-        from theme_manager import Theme
-        theme_colors = main_window.theme_manager._themes[Theme(theme_name)]
-        
-        # 设置主窗口样式
-        main_window.setStyleSheet(f"""
-            QMainWindow {{
-                background-color: {theme_colors['background']};
-                color: {theme_colors['text']};
-            }}
-            QLabel {{
-                color: {theme_colors['text']};
-                font-size: 14px;
-            }}
-            QLineEdit, QTextEdit {{
-                background-color: {theme_colors['button']};
-                color: {theme_colors['text']};
-                border: 1px solid {theme_colors['border']};
-                padding: 5px;
-                border-radius: 4px;
-            }}
-            QLineEdit:focus, QTextEdit:focus {{
-                border: 2px solid {theme_colors['accent']};
-            }}
-            QListWidget {{
-                background-color: {theme_colors['list_bg']};
-                color: {theme_colors['list_text']};
-                border: 1px solid {theme_colors['border']};
-                border-radius: 4px;
-                padding: 5px;
-            }}
-            QListWidget::item {{
-                padding: 5px;
-                border-bottom: 1px solid {theme_colors['border']};
-            }}
-            QListWidget::item:selected {{
-                background-color: {theme_colors['list_selected']};
-                color: {theme_colors['text']};
-            }}
-            QComboBox {{
-                background-color: {theme_colors['combo_bg']};
-                color: {theme_colors['combo_text']};
-                border: 1px solid {theme_colors['border']};
-                padding: 5px;
-                border-radius: 4px;
-            }}
-            QComboBox::drop-down {{
-                border: none;
-                width: 20px;
-            }}
-            QComboBox::down-arrow {{
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid {theme_colors['combo_text']};
-            }}
-            QComboBox QAbstractItemView {{
-                background-color: {theme_colors['combo_bg']};
-                color: {theme_colors['combo_text']};
-                selection-background-color: {theme_colors['list_selected']};
-            }}
-            QRadioButton {{
-                color: {theme_colors['radio_text']};
-                spacing: 8px;
-            }}
-            QRadioButton::indicator {{
-                width: 16px;
-                height: 16px;
-                border: 2px solid {theme_colors['border']};
-                border-radius: 8px;
-                background-color: {theme_colors['button']};
-            }}
-            QRadioButton::indicator:checked {{
-                background-color: {theme_colors['radio_indicator']};
-                border-color: {theme_colors['radio_indicator']};
-            }}
-            QRadioButton::indicator:hover {{
-                border-color: {theme_colors['accent']};
-            }}
-            QCheckBox {{
-                color: {theme_colors['text']};
-                spacing: 8px;
-                font-weight: 500;
-                background-color: transparent;
-            }}
-            QCheckBox::indicator {{
-                width: 16px;
-                height: 16px;
-                border: 2px solid {theme_colors['border']};
-                border-radius: 4px;
-                background-color: {theme_colors['button']};
-            }}
-            QCheckBox::indicator:checked {{
-                background-color: {theme_colors['accent']};
-                border-color: {theme_colors['accent']};
-            }}
-            QCheckBox::indicator:hover {{
-                border-color: {theme_colors['accent']};
-            }}
-            QCheckBox:disabled {{
-                color: {theme_colors['text_secondary']};
-            }}
-            QCheckBox::indicator:disabled {{
-                background-color: {theme_colors['border_light']};
-                border-color: {theme_colors['border']};
-            }}
-            QProgressBar {{
-                border: 1px solid {theme_colors['border']};
-                border-radius: 4px;
-                text-align: center;
-                color: {theme_colors['text']};
-            }}
-            QProgressBar::chunk {{
-                background-color: {theme_colors['accent']};
-                border-radius: 3px;
-            }}
-        """)
-        
-        # 更新所有子窗口部件
-        UICreator._update_children_theme(main_window.centralWidget(), theme_colors)
+        """应用主题：在主窗口上设置一次样式表，各主题的样式表生成后缓存
 
-    @staticmethod
-    def _update_children_theme(widget, theme_colors):
-        """优化主题更新性能 - 预编译样式表"""
-        # 预编译样式表，避免重复字符串格式化
-        button_style = f"""
-            QPushButton {{
-                background-color: {theme_colors['button']};
-                color: {theme_colors['text']};
-                border: 1px solid {theme_colors['border']};
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: 500;
-            }}
-            QPushButton:hover {{
-                background-color: {theme_colors['button_hover']};
-                border: 1px solid {theme_colors['accent']};
-            }}
-            QPushButton:pressed {{
-                background-color: {theme_colors['accent']};
-                color: {theme_colors['text']};
-            }}
-            QPushButton:disabled {{
-                background-color: {theme_colors['border']};
-                color: {theme_colors['secondary']};
-            }}
+        页面和对话框都是主窗口的子控件，由主窗口的样式表覆盖；控件不再各自设置样式表，
+        切换主题时也不需要遍历控件树。
         """
-        
-        # 使用广度优先搜索，避免递归深度过大
-        widgets_to_process = [widget]
-        while widgets_to_process:
-            current_widget = widgets_to_process.pop(0)
-            
-            for child in current_widget.children():
-                if isinstance(child, AnimatedButton):
-                    child.setStyleSheet(button_style)
-                widgets_to_process.append(child)
+        main_window.setStyleSheet(main_window.theme_manager.stylesheet(Theme(theme_name)))
@@ -1,19 +1,24 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QTextEdit, 
     QMessageBox, QInputDialog, QDialog, QStackedWidget, QFileDialog, 
-    QComboBox, QListWidget, QRadioButton, QScrollArea
+    QComboBox, QListWidget, QRadioButton, QScrollArea, QProgressDialog
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from ui_components import AnimatedButton, UICreator
 from theme_manager import Theme
+from db_backup import BACKUP_INTERVAL_HOURS
 
 class UIController:
     """UI控制器，负责处理UI事件和业务逻辑"""
     
     @staticmethod
     def create_stacked_widget(main_window):
-        """创建堆叠窗口部件"""
+        """创建堆叠窗口部件
+
+        启动时只创建首页，其他页面先以空白部件占位，第一次切换到该页面时才创建内容，
+        需要的单词本列表也在那时读取。
+        """
         main_window.stack = QStackedWidget()
         
         # 创建各个页面
@@ -32,26 +37,58 @@ class UIController:
         main_window.stack.addWidget(main_window.stats_page)
         main_window.stack.addWidget(main_window.wrong_words_page)
         
-        # 初始化各个页面
+        # 首页立即创建，其他页面登记创建函数和页面上需要填充的单词本列表
         UICreator.create_main_page(main_window)
-        UICreator.create_vocabulary_page(main_window)
-        UICreator.create_add_word_page(main_window)
-        UICreator.create_study_page(main_window)
-        UICreator.create_settings_page(main_window)
-        UICreator.create_stats_page(main_window)
-        UICreator.create_wrong_words_page(main_window)
+        main_window.page_builders = {
+            main_window.vocabulary_page: (UICreator.create_vocabulary_page, 'vocab_list'),
+            main_window.add_word_page: (UICreator.create_add_word_page, 'vocab_combo'),
+            main_window.study_page: (UICreator.create_study_page, None),
+            main_window.settings_page: (UICreator.create_settings_page, 'settings_vocab_combo'),
+            main_window.stats_page: (UICreator.create_stats_page, None),
+            main_window.wrong_words_page: (UICreator.create_wrong_words_page, None),
+        }
         
         return main_window.stack
     
+    @staticmethod
+    def ensure_page(main_window, page):
+        """页面第一次显示前创建其内容，并填充页面上的单词本列表"""
+        builder = main_window.page_builders.pop(page, None)
+        if builder is None:
+            return
+        create_page, vocab_widget = builder
+        create_page(main_window)
+        if vocab_widget:
+            UIController.refresh_vocabularies(main_window, [getattr(main_window, vocab_widget)])
+    
+    @staticmethod
+    def refresh_vocabularies(main_window, widgets=None):
+        """用一次查询刷新单词本列表和下拉框，未创建的页面跳过"""
+        if widgets is None:
+            widgets = [getattr(main_window, name) for name in ('vocab_list', 'vocab_combo', 'settings_vocab_combo')
+                       if hasattr(main_window, name)]
+        vocabularies = main_window.db.get_vocabularies()
+        for widget in widgets:
+            if isinstance(widget, QListWidget):
+                main_window.db.update_vocab_list(widget, vocabularies)
+            else:
+                main_window.db.update_vocab_combo(widget, vocabularies)
+    
     @staticmethod
     def switch_page(main_window, page):
         """切换页面"""
         if page in [main_window.main_page, main_window.vocabulary_page, main_window.add_word_page, 
                     main_window.study_page, main_window.settings_page, main_window.stats_page, main_window.wrong_words_page]:
+            UIController.ensure_page(main_window, page)
+            # 离开学习页面前把缓冲的学习记录写入数据库，统计和错题本才能看到
+            if page != main_window.study_page:
+                main_window.flush_study_buffer()
             if page == main_window.stats_page:
                 UIController.update_stats(main_window)
             elif page == main_window.wrong_words_page:
                 UIController.update_wrong_words(main_window)
+            elif page == main_window.settings_page:
+                UIController.update_backup_status(main_window)
             main_window.stack.setCurrentWidget(page)
     
     @staticmethod
@@ -60,32 +97,41 @@ class UIController:
         vocab_id = int(item.text().split('(ID: ')[1].rstrip(')'))
         main_window.current_vocabulary = vocab_id
         main_window.words_title.setText(f'单词本: {item.text().split(" (ID:")[0]}')
-        main_window.db.update_words_list(main_window.words_list, main_window.current_vocabulary)
+        UIController.refresh_words_list(main_window, main_window.current_vocabulary)
+    
+    @staticmethod
+    def refresh_words_list(main_window, vocab_id):
+        """在数据库线程中统计单词数，之后由模型按需分页读取"""
+        if not vocab_id:
+            main_window.words_model.clear()
+            return
+        main_window.db_worker.submit('count_words', vocab_id).then(
+            lambda total: main_window.words_model.set_vocabulary(vocab_id, total))
+    
+    @staticmethod
+    def _selected_word(main_window):
+        """当前选中的单词及其类型"""
+        index = main_window.words_list.currentIndex()
+        if not index.isValid():
+            return None, None
+        model = main_window.words_model
+        return index.data(model.WordRole), index.data(model.TypeRole)
     
     @staticmethod
     def edit_word(main_window):
         """编辑单词"""
-        current_item = main_window.words_list.currentItem()
-        if not current_item or not main_window.current_vocabulary:
+        word, word_type = UIController._selected_word(main_window)
+        if not word or not main_window.current_vocabulary:
             QMessageBox.warning(main_window, '提示', '请先选择要修改的单词！')
             return
-            
-        # 从带序号的文本中提取原始单词
-        text = current_item.text().split(": ", 1)[0]
-        word = text.split(". ", 1)[1] if ". " in text else text
         
         # 获取该单词的所有词性和释义
         pos_meanings = main_window.db.get_word_pos_meanings(word, main_window.current_vocabulary)
         
-        # 获取单词类型
-        word_type = 'word'  # 默认类型
-        if pos_meanings:
-            # 从数据库中获取单词类型
-            main_window.db.cursor.execute('SELECT DISTINCT type FROM word_pos_meanings WHERE word = ? AND vocabulary_id = ?', 
-                                (word, main_window.current_vocabulary))
-            result = main_window.db.cursor.fetchone()
-            if result:
-                word_type = result[0]
+        # 获取单词类型（搜索结果中没有类型时从数据库读取）
+        if not word_type and pos_meanings:
+            word_type = main_window.db.get_word_type(word, main_window.current_vocabulary)
+        word_type = word_type or 'word'
         
         dialog = QDialog(main_window)
         dialog.setWindowTitle('修改单词')
@@ -193,13 +239,12 @@ class UIController:
                             new_pos_meanings.append((pos, meaning))
             
             if new_word and new_pos_meanings:
-                # 先删除原有的词性释义
-                main_window.db.delete_word(word, main_window.current_vocabulary)
-                # 添加新的词性释义（包含类型信息）
-                success, message = main_window.db.add_word_with_pos_meanings_and_type(new_word, new_pos_meanings, word_type, main_window.current_vocabulary)
+                # 原地修改，学习记录、错题和复习进度保留
+                success, message = main_window.db.update_word(word, main_window.current_vocabulary, new_word,
+                                                              new_pos_meanings, word_type)
                 
                 if success:
-                    main_window.db.update_words_list(main_window.words_list, main_window.current_vocabulary)
+                    UIController.refresh_words_list(main_window, main_window.current_vocabulary)
                     main_window.statusBar().showMessage('单词修改成功！', 2000)
                     dialog.accept()
                 else:
@@ -218,28 +263,40 @@ class UIController:
         """搜索单词"""
         search_text = main_window.search_input.text().strip().lower()
         if not search_text:
-            main_window.db.update_words_list(main_window.words_list, main_window.current_vocabulary)
+            UIController.refresh_words_list(main_window, main_window.current_vocabulary)
             return
             
+        # "..." 按短语搜索，末尾带 * 按单词前缀搜索
+        mode = 'terms'
+        if len(search_text) > 2 and search_text.startswith('"') and search_text.endswith('"'):
+            mode, search_text = 'phrase', search_text[1:-1]
+        elif search_text.endswith('*'):
+            mode, search_text = 'prefix', search_text.rstrip('*')
+        
         if not main_window.current_vocabulary:
-            QMessageBox.warning(main_window, '提示', '请先选择单词本！')
+            # 未选择单词本时跨所有单词本搜索，只显示结果
+            def show_all(result):
+                names, words = result
+                main_window.words_title.setText(f'全部单词本中搜索: {search_text}')
+                main_window.words_model.set_rows([
+                    (word, f"[{names.get(vocab_id, vocab_id)}] {meaning}", None, None)
+                    for vocab_id, word, meaning, _ in words])
+            main_window.db_worker.submit(
+                lambda db: (dict(db.get_vocabularies()), db.search_words_ranked(search_text, None, mode))
+            ).then(show_all)
             return
             
-        words = main_window.db.search_words(main_window.current_vocabulary, search_text)
-        main_window.words_list.clear()
-        for word, meaning in words:
-            main_window.words_list.addItem(f"{word}: {meaning}")
+        main_window.db_worker.submit('search_words_ranked', search_text, main_window.current_vocabulary, mode).then(
+            lambda words: main_window.words_model.set_rows(
+                [(word, meaning, None, None) for _, word, meaning, _ in words]))
     
     @staticmethod
     def delete_word(main_window):
         """删除单词"""
-        current_item = main_window.words_list.currentItem()
-        if current_item and main_window.current_vocabulary:
-            # 从带序号的文本中提取原始单词
-            text = current_item.text().split(": ", 1)[0]
-            word = text.split(". ", 1)[1] if ". " in text else text
+        word, _ = UIController._selected_word(main_window)
+        if word and main_window.current_vocabulary:
             main_window.db.delete_word(word, main_window.current_vocabulary)
-            main_window.db.update_words_list(main_window.words_list, main_window.current_vocabulary)
+            UIController.refresh_words_list(main_window, main_window.current_vocabulary)
     
     @staticmethod
     def add_vocabulary(main_window):
@@ -248,9 +305,7 @@ class UIController:
         if ok and name:
             success, message = main_window.db.add_vocabulary(name)
             if success:
-                main_window.db.update_vocab_list(main_window.vocab_list)
-                main_window.db.update_vocab_combo(main_window.vocab_combo)
-                main_window.db.update_vocab_combo(main_window.settings_vocab_combo)
+                UIController.refresh_vocabularies(main_window)
                 QMessageBox.information(main_window, '成功', message)
             else:
                 QMessageBox.warning(main_window, '错误', message)
@@ -269,12 +324,97 @@ class UIController:
         )
         
         if file_path:
-            success, message = main_window.db.export_vocabulary(main_window.current_vocabulary, file_path)
+            def on_exported(result):
+                success, message = result
+                if success:
+                    QMessageBox.information(main_window, '成功', message)
+                else:
+                    QMessageBox.warning(main_window, '错误', message)
+            main_window.db_worker.submit('export_vocabulary', main_window.current_vocabulary, file_path).then(on_exported)
+    
+    @staticmethod
+    def import_vocabulary(main_window):
+        """导入单词本"""
+        if not main_window.current_vocabulary:
+            QMessageBox.warning(main_window, '提示', '请先选择要导入到的单词本！')
+            return
+        
+        file_path, _ = QFileDialog.getOpenFileName(
+            main_window, '导入单词本', '',
+            '单词表 (*.csv *.tsv *.txt)'
+        )
+        if not file_path:
+            return
+        
+        policies = {'跳过已有单词': 'skip', '合并词性释义': 'merge', '覆盖已有单词': 'overwrite'}
+        policy_name, ok = QInputDialog.getItem(main_window, '导入单词本', '遇到已存在的单词时：',
+                                               list(policies), 0, False)
+        if not ok:
+            return
+        
+        # 导入在数据库线程的一个写事务中进行；先写入缓冲的学习记录，对话框是模态的，导入期间不会产生新记录
+        main_window.flush_study_buffer()
+        vocab_id = main_window.current_vocabulary
+        progress = QProgressDialog('正在导入...', '取消', 0, 100, main_window)
+        progress.setWindowTitle('导入单词本')
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        
+        def on_progress(rows, percent):
+            if not progress.wasCanceled():
+                progress.setLabelText(f'正在导入... 已处理 {rows} 行')
+                progress.setValue(percent)
+        
+        def on_done(result):
+            progress.close()
+            success, message = result
             if success:
+                UIController.refresh_words_list(main_window, vocab_id)
                 QMessageBox.information(main_window, '成功', message)
             else:
                 QMessageBox.warning(main_window, '错误', message)
+        
+        def on_error(error):
+            progress.close()
+            QMessageBox.warning(main_window, '错误', f'导入失败：{str(error)}')
+        
+        task = main_window.db_worker.submit_cancellable(
+            lambda db, task: db.import_vocabulary(vocab_id, file_path, policies[policy_name],
+                                                  task.report, task.is_cancelled))
+        task.on_progress(on_progress).then(on_done, on_error)
+        progress.canceled.connect(task.cancel)
     
+    @staticmethod
+    def compact_database(main_window):
+        """旧版本数据库的一次性整理，在数据库线程中执行，模态进度对话框可以取消"""
+        # 整理期间持有写锁，先写入缓冲的学习记录；对话框是模态的，整理期间不会产生新记录
+        main_window.flush_study_buffer()
+        progress = QProgressDialog('正在整理数据库，只需要执行一次...', '取消', 0, 100, main_window)
+        progress.setWindowTitle('整理数据库')
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+
+        def on_progress(percent):
+            if not progress.wasCanceled():
+                progress.setValue(percent)
+
+        def on_done(result):
+            progress.close()
+            success, message = result
+            main_window.statusBar().showMessage(message, 5000)
+
+        def on_error(error):
+            progress.close()
+            main_window.statusBar().showMessage(f'整理数据库失败：{str(error)}', 5000)
+
+        task = main_window.db_worker.submit_cancellable(lambda db, task: db.compact(task.report, task.is_cancelled))
+        task.on_progress(on_progress).then(on_done, on_error)
+        progress.canceled.connect(task.cancel)
+
     @staticmethod
     def delete_vocabulary(main_window):
         """删除单词本"""
@@ -285,9 +425,7 @@ class UIController:
                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             if reply == QMessageBox.StandardButton.Yes:
                 main_window.db.delete_vocabulary(vocab_id)
-                main_window.db.update_vocab_list(main_window.vocab_list)
-                main_window.db.update_vocab_combo(main_window.vocab_combo)
-                main_window.db.update_vocab_combo(main_window.settings_vocab_combo)
+                UIController.refresh_vocabularies(main_window)
     
     @staticmethod
     def add_word(main_window):
@@ -330,44 +468,51 @@ class UIController:
             # 添加一个默认的空词性释义对
             UICreator.add_pos_meaning_pair(main_window)
             main_window.statusBar().showMessage(message, 2000)
-            main_window.db.update_words_list(main_window.words_list, vocab_id)
+            UIController.refresh_words_list(main_window, vocab_id)
         else:
             main_window.statusBar().showMessage(message, 2000)
     
     @staticmethod
     def update_stats(main_window):
         """更新统计信息"""
-        main_window.stats_list.clear()
-        stats = main_window.db.get_daily_stats(main_window.current_vocab_id)
-        for date, total, correct, accuracy in stats:
-            main_window.stats_list.addItem(f"{date}: 学习 {total} 个单词，正确率 {accuracy}%")
+        UIController.update_stats_display(main_window)
     
     @staticmethod
     def update_wrong_words(main_window):
-        """更新错题本"""
-        main_window.wrong_words_list.clear()
-        wrong_words = main_window.db.get_wrong_words()
-        for word, meaning, count in wrong_words:
-            main_window.wrong_words_list.addItem(f"{word}: {meaning} (错误次数: {count})")
+        """更新错题本，只显示学习设置中所选单词本的错题"""
+        def fill(wrong_words):
+            main_window.wrong_words_list.clear()
+            main_window.wrong_words_list.addItems([
+                f"{word}: {meaning} (错误次数: {count})" for word, meaning, count in wrong_words])
+        main_window.db_worker.submit('get_wrong_words', main_window.current_vocab_id).then(fill)
     
     @staticmethod
     def update_stats_display(main_window):
         """更新统计显示"""
-        main_window.stats_list.clear()
         stats_type = main_window.stats_type_combo.currentText()
+        vocab_id = main_window.current_vocab_id
         
+        # 没有记录反应时间的旧数据不显示平均用时
+        latency = lambda avg_ms: f"，平均用时 {avg_ms / 1000:.1f} 秒" if avg_ms is not None else ""
         if stats_type == '每日统计':
-            stats = main_window.db.get_daily_stats(main_window.current_vocab_id)
-            for date, total, correct, accuracy in stats:
-                main_window.stats_list.addItem(f"{date}: 学习 {total} 个单词，正确率 {accuracy}%")
+            task = main_window.db_worker.submit('get_daily_stats', vocab_id)
+            fmt = lambda date, total, correct, accuracy, avg_ms: f"{date}: 学习 {total} 个单词，正确率 {accuracy}%{latency(avg_ms)}"
         elif stats_type == '每周统计':
-            stats = main_window.db.get_weekly_stats(main_window.current_vocab_id)
-            for week, total, correct, accuracy in stats:
-                main_window.stats_list.addItem(f"第{week}周: 学习 {total} 个单词，正确率 {accuracy}%")
+            task = main_window.db_worker.submit('get_weekly_stats', vocab_id)
+            fmt = lambda week, total, correct, accuracy, avg_ms: f"第{week}周: 学习 {total} 个单词，正确率 {accuracy}%{latency(avg_ms)}"
         elif stats_type == '详细统计':
-            stats = main_window.db.get_detailed_stats(main_window.current_vocab_id)
-            for date, mode, total, correct, accuracy in stats:
-                main_window.stats_list.addItem(f"{date} [{mode}]: 学习 {total} 个单词，正确率 {accuracy}%")
+            task = main_window.db_worker.submit('get_detailed_stats', vocab_id)
+            fmt = lambda date, mode, total, correct, accuracy, avg_ms: f"{date} [{mode}]: 学习 {total} 个单词，正确率 {accuracy}%{latency(avg_ms)}"
+        else:
+            return
+        
+        def fill(stats):
+            # 结果返回前用户可能又切换了统计类型，只显示最新的一次
+            if main_window.stats_type_combo.currentText() != stats_type:
+                return
+            main_window.stats_list.clear()
+            main_window.stats_list.addItems([fmt(*row) for row in stats])
+        task.then(fill)
     
     @staticmethod
     def clear_wrong_word(main_window):
@@ -375,17 +520,92 @@ class UIController:
         current_item = main_window.wrong_words_list.currentItem()
         if current_item:
             word = current_item.text().split(":")[0]
-            main_window.db.remove_wrong_word(word)
+            main_window.db.remove_wrong_word(word, main_window.current_vocab_id)
             UIController.update_wrong_words(main_window)
             main_window.statusBar().showMessage('错题已清除', 2000)
     
     @staticmethod
     def clear_all_wrong_words(main_window):
-        """清空错题本"""
-        reply = QMessageBox.question(main_window, '确认', '确定要清空所有错题吗？',
+        """清空错题本，与列表一致只清空学习设置中所选单词本的错题"""
+        vocab_id = main_window.current_vocab_id
+        names = dict(main_window.db.get_vocabularies())
+        target = f"单词本“{names[vocab_id]}”的所有错题" if vocab_id in names else '所有单词本的错题'
+        reply = QMessageBox.question(main_window, '确认', f'确定要清空{target}吗？',
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            main_window.db.cursor.execute('DELETE FROM wrong_words')
-            main_window.db.conn.commit()
+            main_window.db.clear_wrong_words(vocab_id)
             UIController.update_wrong_words(main_window)
-            main_window.statusBar().showMessage('错题本已清空', 2000)
\ No newline at end of file
+            main_window.statusBar().showMessage('错题本已清空', 2000)
+    @staticmethod
+    def update_backup_status(main_window):
+        """显示最近一次备份的时间和快照数量"""
+        if not hasattr(main_window, 'backup_status_label'):
+            return
+        snapshots = main_window.backups.snapshots()
+        if snapshots:
+            text = f"最近备份：{snapshots[0][1]:%Y-%m-%d %H:%M}，共 {len(snapshots)} 个快照"
+        else:
+            text = '尚未备份'
+        main_window.backup_status_label.setText(f"{text}（每 {BACKUP_INTERVAL_HOURS} 小时自动备份一次）")
+
+    @staticmethod
+    def backup_now(main_window):
+        """立即备份"""
+        if not main_window.backup_worker.start_backup():
+            main_window.statusBar().showMessage('备份或恢复正在进行中', 3000)
+
+    @staticmethod
+    def restore_backup(main_window):
+        """从选择的快照恢复全部数据"""
+        snapshots = main_window.backups.snapshots()
+        if not snapshots:
+            QMessageBox.information(main_window, '提示', '还没有可用的备份')
+            return
+        labels = [f"{created:%Y-%m-%d %H:%M:%S}" for _, created in snapshots]
+        label, ok = QInputDialog.getItem(main_window, '从备份恢复', '选择要恢复的备份：', labels, 0, False)
+        if not ok:
+            return
+        reply = QMessageBox.question(main_window, '确认',
+                                     f'确定要用 {label} 的备份替换当前所有单词本和学习记录吗？\n当前数据会先另存为一个新备份。',
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        # 缓冲中的学习记录先写入，随当前数据一起保存
+        main_window.flush_study_buffer()
+        if not main_window.backup_worker.start_restore(snapshots[labels.index(label)][0]):
+            main_window.statusBar().showMessage('备份或恢复正在进行中', 3000)
+
+    @staticmethod
+    def on_backup_progress(main_window, percent):
+        main_window.statusBar().showMessage(f'正在复制数据库... {percent}%')
+        if hasattr(main_window, 'backup_progress'):
+            main_window.backup_progress.show()
+            main_window.backup_progress.setValue(percent)
+
+    @staticmethod
+    def on_backup_done(main_window, kind, success, message):
+        """备份、恢复或备份后的归档结束"""
+        if kind == 'retention':
+            if message:
+                main_window.statusBar().showMessage(message, 5000)
+            return
+        if hasattr(main_window, 'backup_progress'):
+            main_window.backup_progress.hide()
+        UIController.update_backup_status(main_window)
+        if kind == 'backup':
+            main_window.statusBar().showMessage('备份完成' if success else message, 5000)
+            return
+        if success:
+            # 恢复后单词本、单词和复习状态都可能已不同：丢弃进行中的学习会话，清空单词列表，
+            # 回到首页并重新读取单词本列表
+            main_window.current_vocabulary = None
+            main_window.current_vocab_id = None
+            main_window.study_session = None
+            if hasattr(main_window, 'words_model'):
+                main_window.words_model.clear()
+                main_window.words_title.setText('请选择一个单词本')
+            UIController.refresh_vocabularies(main_window)
+            main_window.switch_page(main_window.main_page)
+            QMessageBox.information(main_window, '恢复完成', message)
+        else:
+            QMessageBox.warning(main_window, '恢复失败', message)
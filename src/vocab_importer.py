@@ -0,0 +1,185 @@
+import csv
+import os
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from db_migrations import WORD_TYPE_CODES
+
+# 重复单词处理策略：跳过 / 合并词性释义 / 覆盖原有释义
+DUPLICATE_POLICIES = ('skip', 'merge', 'overwrite')
+
+# 导出文件中单词前带有 "12. " 序号
+_INDEX_PREFIX = re.compile(r'^\d+\.\s+')
+_HEADER_WORDS = {'单词', 'word'}
+_TYPE_NAMES = {'单词': 'word', '短语': 'phrase', 'word': 'word', 'phrase': 'phrase'}
+_TYPE_BY_CODE = {code: name for name, code in WORD_TYPE_CODES.items()}
+
+# SQLite 单条语句的参数上限较低，IN 查询分块
+_MAX_VARIABLES = 500
+
+
+class ImportCancelled(Exception):
+    """导入被取消，整个文件的写入已回滚"""
+
+
+def parse_meanings(text: str) -> List[Tuple[str, str]]:
+    """解析导出格式的释义："n.: 苹果; v.: 跑" -> [('n.', '苹果'), ('v.', '跑')]"""
+    pos_meanings = []
+    for part in text.split(';'):
+        part = part.strip()
+        if not part:
+            continue
+        if ': ' in part:
+            pos, meaning = part.split(': ', 1)
+        else:
+            pos, meaning = '', part
+        meaning = meaning.strip()
+        if meaning:
+            pos_meanings.append((pos.strip(), meaning))
+    return pos_meanings
+
+
+def _detect_delimiter(file_path: str, first_line: str) -> str:
+    if file_path.lower().endswith(('.tsv', '.tab')):
+        return '\t'
+    return '\t' if '\t' in first_line and ',' not in first_line else ','
+
+
+class VocabularyImporter:
+    """流式批量导入单词本
+
+    逐行读取 CSV/TSV，按批次用 executemany 写入，整个导入在一个事务中完成。
+    内存占用只与批次大小有关，与文件大小无关。
+    """
+
+    def __init__(self, db, batch_size: int = 2000):
+        self.db = db
+        self.batch_size = batch_size
+
+    def iter_rows(self, file, delimiter: str) -> Iterator[Tuple[str, List[Tuple[str, str]], Optional[str]]]:
+        """逐行产出 (单词, 词性释义列表, 类型)，无法解析的行产出空释义"""
+        reader = csv.reader(file, delimiter=delimiter)
+        for i, row in enumerate(reader):
+            if not row or not row[0].strip():
+                continue
+            if i == 0 and row[0].strip().lower() in _HEADER_WORDS:
+                continue
+            word = _INDEX_PREFIX.sub('', row[0].strip())
+            pos_meanings = parse_meanings(row[1]) if len(row) > 1 else []
+            word_type = _TYPE_NAMES.get(row[2].strip()) if len(row) > 2 else None
+            yield word, pos_meanings, word_type
+
+    def import_file(self, vocab_id: int, file_path: str, policy: str = 'skip',
+                    word_type: str = 'word',
+                    progress_callback: Optional[Callable[[int, int], None]] = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, int]:
+        """导入文件，返回各类结果的计数
+
+        progress_callback(已处理行数, 百分比) 在每个批次写入后调用。
+        is_cancelled() 在每个批次写入后检查，返回 True 时回滚并抛出 ImportCancelled。
+        """
+        if policy not in DUPLICATE_POLICIES:
+            raise ValueError(f"未知的重复处理策略：{policy}")
+
+        counts = {'added': 0, 'merged': 0, 'overwritten': 0, 'skipped': 0, 'invalid': 0}
+        total_bytes = os.path.getsize(file_path) or 1
+        processed = 0
+
+        with open(file_path, 'r', newline='', encoding='utf-8-sig') as file:
+            first_line = file.readline()
+            file.seek(0)
+            delimiter = _detect_delimiter(file_path, first_line)
+
+            # 整个文件在一个工作单元中写入，出错时整体回滚
+            with self.db.transaction():
+                batch = {}
+                for word, pos_meanings, row_type in self.iter_rows(file, delimiter):
+                    processed += 1
+                    if not pos_meanings:
+                        counts['invalid'] += 1
+                        continue
+                    self._add_to_batch(batch, word, pos_meanings, row_type or word_type, policy, counts)
+                    if len(batch) >= self.batch_size:
+                        self._write_batch(vocab_id, batch, policy, counts)
+                        batch = {}
+                        if is_cancelled and is_cancelled():
+                            raise ImportCancelled()
+                        if progress_callback:
+                            percent = min(99, file.buffer.tell() * 100 // total_bytes)
+                            progress_callback(processed, percent)
+                if batch:
+                    self._write_batch(vocab_id, batch, policy, counts)
+
+        if progress_callback:
+            progress_callback(processed, 100)
+        return counts
+
+    @staticmethod
+    def _add_to_batch(batch, word, pos_meanings, word_type, policy, counts):
+        """同一批次内的重复单词按策略合并"""
+        if word not in batch:
+            batch[word] = (word_type, list(pos_meanings))
+        elif policy == 'skip':
+            counts['skipped'] += 1
+        elif policy == 'merge':
+            existing = batch[word][1]
+            existing.extend(pm for pm in pos_meanings if pm not in existing)
+        else:
+            batch[word] = (word_type, list(pos_meanings))
+
+    def _fetch_existing(self, vocab_id: int, words: List[str]) -> Dict[str, Tuple[int, str, set]]:
+        """查询批次中已存在于单词本的单词：{单词: (单词ID, 类型, {(词性, 释义)})}"""
+        existing = {}
+        cursor = self.db.conn.cursor()
+        for start in range(0, len(words), _MAX_VARIABLES):
+            chunk = words[start:start + _MAX_VARIABLES]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT w.id, w.word, w.type, p.name, s.meaning
+                FROM words w
+                LEFT JOIN senses s ON s.word_id = w.id
+                LEFT JOIN parts_of_speech p ON p.id = s.pos_id
+                WHERE w.vocabulary_id = ? AND w.word IN ({placeholders})
+            ''', [vocab_id] + chunk)
+            for word_id, word, word_type, pos, meaning in cursor:
+                senses = existing.setdefault(word, (word_id, _TYPE_BY_CODE.get(word_type, 'word'), set()))[2]
+                if meaning is not None:
+                    senses.add((pos, meaning))
+        return existing
+
+    def _write_batch(self, vocab_id: int, batch, policy: str, counts: Dict[str, int]):
+        existing = self._fetch_existing(vocab_id, list(batch))
+        new_words = []
+        senses = []
+        overwritten = []
+        for word, (word_type, pos_meanings) in batch.items():
+            if word not in existing:
+                new_words.append((vocab_id, word, WORD_TYPE_CODES.get(word_type, 0)))
+                counts['added'] += 1
+            elif policy == 'skip':
+                counts['skipped'] += 1
+                continue
+            elif policy == 'merge':
+                _, _, old_senses = existing[word]
+                pos_meanings = [pm for pm in pos_meanings if pm not in old_senses]
+                counts['merged'] += 1
+            else:
+                overwritten.append((WORD_TYPE_CODES.get(word_type, 0), existing[word][0]))
+                counts['overwritten'] += 1
+            senses.extend((meaning, vocab_id, word, pos) for pos, meaning in pos_meanings)
+
+        cursor = self.db.conn.cursor()
+        if overwritten:
+            # 覆盖只替换类型和释义，单词 id 不变，学习记录和复习进度保留
+            cursor.executemany('UPDATE words SET type = ? WHERE id = ?', overwritten)
+            cursor.executemany('DELETE FROM senses WHERE word_id = ?', [(word_id,) for _, word_id in overwritten])
+        if new_words:
+            cursor.executemany('INSERT INTO words (vocabulary_id, word, type) VALUES (?, ?, ?)', new_words)
+        if senses:
+            cursor.executemany('INSERT OR IGNORE INTO parts_of_speech (name) VALUES (?)',
+                               [(pos,) for pos in {sense[3] for sense in senses}])
+            cursor.executemany('''
+                INSERT INTO senses (word_id, pos_id, meaning)
+                SELECT w.id, p.id, ?
+                FROM words w, parts_of_speech p
+                WHERE w.vocabulary_id = ? AND w.word = ? AND p.name = ?
+            ''', senses)
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+
+class WordListModel(QAbstractListModel):
+    """单词列表的虚拟化模型
+
+    通过 canFetchMore/fetchMore 按页从数据库读取（键集分页），只缓存最近使用的
+    若干页，被淘汰的页在需要显示时按页首单词重新读取。打开单词本的耗时和内存
+    只与可见的行数有关，与单词本大小无关。
+    """
+    WordRole = Qt.ItemDataRole.UserRole + 1
+    SensesRole = Qt.ItemDataRole.UserRole + 2
+    TypeRole = Qt.ItemDataRole.UserRole + 3
+    IdRole = Qt.ItemDataRole.UserRole + 4
+
+    def __init__(self, db, page_size: int = 200, max_cached_pages: int = 20, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.page_size = page_size
+        self.max_cached_pages = max_cached_pages
+        self._reset_state()
+
+    def _reset_state(self):
+        self.vocab_id = None
+        self._total = 0
+        self._loaded = 0
+        self._pages = OrderedDict()   # 页号 -> [(单词, 词性释义, 类型, ID)]
+        self._page_keys = [None]      # 第 i 页之前的最后一个单词
+        self._static_rows = None      # 搜索结果等一次性给出的行
+
+    def set_vocabulary(self, vocab_id, total=None):
+        """切换到指定单词本，total 为单词总数（可由后台线程预先查询）"""
+        self.beginResetModel()
+        self._reset_state()
+        self.vocab_id = vocab_id
+        if vocab_id:
+            self._total = total if total is not None else self.db.count_words(vocab_id)
+        self.endResetModel()
+
+    def set_rows(self, rows):
+        """直接显示给定的行（如搜索结果），rows: [(单词, 词性释义, 类型, ID)]"""
+        self.beginResetModel()
+        self._reset_state()
+        self._static_rows = list(rows)
+        self._total = self._loaded = len(self._static_rows)
+        self.endResetModel()
+
+    def clear(self):
+        self.set_rows([])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._loaded < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self.canFetchMore():
+            return
+        page_no = self._loaded // self.page_size
+        rows = self._load_page(page_no)
+        if not rows:
+            # 单词本在后台被修改，总数已不准确
+            self._total = self._loaded
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + len(rows) - 1)
+        self._loaded += len(rows)
+        self.endInsertRows()
+
+    def _load_page(self, page_no):
+        if page_no in self._pages:
+            self._pages.move_to_end(page_no)
+            return self._pages[page_no]
+        rows = self.db.get_words_page(self.vocab_id, self._page_keys[page_no], self.page_size)
+        if rows and len(self._page_keys) == page_no + 1:
+            self._page_keys.append(rows[-1][0])
+        self._pages[page_no] = rows
+        if len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+        return rows
+
+    def row(self, row):
+        """返回第 row 行的 (单词, 词性释义, 类型, ID)"""
+        if not 0 <= row < self._loaded:
+            return None
+        if self._static_rows is not None:
+            return self._static_rows[row]
+        rows = self._load_page(row // self.page_size)
+        offset = row % self.page_size
+        return rows[offset] if offset < len(rows) else None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self.row(index.row())
+        if item is None:
+            return None
+        word, senses, word_type, word_id = item
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{index.row() + 1}. {word}: {senses}"
+        if role == self.WordRole:
+            return word
+        if role == self.SensesRole:
+            return senses
+        if role == self.TypeRole:
+            return word_type
+        if role == self.IdRole:
+            return word_id
+        return None
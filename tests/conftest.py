@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 源码是 src/ 下的平铺模块，测试按程序运行时的方式导入
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
@@ -0,0 +1,63 @@
+"""在线备份：同一秒内的快照顺序、轮换和恢复"""
+import os
+from datetime import datetime
+
+import pytest
+
+import db_backup
+from data_manager import DatabaseManager
+from db_backup import BackupManager
+
+
+class _FrozenDatetime(datetime):
+    """now() 固定在同一秒，所有快照都落在同一个时间戳上"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 1, 2, 3, 4, 5)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'vocabulary.db'))
+    db.add_vocabulary('四级')
+    yield db
+    db.close()
+
+
+def test_same_second_snapshots_newest_first(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(db_backup, 'datetime', _FrozenDatetime)
+    backups = BackupManager(db, str(tmp_path / 'backups'), keep=100)
+    created = []
+    # 超过 10 个：按文件名排序时 "-10" 会排在 "-2" 前面
+    for _ in range(12):
+        ok, path = backups.backup()
+        assert ok, path
+        created.append(path)
+    assert os.path.basename(created[-1]) == 'vocabulary-20260102-030405-11.db'
+    assert [path for path, _ in backups.snapshots()] == created[::-1]
+
+
+def test_rotation_keeps_newest_in_same_second(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(db_backup, 'datetime', _FrozenDatetime)
+    backups = BackupManager(db, str(tmp_path / 'backups'), keep=3)
+    # 每次备份后轮换，同一秒内删掉的名字不能再分配给新快照
+    created = [backups.backup()[1] for _ in range(12)]
+    assert len(set(created)) == len(created)
+    assert [path for path, _ in backups.snapshots()] == created[:-4:-1]
+    assert sorted(os.listdir(backups.backup_dir)) == sorted(os.path.basename(path) for path in created[-3:])
+
+
+def test_restore_replaces_data_and_saves_current(db, tmp_path):
+    backups = BackupManager(db, str(tmp_path / 'backups'))
+    ok, snapshot = backups.backup()
+    assert ok
+    db.add_vocabulary('六级')
+    assert len(db.get_vocabularies()) == 2
+
+    ok, message = backups.restore(snapshot)
+    assert ok, message
+    assert [name for _, name in db.get_vocabularies()] == ['四级']
+    # 恢复前的数据另存为最新的快照
+    saved = backups.snapshots()[0][0]
+    assert saved != snapshot and os.path.basename(saved) in message
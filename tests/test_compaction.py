@@ -0,0 +1,65 @@
+"""旧数据库的一次性整理：启动时不执行，compact() 可以报告进度和取消"""
+import sqlite3
+
+import pytest
+
+from data_manager import DatabaseManager
+
+
+def _without_incremental_vacuum(path):
+    """把数据库改回非增量整理模式，模拟版本 9 之前的数据库"""
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute('PRAGMA auto_vacuum = NONE')
+    conn.execute('VACUUM')
+    conn.close()
+
+
+@pytest.fixture
+def old_db_path(tmp_path):
+    path = str(tmp_path / 'vocabulary.db')
+    db = DatabaseManager(path)
+    db.add_vocabulary('四级')
+    with db.transaction():
+        for i in range(2000):
+            db.add_word_with_pos_meanings(f'word{i}', [('n.', f'释义{i}')], 1)
+    db.close()
+    _without_incremental_vacuum(path)
+    return path
+
+
+def _auto_vacuum(db):
+    with db.connections.write_lock:
+        return db.connections.writer.execute('PRAGMA auto_vacuum').fetchall()[0][0]
+
+
+def test_new_database_needs_no_compaction(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'vocabulary.db'))
+    assert not db.needs_compaction
+    assert _auto_vacuum(db) == 2
+    db.close()
+
+
+def test_compaction_deferred_until_compact(old_db_path):
+    db = DatabaseManager(old_db_path)
+    assert db.needs_compaction
+    assert _auto_vacuum(db) == 0
+    reported = []
+    assert db.compact(reported.append) == (True, '数据库整理完成')
+    assert not db.needs_compaction
+    assert _auto_vacuum(db) == 2
+    assert reported[-1] == 100 and reported == sorted(reported)
+    assert db.count_words(1) == 2000
+    assert db.compact() == (True, '数据库已整理')
+    db.close()
+    assert not DatabaseManager(old_db_path).needs_compaction
+
+
+def test_cancelled_compaction_leaves_database_unchanged(old_db_path):
+    db = DatabaseManager(old_db_path)
+    ok, message = db.compact(is_cancelled=lambda: True)
+    assert not ok and '取消' in message
+    assert db.needs_compaction and _auto_vacuum(db) == 0
+    # 写连接没有留在事务中，之后的写入和下一次整理照常进行
+    db.add_vocabulary('六级')
+    assert db.compact()[0]
+    db.close()
@@ -0,0 +1,80 @@
+"""选择模式干扰项索引：唯一性、数量和取样耗时"""
+import random
+import time
+
+from distractors import DistractorIndex
+
+
+def _cards(count, meanings=None, rng=None):
+    """count 张卡；meanings 不为空时释义只从这么多个不同的释义中取，制造大量重复"""
+    rng = rng or random.Random(0)
+    pos_list = ['n.', 'v.', 'adj.']
+    cards = []
+    for i in range(count):
+        meaning_id = rng.randrange(meanings) if meanings else i
+        cards.append((f'w{i}', f'{pos_list[meaning_id % 3]}: 释义{meaning_id}'))
+    return cards
+
+
+class _StuckRandom(random.Random):
+    """randrange 总是返回 0：随机抽取一直命中同一个候选，只能靠打乱扫描取满"""
+
+    def randrange(self, *args, **kwargs):
+        return 0
+
+
+def test_sample_returns_k_distinct_meanings_without_correct():
+    cards = _cards(2000, meanings=40)
+    index = DistractorIndex(cards, random.Random(1))
+    for card in cards[:500]:
+        distractors = index.sample(card, 3)
+        assert len(distractors) == 3
+        assert len(set(distractors)) == 3
+        assert card[1] not in distractors
+
+
+def test_options_contain_correct_meaning_once():
+    cards = _cards(300, meanings=50)
+    index = DistractorIndex(cards, random.Random(2))
+    for card in cards[:100]:
+        options = index.options(card, 3)
+        assert len(options) == 4
+        assert options.count(card[1]) == 1
+        assert len(set(options)) == 4
+
+
+def test_random_draws_exhausted_falls_back_to_scan():
+    cards = _cards(1000)
+    index = DistractorIndex(cards, _StuckRandom(3))
+    for card in cards[:50]:
+        distractors = index.sample(card, 3)
+        assert len(distractors) == 3
+        assert len(set(distractors)) == 3
+        assert card[1] not in distractors
+
+
+def test_tiny_book_returns_all_other_meanings():
+    cards = [('apple', 'n.: 苹果'), ('apples', 'n.: 苹果'), ('run', 'v.: 跑')]
+    index = DistractorIndex(cards, random.Random(4))
+    assert index.sample(cards[0], 3) == ['v.: 跑']
+    # 不在卡组中的卡也能取样，只有两个不同的释义可用
+    assert sorted(index.sample(('solo', 'adv.: 独自'), 3)) == ['n.: 苹果', 'v.: 跑']
+    assert DistractorIndex([('only', 'n.: 唯一')]).sample(('only', 'n.: 唯一'), 3) == []
+
+
+def test_sampling_time_independent_of_deck_size():
+    small = DistractorIndex(_cards(1000), random.Random(5))
+    large = DistractorIndex(_cards(200000), random.Random(5))
+    cards = [('w1', 'n.: 释义0'), ('w2', 'v.: 释义1'), ('w3', 'adj.: 释义2')]
+
+    def per_sample(index, rounds=20000):
+        started = time.perf_counter()
+        for i in range(rounds):
+            index.sample(cards[i % 3], 3)
+        return (time.perf_counter() - started) / rounds
+
+    small_cost = per_sample(small)
+    large_cost = per_sample(large)
+    # 每次取样只抽取 O(k) 个候选：20 万张卡与 1000 张卡的耗时同一量级，单次远低于 1 毫秒
+    assert large_cost < 1e-3
+    assert large_cost < 5 * small_cost + 2e-5
@@ -0,0 +1,132 @@
+"""DatabaseManager 热点查询的执行计划检查
+
+在临时数据库上调用各个查询方法，记录实际执行的每条语句，再逐条 EXPLAIN QUERY PLAN：
+大表不允许全表扫描，结果不允许用临时 B 树排序。
+"""
+import re
+import sqlite3
+
+import pytest
+
+from data_manager import DatabaseManager
+
+# 随单词数或学习记录数增长的表（study_records 为兼容旧查询的视图）
+LARGE_TABLES = {'words', 'senses', 'study_events', 'study_event_days', 'study_records'}
+
+# 按全文检索相关度排序的查询：得分在查询时计算，只能在 LIMIT 截断的命中行上排序
+RELEVANCE_SORTED = {'search_words_ranked'}
+
+# 不执行计划检查的语句：事务控制、PRAGMA 和结构变更
+SKIPPED_PREFIXES = ('PRAGMA', 'BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE', 'CREATE', 'ANALYZE')
+
+TABLE_REFERENCE = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+SQL_KEYWORDS = {'where', 'on', 'join', 'cross', 'left', 'inner', 'group', 'order', 'limit', 'set', 'values',
+                'select', 'using', 'indexed', 'union', 'as'}
+
+
+def _scanned_tables(sql: str, plan):
+    """计划中全表扫描的表名（别名换回表名）"""
+    aliases = {}
+    for table, alias in TABLE_REFERENCE.findall(sql):
+        aliases[table.lower()] = table.lower()
+        if alias and alias.lower() not in SQL_KEYWORDS:
+            aliases[alias.lower()] = table.lower()
+    scanned = set()
+    for detail in plan:
+        match = re.match(r'SCAN (\w+)', detail)
+        if match:
+            scanned.add(aliases.get(match.group(1).lower(), match.group(1).lower()))
+    return scanned
+
+
+@pytest.fixture(scope='module')
+def seeded(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('plans') / 'vocabulary.db')
+    db = DatabaseManager(path)
+    db.add_vocabulary('四级')
+    db.add_vocabulary('六级')
+    first, second = [vocab_id for vocab_id, _ in db.get_vocabularies()]
+    records, wrong_words = [], []
+    for vocab_id in (first, second):
+        for i in range(300):
+            word = f'word{i:03d}'
+            db.add_word_with_pos_meanings_and_type(word, [('n.', f'释义{i}'), ('v.', f'动作{i}')],
+                                                   'phrase' if i % 10 == 0 else 'word', vocab_id)
+            for day in range(3):
+                records.append((vocab_id, word, i % 3 != 0, 'choice', f'2026-01-{day + 1:02d} 08:00:00', 900))
+            if i % 7 == 0:
+                wrong_words.append((vocab_id, word, '2026-01-03 08:00:00', False))
+    db.write_study_events(records, wrong_words)
+    with db.connections.write_lock:
+        db.connections.writer.execute('ANALYZE')
+    yield db, path, first, second
+    db.close()
+
+
+# 每项为 (名称, 调用)；调用参数为 (db, 单词本1, 单词本2)
+QUERIES = [
+    ('get_vocabularies', lambda db, v, u: db.get_vocabularies()),
+    ('count_words', lambda db, v, u: db.count_words(v)),
+    ('get_words_page', lambda db, v, u: db.get_words_page(v)),
+    ('get_words_page_after', lambda db, v, u: db.get_words_page(v, 'word100', 50)),
+    ('get_words_with_pos_meanings', lambda db, v, u: db.get_words_with_pos_meanings(v)),
+    ('get_words_with_pos_meanings_type', lambda db, v, u: db.get_words_with_pos_meanings(v, 'phrase')),
+    ('get_word_type', lambda db, v, u: db.get_word_type('word001', v)),
+    ('get_word_pos_meanings', lambda db, v, u: db.get_word_pos_meanings('word001', v)),
+    ('get_study_cards', lambda db, v, u: db.get_study_cards(v)),
+    ('get_study_cards_due', lambda db, v, u: db.get_study_cards(v, ['word', 'phrase'], '2026-02-01 00:00:00')),
+    ('get_wrong_words', lambda db, v, u: db.get_wrong_words(v)),
+    ('get_wrong_word_cards', lambda db, v, u: db.get_wrong_word_cards(v)),
+    ('get_daily_stats', lambda db, v, u: db.get_daily_stats(v)),
+    ('get_detailed_stats', lambda db, v, u: db.get_detailed_stats(v)),
+    ('get_weekly_stats', lambda db, v, u: db.get_weekly_stats(v)),
+    ('search_words_ranked', lambda db, v, u: db.search_words_ranked('word01', v)),
+    ('add_word', lambda db, v, u: db.add_word_with_pos_meanings_and_type('newword', [('n.', '新词')], 'word', v)),
+    ('update_word', lambda db, v, u: db.update_word('word002', v, 'word002b', [('adj.', '改')], 'word')),
+    ('record_study', lambda db, v, u: db.record_study(v, 'word003', True, 'choice', 800)),
+    ('write_study_events', lambda db, v, u: db.write_study_events(
+        [(v, 'word004', False, 'spelling', None, 1200)],
+        [(v, 'word004', '2026-01-04 08:00:00', False), (v, 'word007', None, True)],
+        [(v, 'word004', '2026-01-05 08:00:00', 1.0, 5.0, 1, 1, '2026-01-04 08:00:00')])),
+    ('add_wrong_word', lambda db, v, u: db.add_wrong_word(v, 'word005', '释义5')),
+    ('remove_wrong_word', lambda db, v, u: db.remove_wrong_word('word014', v)),
+    ('clear_wrong_words', lambda db, v, u: db.clear_wrong_words(u)),
+    ('delete_word', lambda db, v, u: db.delete_word('word006', v)),
+    ('move_word', lambda db, v, u: db.move_word('newword', v, u)),
+]
+
+
+@pytest.mark.parametrize('name, call', QUERIES, ids=[name for name, _ in QUERIES])
+def test_query_uses_indexes(seeded, name, call):
+    db, path, first, second = seeded
+    statements = []
+
+    def trace(sql):
+        # 触发器内部的语句以注释形式回调，由外层语句的计划覆盖
+        sql = sql.strip()
+        if sql and not sql.startswith('--') and not sql.upper().startswith(SKIPPED_PREFIXES):
+            statements.append(sql)
+
+    connections = [db.connections.writer, db.connections.reader()[0]]
+    for conn in connections:
+        conn.set_trace_callback(trace)
+    try:
+        db.cache.clear()
+        call(db, first, second)
+    finally:
+        for conn in connections:
+            conn.set_trace_callback(None)
+    assert statements, f'{name} 没有执行任何查询'
+
+    explain = sqlite3.connect(path)
+    try:
+        for sql in statements:
+            plan = [row[3] for row in explain.execute('EXPLAIN QUERY PLAN ' + sql)]
+            scanned = _scanned_tables(sql, plan) & LARGE_TABLES
+            assert not scanned, f'{name} 全表扫描 {sorted(scanned)}:\n{sql}\n' + '\n'.join(plan)
+            sorts = [detail for detail in plan if detail.startswith('USE TEMP B-TREE FOR') and 'ORDER BY' in detail]
+            if name in RELEVANCE_SORTED:
+                continue
+            assert not sorts, f'{name} 使用临时 B 树排序:\n{sql}\n' + '\n'.join(plan)
+    finally:
+        explain.close()
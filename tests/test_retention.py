@@ -0,0 +1,132 @@
+"""保留期归档：压缩往返、每个事件只归档一次、中断后继续"""
+import os
+import random
+import shutil
+import sqlite3
+import time
+
+import pytest
+
+from data_manager import DatabaseManager
+from retention import SECONDS_PER_DAY, RetentionEngine, decode_events, encode_events, read_archive
+
+START = 1735689600          # 2025-01-01 00:00:00 UTC
+DAYS = 60
+HORIZON_DAYS = 20
+NOW = START + DAYS * SECONDS_PER_DAY
+EVENT_COLUMNS = 'id, word_id, mode_id, is_correct, timestamp, response_ms'
+
+
+def _events(db):
+    with db.connections.write_lock:
+        return db.connections.writer.execute(f'SELECT {EVENT_COLUMNS} FROM study_events ORDER BY id').fetchall()
+
+
+def _stats(db):
+    return [db.get_daily_stats(1), db.get_weekly_stats(1), db.get_detailed_stats(1)]
+
+
+@pytest.fixture
+def history(tmp_path):
+    """一个单词本，60 天的学习记录（部分没有反应时间），返回数据库路径和全部原始事件"""
+    path = str(tmp_path / 'vocabulary.db')
+    rng = random.Random(0)
+    db = DatabaseManager(path)
+    db.add_vocabulary('四级')
+    words = [f'word{i}' for i in range(50)]
+    with db.transaction():
+        for word in words:
+            db.add_word_with_pos_meanings(word, [('n.', f'{word}的释义')], 1)
+    timestamp = START
+    records = []
+    while timestamp < NOW:
+        timestamp += rng.randint(60, 4 * 3600)
+        # 反应时间有大有小，也有缺失，检查差值编码和 -1 占位
+        response_ms = None if rng.random() < 0.1 else rng.randint(0, 20000)
+        records.append((1, rng.choice(words), rng.random() < 0.7, rng.choice(['recognize', 'choice', 'spell']),
+                        time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(timestamp)), response_ms))
+    db.write_study_events(records, [])
+    original = _events(db)
+    db.close()
+    return path, original
+
+
+def _engine(db, tmp_path, **kwargs):
+    kwargs.setdefault('chunk_events', 50)
+    return RetentionEngine(db, HORIZON_DAYS, str(tmp_path / 'archive.db'), pause=0, **kwargs)
+
+
+def _archived(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'archive.db'))
+    try:
+        return list(read_archive(conn))
+    finally:
+        conn.close()
+
+
+def test_encode_decode_roundtrip():
+    day = START // SECONDS_PER_DAY
+    rows = [(100, 7, 1, 1, START + 5, 1200), (101, 3, 2, 0, START + 5, None),
+            (250, 9, 3, 1, START + 86399, 0), (251, 7, 1, 0, START + 3, 65000)]
+    assert decode_events(100, day, len(rows), encode_events(100, day, rows)) == rows
+
+
+def test_archive_roundtrip_row_by_row(history, tmp_path):
+    path, original = history
+    db = DatabaseManager(path)
+    before = _stats(db)
+    cutoff = _engine(db, tmp_path).cutoff(NOW)
+    counts = _engine(db, tmp_path).run(NOW)
+
+    archived = _archived(tmp_path)
+    remaining = _events(db)
+    assert counts['events'] == len(archived) > 0
+    assert archived == [row for row in original if row[4] < cutoff]
+    assert remaining == [row for row in original if row[4] >= cutoff]
+    assert _stats(db) == before
+    # 第二次运行没有过期事件
+    assert _engine(db, tmp_path).run(NOW)['events'] == 0
+    db.close()
+
+
+def test_restored_backup_is_not_archived_twice(history, tmp_path):
+    path, original = history
+    backup = str(tmp_path / 'backup.db')
+    shutil.copyfile(path, backup)
+    db = DatabaseManager(path)
+    first = _engine(db, tmp_path).run(NOW)
+    db.close()
+
+    # 恢复归档之前的备份，用不同的分批大小再运行一次
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    shutil.copyfile(backup, path)
+    db = DatabaseManager(path)
+    second = _engine(db, tmp_path, chunk_events=37).run(NOW)
+    assert second['events'] == first['events'] and second['batches'] == 0
+
+    archived = _archived(tmp_path)
+    assert len({row[0] for row in archived}) == len(archived)
+    assert archived == [row for row in original if row[4] < _engine(db, tmp_path).cutoff(NOW)]
+    db.close()
+
+
+def test_interrupted_run_resumes(history, tmp_path):
+    path, original = history
+    db = DatabaseManager(path)
+    cutoff = _engine(db, tmp_path).cutoff(NOW)
+    expired = [row for row in original if row[4] < cutoff]
+    chunks = []
+    counts = _engine(db, tmp_path).run(NOW, progress=lambda done, last: chunks.append(done),
+                                      is_cancelled=lambda: len(chunks) >= 2)
+    # 停在第二批提交之后，没有处理的事件仍然保留在原始表中
+    assert len(chunks) == 2
+    assert 0 < counts['events'] < len(expired)
+    assert _archived(tmp_path) == expired[:counts['events']]
+    assert _events(db) == original[counts['events']:]
+
+    _engine(db, tmp_path).run(NOW)
+    assert _archived(tmp_path) == expired
+    assert _events(db) == [row for row in original if row[4] >= cutoff]
+    db.close()
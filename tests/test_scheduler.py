@@ -0,0 +1,59 @@
+"""调度：作答后的间隔变化和到期卡的优先顺序"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import scheduler
+from scheduler import CardState, format_time, order_due_cards, review
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def test_utc_now_is_naive_utc_without_microseconds():
+    now = scheduler.utc_now()
+    assert now.tzinfo is None and now.microsecond == 0
+    # 与数据库读出的不带时区的 UTC 时间可以直接比较
+    assert now - datetime.fromisoformat('2000-01-01 00:00:00') > timedelta(0)
+
+
+def test_correct_answers_grow_interval():
+    state = CardState(format_time(NOW))
+    intervals = []
+    for _ in range(5):
+        state = review(state, True, NOW)
+        intervals.append(state.stability)
+        assert state.due == format_time(NOW + timedelta(days=state.stability))
+        assert state.last_review == format_time(NOW)
+    assert intervals[:2] == [1.0, 3.0]
+    assert intervals == sorted(intervals) and intervals[4] > intervals[3] > 3.0
+    assert state.reps == 5 and state.difficulty == pytest.approx(2.5)
+
+
+def test_wrong_answer_relearns_soon():
+    state = CardState(format_time(NOW), stability=10.0, difficulty=9.5, lapses=1, reps=4)
+    state = review(state, False, NOW)
+    assert state.due == format_time(NOW + scheduler.RELEARN_DELAY)
+    assert state.stability == pytest.approx(3.0)
+    assert (state.reps, state.lapses, state.difficulty) == (0, 2, scheduler.MAX_DIFFICULTY)
+
+
+def _row(word, overdue_days, stability, lapses=0):
+    return (word, f'{word}的释义', format_time(NOW - timedelta(days=overdue_days)), stability, 5.0, lapses, 1)
+
+
+def test_due_cards_ordered_by_relative_overdue():
+    rows = [
+        _row('fresh', 0, 10.0),
+        _row('overdue', 5, 10.0),
+        _row('short', 5, 1.0),           # 相同逾期天数，间隔越短越优先
+        _row('lapsed', 0, 10.0, lapses=3),
+    ]
+    order = [row[0] for row in order_due_cards(rows, now=NOW)]
+    assert order == ['short', 'overdue', 'lapsed', 'fresh']
+
+
+def test_due_cards_limit_matches_full_order():
+    rows = [_row(f'word{i}', (i * 7) % 13, 1.0 + i % 5, i % 3) for i in range(50)]
+    full = order_due_cards(rows, now=NOW)
+    assert order_due_cards(rows, 10, NOW) == full[:10]
+    assert order_due_cards(rows, 100, NOW) == full
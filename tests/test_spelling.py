@@ -0,0 +1,90 @@
+"""拼写评分：位并行编辑距离与动态规划结果一致，批量评分与逐个评分一致"""
+import random
+
+import pytest
+
+from spelling import SpellingGrader, edit_distance
+
+LETTERS = 'abcde'   # 字母表小，随机字符串之间才有较多相同字母
+
+
+def _reference_distance(a, b):
+    """逐格动态规划的 Levenshtein 距离"""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def _random_word(rng, max_length):
+    return ''.join(rng.choice(LETTERS) for _ in range(rng.randint(0, max_length)))
+
+
+def _mutate(rng, word, edits):
+    """在 word 上随机做 edits 次替换、插入或删除"""
+    chars = list(word)
+    for _ in range(edits):
+        op = rng.randrange(3)
+        position = rng.randint(0, len(chars))
+        if op == 0 and position < len(chars):
+            chars[position] = rng.choice(LETTERS)
+        elif op == 1:
+            chars.insert(position, rng.choice(LETTERS))
+        elif chars and position < len(chars):
+            del chars[position]
+    return ''.join(chars)
+
+
+@pytest.mark.parametrize('max_length', [8, 64, 150])
+def test_edit_distance_matches_dp(max_length):
+    # 150 超过 64 位，检查多于一个机器字长的模式
+    rng = random.Random(max_length)
+    for _ in range(400):
+        pattern = _random_word(rng, max_length)
+        text = _mutate(rng, pattern, rng.randint(0, 6)) if rng.random() < 0.5 else _random_word(rng, max_length)
+        assert edit_distance(text, pattern) == _reference_distance(text, pattern), (text, pattern)
+
+
+def test_bounded_distance_cuts_off_at_max_distance():
+    rng = random.Random(1)
+    for _ in range(2000):
+        pattern = _random_word(rng, 90)
+        text = _mutate(rng, pattern, rng.randint(0, 5))
+        limit = rng.randint(0, 4)
+        expected = _reference_distance(text, pattern)
+        bounded = edit_distance(text, pattern, limit)
+        # 距离不超过上限时结果准确，超过时返回 max_distance + 1
+        assert bounded == (expected if expected <= limit else limit + 1), (text, pattern, limit)
+
+
+def test_grade_many_matches_grade():
+    rng = random.Random(2)
+    grader = SpellingGrader()
+    words = [_random_word(rng, 12) or 'a' for _ in range(200)]
+    pairs = []
+    for _ in range(3000):
+        word = rng.choice(words)
+        answer = _mutate(rng, word, rng.randint(0, 3))
+        if rng.random() < 0.2:
+            answer = f'  {answer.upper()} '
+        pairs.append((answer, word))
+    assert grader.grade_many(pairs) == [grader.grade(answer, word).is_correct for answer, word in pairs]
+
+
+def test_thresholds_by_word_length():
+    grader = SpellingGrader()
+    assert not grader.grade('cst', 'cat')           # 3 个字母不容错
+    assert grader.grade('aple', 'apple').is_correct  # 4～7 个字母容忍 1 处
+    assert not grader.grade('apl', 'apple')
+    assert grader.grade('elefants', 'elephants') and not grader.grade('elefant', 'elephants')
+    result = grader.grade(' Apple ', 'apple')
+    assert result.exact and result.score == 1.0
+
+
+def test_diff_html_marks_wrong_and_missing_letters():
+    result = SpellingGrader().grade('hous<', 'house')
+    assert result.diff_html() == 'hous<s style="color:#F44336">&lt;</s><u style="color:#4CAF50">e</u>'
+    assert SpellingGrader().grade('apple', 'apple').diff_html() == 'apple'
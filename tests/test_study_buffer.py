@@ -0,0 +1,97 @@
+"""学习记录写缓冲：错题变化按答题顺序写入，按阈值和失败重试落盘"""
+import gc
+import sqlite3
+import weakref
+
+import pytest
+
+from data_manager import DatabaseManager
+from study_buffer import StudyWriteBuffer
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'vocabulary.db'))
+    db.add_vocabulary('四级')
+    vocab_id = db.get_vocabularies()[0][0]
+    for word in ('apple', 'banana'):
+        db.add_word_with_pos_meanings(word, [('n.', f'{word}的释义')], vocab_id)
+    yield db
+    db.close()
+
+
+def _wrong_entry(db, word):
+    rows = db.get_wrong_word_cards(1)
+    return {row[0]: (row[2], row[4]) for row in rows}.get(word)
+
+
+@pytest.mark.parametrize('answers', [
+    [True, False],          # 复习答对移出错题本，随后又答错
+    [False, True],
+    [True, False, True, True],
+    [False, True, False],
+])
+def test_wrong_word_changes_follow_answer_order(db, answers):
+    # 同一批次写入与每次答题后立即写入的结果相同
+    expected = {}
+    for batched in (False, True):
+        db.clear_wrong_words()
+        db.add_wrong_word(1, 'apple', 'apple的释义')
+        buffer = StudyWriteBuffer(db, max_events=1000, max_delay=3600)
+        for i, is_correct in enumerate(answers):
+            if is_correct:
+                buffer.resolve_wrong_word(1, 'apple')
+            else:
+                buffer.add_wrong_word(1, 'apple', 'apple的释义', f'2026-01-01 08:00:0{i}')
+            if not batched:
+                buffer.flush()
+        buffer.close()
+        expected[batched] = _wrong_entry(db, 'apple')
+    assert expected[True] == expected[False]
+
+
+def test_correct_then_wrong_in_one_batch_restarts_entry(db):
+    db.add_wrong_word(1, 'apple', 'apple的释义')
+    buffer = StudyWriteBuffer(db, max_events=1000, max_delay=3600)
+    buffer.resolve_wrong_word(1, 'apple')
+    buffer.add_wrong_word(1, 'apple', 'apple的释义', '2026-01-01 08:00:00')
+    assert buffer.flush() == 2
+    # 答对后错误次数减到 0 移出错题本，再答错重新计为 1 次、连续答对 0 次
+    assert _wrong_entry(db, 'apple') == (1, 0)
+
+
+def test_flushes_when_max_events_reached(db):
+    buffer = StudyWriteBuffer(db, max_events=3, max_delay=3600)
+    buffer.record_study(1, 'apple', True, 'recognize', response_ms=900)
+    buffer.record_study(1, 'banana', False, 'recognize', response_ms=1200)
+    assert buffer.pending == 2
+    assert db.get_daily_stats(1) == []
+    buffer.add_wrong_word(1, 'banana', 'banana的释义')
+    assert buffer.pending == 0
+    assert db.get_daily_stats(1)[0][1:3] == (2, 1)
+    assert _wrong_entry(db, 'banana') == (1, 0)
+
+
+def test_failed_write_keeps_events_for_retry(db, monkeypatch):
+    buffer = StudyWriteBuffer(db, max_events=1000, max_delay=3600)
+    buffer.record_study(1, 'apple', True, 'recognize')
+    buffer.add_wrong_word(1, 'banana', 'banana的释义')
+
+    def fail(*args):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(db, 'write_study_events', fail)
+    with pytest.raises(sqlite3.OperationalError):
+        buffer.flush()
+    assert buffer.pending == 2
+    monkeypatch.undo()
+    assert buffer.flush() == 2
+    assert buffer.pending == 0
+    assert _wrong_entry(db, 'banana') == (1, 0)
+
+
+def test_buffer_is_not_kept_alive_until_exit(db):
+    # 不再登记 atexit 回调，没有关闭的缓冲也可以被回收
+    ref = weakref.ref(StudyWriteBuffer(db))
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,53 @@
+"""会话卡组：出卡顺序和答错重新入队"""
+import random
+
+from study_deck import SessionDeck
+
+CARDS = [(f'word{i}', f'释义{i}') for i in range(6)]
+
+
+def _drain(deck):
+    order = []
+    while deck.next_card() is not None:
+        order.append(deck.current)
+        deck.finish_current()
+    return order
+
+
+def test_unshuffled_deck_keeps_given_order():
+    deck = SessionDeck(CARDS, shuffle=False)
+    assert deck.peek(3) == [0, 1, 2]
+    assert _drain(deck) == list(range(len(CARDS)))
+    assert deck.next_card() is None and deck.current is None
+
+
+def test_shuffled_deck_deals_each_card_once():
+    order = _drain(SessionDeck(CARDS, rng=random.Random(1)))
+    assert sorted(order) == list(range(len(CARDS)))
+    assert order == _drain(SessionDeck(CARDS, rng=random.Random(1)))
+
+
+def test_requeue_places_card_after_gap_once():
+    deck = SessionDeck(CARDS, shuffle=False, requeue_gap=2, max_requeues=1)
+    deck.next_card()
+    assert deck.requeue_current()
+    deck.finish_current()
+    assert deck.total == len(CARDS) + 1
+    assert deck.peek(4) == [1, 2, 0, 3]
+
+    order = []
+    for _ in range(3):
+        deck.next_card()
+        order.append(deck.current)
+    assert order == [1, 2, 0]
+    # 同一张卡超过重练次数后不再入队
+    assert not deck.requeue_current()
+    assert deck.remaining == 3
+
+
+def test_requeue_near_end_goes_last():
+    deck = SessionDeck(CARDS[:2], shuffle=False, requeue_gap=3)
+    deck.next_card()
+    deck.requeue_current()
+    deck.finish_current()
+    assert _drain(deck) == [1, 0]
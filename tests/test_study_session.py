@@ -0,0 +1,82 @@
+"""学习会话：答题计数、答错重练和会话结束"""
+from datetime import datetime
+
+import pytest
+
+import scheduler
+from data_manager import DatabaseManager
+from study_buffer import StudyWriteBuffer
+from study_session import StudySession
+
+NOW = datetime(2030, 1, 1, 8, 0, 0)
+WORDS = ['apple', 'banana', 'cherry', 'durian']
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'vocabulary.db'))
+    db.add_vocabulary('四级')
+    with db.transaction():
+        for word in WORDS:
+            db.add_word_with_pos_meanings(word, [('n.', f'{word}的释义')], 1)
+    yield db
+    db.close()
+
+
+def _session(db, buffer, mode='recognize'):
+    return StudySession.from_database(db, 1, mode, None, buffer, clock=lambda: NOW)
+
+
+def test_session_finishes_after_every_answer(db):
+    buffer = StudyWriteBuffer(db, max_events=1000, max_delay=3600)
+    session = _session(db, buffer)
+    assert session.total == len(WORDS)
+    seen = []
+    while not session.finished:
+        card = session.next_card()
+        seen.append(card[0])
+        session.answer(True, response_ms=800)
+    assert sorted(seen) == WORDS
+    assert (session.answered, session.correct, session.accuracy) == (4, 4, 100.0)
+    assert session.average_response_ms == 800
+    assert session.next_card() is None
+
+    buffer.flush()
+    assert db.get_detailed_stats(1)
+    # 答对后下次复习在一天之后
+    due = {row[0]: row[2] for row in db.get_study_cards(1)}
+    assert set(due.values()) == {scheduler.format_time(NOW.replace(day=2))}
+
+
+def test_wrong_answer_is_practised_again(db):
+    buffer = StudyWriteBuffer(db, max_events=1000, max_delay=3600)
+    session = _session(db, buffer)
+    first = session.next_card()
+    assert not session.answer(False)
+    # 答错的卡重新入队，总数加一，会话直到重练结束才完成
+    assert session.total == len(WORDS) + 1
+    answered = [first[0]]
+    while not session.finished:
+        answered.append(session.next_card()[0])
+        session.answer(True)
+    assert answered.count(first[0]) == 2
+    assert (session.answered, session.correct) == (5, 4)
+    assert session.accuracy == pytest.approx(80.0)
+
+    buffer.flush()
+    assert [row[0] for row in db.get_wrong_word_cards(1)] == [first[0]]
+
+
+def test_unanswered_card_is_returned_again(db):
+    session = _session(db, StudyWriteBuffer(db, max_events=1000, max_delay=3600), mode='choice')
+    card = session.next_card()
+    options = session.options
+    assert card[1] in options
+    assert session.next_card() == card and session.options == options
+    assert session.answered == 0
+
+
+def test_answer_without_card_raises(db):
+    session = _session(db, StudyWriteBuffer(db, max_events=1000, max_delay=3600))
+    with pytest.raises(RuntimeError):
+        session.answer(True)
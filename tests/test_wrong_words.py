@@ -0,0 +1,53 @@
+"""清空错题本只影响学习设置中所选的单词本"""
+from types import SimpleNamespace
+
+import pytest
+from PyQt6.QtWidgets import QMessageBox
+
+from data_manager import DatabaseManager
+from ui_controller import UIController
+
+
+@pytest.fixture
+def two_books(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'vocabulary.db'))
+    db.add_vocabulary('四级')
+    db.add_vocabulary('六级')
+    first, second = [vocab_id for vocab_id, _ in db.get_vocabularies()]
+    for vocab_id in (first, second):
+        for word in ('apple', 'banana'):
+            db.add_word_with_pos_meanings(word, [('n.', f'{word}的释义')], vocab_id)
+            db.add_wrong_word(vocab_id, word, f'{word}的释义')
+    yield db, first, second
+    db.close()
+
+
+class _Window(SimpleNamespace):
+    """只提供 clear_all_wrong_words 用到的属性"""
+
+    def statusBar(self):
+        return SimpleNamespace(showMessage=lambda *args: None)
+
+
+def test_clear_wrong_words_keeps_other_books(two_books):
+    db, first, second = two_books
+    db.clear_wrong_words(first)
+    assert db.get_wrong_words(first) == []
+    assert sorted(word for word, _, _ in db.get_wrong_words(second)) == ['apple', 'banana']
+
+
+def test_clear_all_wrong_words_uses_selected_book(two_books, monkeypatch):
+    db, first, second = two_books
+    questions = []
+
+    def answer_yes(parent, title, text, buttons):
+        questions.append(text)
+        return QMessageBox.StandardButton.Yes
+
+    monkeypatch.setattr(QMessageBox, 'question', answer_yes)
+    monkeypatch.setattr(UIController, 'update_wrong_words', lambda main_window: None)
+    UIController.clear_all_wrong_words(_Window(db=db, current_vocab_id=second))
+
+    assert questions == ['确定要清空单词本“六级”的所有错题吗？']
+    assert db.get_wrong_words(second) == []
+    assert len(db.get_wrong_words(first)) == 2